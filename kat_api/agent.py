@@ -16,8 +16,9 @@
 
 from abc import ABCMeta, abstractmethod
 from kat_api.state import IState
+from kat_api.game import IGame
 from kat_typing import Action, TrainLoss, DistributionStrategy
-from typing import Collection
+from typing import Collection, Sequence, List, Optional, Tuple
 from kat_api.prop_desc import ITensorDescriptor
 
 
@@ -48,12 +49,22 @@ class IAgent(metaclass=ABCMeta):
                 callable(subclass.is_initialized) and
                 hasattr(subclass, 'store_transition') and
                 callable(subclass.store_transition) and
+                hasattr(subclass, 'take_actions') and
+                callable(subclass.take_actions) and
+                hasattr(subclass, 'store_transitions') and
+                callable(subclass.store_transitions) and
                 hasattr(subclass, 'get_distribution_strategy') and
                 callable(subclass.get_distribution_strategy) and
                 hasattr(subclass, 'persist_model') and
                 callable(subclass.persist_model) and
+                hasattr(subclass, 'save_state') and
+                callable(subclass.save_state) and
+                hasattr(subclass, 'restore_state') and
+                callable(subclass.restore_state) and
                 hasattr(subclass, 'get_exploration_rate') and
-                callable(subclass.get_exploration_rate) or
+                callable(subclass.get_exploration_rate) and
+                hasattr(subclass, 'warm_up') and
+                callable(subclass.warm_up) or
                 NotImplemented)
 
     @abstractmethod
@@ -109,6 +120,23 @@ class IAgent(metaclass=ABCMeta):
         """
         pass
 
+    @abstractmethod
+    def take_actions(self, game_states: Sequence[IState], env_ids: Optional[Sequence[int]] = None) -> List[Action]:
+        """
+        Vectorized version of `take_action`, for drivers stepping multiple environments in lockstep.
+        The observations are evaluated together (one policy evaluation for the whole batch), and the
+        exploration is decided per environment.
+
+        :param game_states:
+            current states of the environments
+        :param env_ids:
+            environment ids of the states respectively, the agent keeps separate per environment
+            buffers (e.g. stacked frames) based on these (default: 0..len(game_states)-1)
+        :returns
+            actions taken by the agent, in the order of the given states
+        """
+        pass
+
     @abstractmethod
     def is_initialized(self) -> bool:
         """
@@ -134,6 +162,18 @@ class IAgent(metaclass=ABCMeta):
         """
         pass
 
+    @abstractmethod
+    def store_transitions(self, states: Sequence[IState], env_ids: Optional[Sequence[int]] = None) -> None:
+        """
+        Vectorized version of `store_transition`, the given states are stored in one batch.
+
+        :param states:
+            current game states of the environments, the transitions must be already set
+        :param env_ids:
+            environment ids of the states respectively (see: `take_actions`)
+        """
+        pass
+
     @abstractmethod
     def get_distribution_strategy(self) -> DistributionStrategy:
         """
@@ -157,6 +197,27 @@ class IAgent(metaclass=ABCMeta):
         """
         pass
 
+    @abstractmethod
+    def save_state(self, directory: str) -> None:
+        """
+        Saves everything which is needed for continuing the training later (counters, networks with their
+        optimizer states, replay memory, ...), unlike `persist_model` which is about the policy only.
+
+        :param directory:
+            an existing, empty directory owned by the agent
+        """
+        pass
+
+    @abstractmethod
+    def restore_state(self, directory: str) -> None:
+        """
+        Restores a state saved by `save_state`, the agent must be initialized already.
+
+        :param directory:
+            directory of the saved state
+        """
+        pass
+
     @abstractmethod
     def get_exploration_rate(self) -> float:
         """
@@ -165,3 +226,23 @@ class IAgent(metaclass=ABCMeta):
         :return:
             the current exploration rate
         """
+
+    @abstractmethod
+    def warm_up(self, game: IGame, max_episodes: int, max_steps: int, action_frequency: int) -> Tuple[int, int]:
+        """
+        Plays the observing episodes (the policy is not trained yet) in a dedicated fast path: the actions
+        are uniformly random, and the transitions are stored in bulk, without the per step policy evaluation.
+        The driver continues with the next episode. Agents without observing episodes are doing nothing.
+
+        :param game:
+            the initialized game
+        :param max_episodes:
+            maximum number of episodes of the run (the observing episodes are limited by it)
+        :param max_steps:
+            maximum number of steps per episode
+        :param action_frequency:
+            number of ticks processed after each action
+        :returns
+            number of the played episodes and steps
+        """
+        pass
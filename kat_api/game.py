@@ -158,3 +158,13 @@ class IGame(metaclass=ABCMeta):
             the total score in floating point format
         """
         pass
+
+    def release_observation(self, observation: IObservation) -> None:
+        """
+        Signals that the caller has consumed the observation (it is stored or dropped), so the game
+        can reuse its buffers for the next observations. Games without recycled buffers can ignore it.
+
+        :param observation:
+            an observation emitted by this game
+        """
+        pass
@@ -51,6 +51,8 @@ class IReplayMemory(metaclass=ABCMeta):
                 callable(subclass.get_number_of_frames) and
                 hasattr(subclass, 'add_transition') and
                 callable(subclass.add_transition) and
+                hasattr(subclass, 'add_transitions') and
+                callable(subclass.add_transitions) and
                 hasattr(subclass, 'update_transition_reward') and
                 callable(subclass.update_transition_reward) and
                 hasattr(subclass, 'get_sample') and
@@ -59,6 +61,10 @@ class IReplayMemory(metaclass=ABCMeta):
                 callable(subclass.as_iterable_dataset) and
                 hasattr(subclass, 'get_all') and
                 callable(subclass.get_all) and
+                hasattr(subclass, 'save_state') and
+                callable(subclass.save_state) and
+                hasattr(subclass, 'restore_state') and
+                callable(subclass.restore_state) and
                 hasattr(subclass, 'reset') and
                 callable(subclass.reset) or
                 NotImplemented)
@@ -100,6 +106,19 @@ class IReplayMemory(metaclass=ABCMeta):
         """
         pass
 
+    @abstractmethod
+    def add_transitions(self,
+                        s1_states: Tensor,
+                        action_ids: Tensor,
+                        s2_states: Tensor,
+                        rewards: Tensor,
+                        end_states: Tensor) -> None:
+        """
+        Adds a batch of transitions to the buffer, all of the arguments have the
+        same leading (batch) dimension.
+        """
+        pass
+
     @abstractmethod
     def get_sample(self, sample_size: int) -> Tuple[Tensor,
                                                     Tensor,
@@ -147,6 +166,27 @@ class IReplayMemory(metaclass=ABCMeta):
         """
         pass
 
+    @abstractmethod
+    def save_state(self, directory: str) -> None:
+        """
+        Saves the content of the buffers, with the write position.
+
+        :param directory:
+            an existing directory owned by the memory
+        """
+        pass
+
+    @abstractmethod
+    def restore_state(self, directory: str) -> None:
+        """
+        Restores the buffers saved by `save_state`, the memory must be initialized with
+        the same layout.
+
+        :param directory:
+            directory of the saved state
+        """
+        pass
+
     @abstractmethod
     def reset(self) -> None:
         """
@@ -177,7 +217,9 @@ class IReadOnlyMemory(metaclass=ABCMeta):
         return (hasattr(subclass, 'init') and
                 callable(subclass.init) and
                 hasattr(subclass, 'as_iterable_dataset') and
-                callable(subclass.as_iterable_dataset) or
+                callable(subclass.as_iterable_dataset) and
+                hasattr(subclass, 'update_target_q_values') and
+                callable(subclass.update_target_q_values) or
                 NotImplemented)
 
     @abstractmethod
@@ -200,3 +242,18 @@ class IReadOnlyMemory(metaclass=ABCMeta):
             an iterable dataset of samples from the buffer
         """
         pass
+
+    @abstractmethod
+    def update_target_q_values(self, indices: Tensor, values: Tensor, version: int) -> None:
+        """
+        Stores the max target Q values of the transitioned states into the memory's cache. The cache
+        is not part of the transitions, so it is writable through the read only adapter as well.
+
+        :param indices:
+            serial numbers of the sampled transitions (the values of the overwritten transitions are dropped)
+        :param values:
+            max target Q values of the transitioned states
+        :param version:
+            version of the target network, which produced the values
+        """
+        pass
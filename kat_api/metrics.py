@@ -47,6 +47,7 @@ class MetricType(Enum):
     """
     SCALAR = "scalar"
     IMAGE = "image"
+    HISTOGRAM = "histogram"
     HYPER_PARAMETER = "hyper_parameter"
     FAIRNESS_INDICATOR = "fairness_indicator"
     EMBEDDING = "embedding"
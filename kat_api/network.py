@@ -60,10 +60,18 @@ class INetwork(metaclass=ABCMeta):
                 callable(subclass.train_batch) and
                 hasattr(subclass, 'predict') and
                 callable(subclass.predict) and
+                hasattr(subclass, 'predict_action') and
+                callable(subclass.predict_action) and
                 hasattr(subclass, 'get_distribution_strategy') and
                 callable(subclass.get_distribution_strategy) and
                 hasattr(subclass, 'persist_model') and
-                callable(subclass.persist_model) or
+                callable(subclass.persist_model) and
+                hasattr(subclass, 'save_state') and
+                callable(subclass.save_state) and
+                hasattr(subclass, 'restore_state') and
+                callable(subclass.restore_state) and
+                hasattr(subclass, 'update_target_network') and
+                callable(subclass.update_target_network) or
                 NotImplemented)
 
     @abstractmethod
@@ -123,6 +131,22 @@ class INetwork(metaclass=ABCMeta):
         """
         pass
 
+    @abstractmethod
+    def predict_action(self, input_tensor: Tensor) -> int:
+        """
+        Low latency actor path, evaluates a single observation and returns the index of the
+        greedy action.
+
+        Implementations are allowed to validate the input only once, and to reuse internal
+        buffers between calls, so it is not meant to be called from multiple threads.
+
+        :param input_tensor:
+            a single observation, matching `self.input_descriptor` (without batch dimension)
+        :returns:
+            index of the action with the highest predicted value
+        """
+        pass
+
     @abstractmethod
     def get_distribution_strategy(self) -> DistributionStrategy:
         """
@@ -147,6 +171,27 @@ class INetwork(metaclass=ABCMeta):
         """
         pass
 
+    @abstractmethod
+    def save_state(self, directory: str) -> None:
+        """
+        Saves the training state of the network (weights and optimizer state), so the
+        training can be continued with `restore_state`.
+
+        :param directory:
+            an existing directory owned by the network
+        """
+        pass
+
+    @abstractmethod
+    def restore_state(self, directory: str) -> None:
+        """
+        Restores a training state saved by `save_state`, the network must be initialized already.
+
+        :param directory:
+            directory of the saved state
+        """
+        pass
+
     @abstractmethod
     def get_weights(self) -> object:
         """
@@ -161,3 +206,16 @@ class INetwork(metaclass=ABCMeta):
         Sets the specified weights to the network.
         """
         pass
+
+    @abstractmethod
+    def update_target_network(self, tau: float = 1.0) -> None:
+        """
+        Updates the target network's variables (see: `init`) from this network's variables, in place
+        (without transferring the weights through the host):
+
+            target = tau * online + (1 - tau) * target
+
+        :param tau:
+            weight of the online network, 1.0 means a hard copy (soft update otherwise)
+        """
+        pass
@@ -25,6 +25,9 @@ class IObservation(metaclass=ABCMeta):
     This is just a marker interface.
     """
 
+    # no instance dictionary, so the implementations can be slotted
+    __slots__ = ()
+
     @classmethod
     def __subclasshook__(cls, subclass: object):
         """Checks the class' expected behavior as a formal python interface.
@@ -55,6 +55,10 @@ class IState(metaclass=ABCMeta):
     An `IState` possibly holds a `StateType`, an `IObservation`,
     and an associated `reward` and `discount`.
     """
+
+    # no instance dictionary, so the implementations can be slotted
+    __slots__ = ()
+
     @classmethod
     def __subclasshook__(cls, subclass: object):
         """Checks the class' expected behavior as a formal python interface.
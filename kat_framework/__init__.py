@@ -15,15 +15,25 @@
 
 from kat_framework.memory.uniform import *
 from kat_framework.memory.access import *
+from kat_framework.memory.loader import *
 from kat_framework.agents.rand import *
 from kat_framework.agents.deep_q import *
+from kat_framework.agents.greedy import *
 from kat_framework.config.config_props import *
 from kat_framework.config.config_handler import *
 from kat_framework.drivers.state import *
+from kat_framework.drivers.scheduler import *
 from kat_framework.serialization.model import *
 from kat_framework.serialization.storage import *
+from kat_framework.serialization.run_state import *
+from kat_framework.serialization.trajectory import *
 from kat_framework.core.factory import *
 from kat_framework.drivers.episode import *
+from kat_framework.drivers.pipeline import *
+from kat_framework.drivers.pool import *
+from kat_framework.drivers.watchdog import *
+from kat_framework.drivers.vector import *
+from kat_framework.drivers.evaluation import *
 from kat_framework.monitor.metrics import *
 from kat_framework.core.descriptors import *
 from kat_framework.games.openai.openai import *
@@ -31,5 +41,6 @@ from kat_framework.games.openai.observation import *
 from kat_framework.games.vizdoom.zdoom import *
 from kat_framework.games.vizdoom.observation import *
 from kat_framework.networks.models.random import *
+from kat_framework.networks.inference import *
 from kat_framework.framework import KatherineApplication
 from kat_framework.util import parsers, logger, fileio, reflection, tensors, metrics, testing
@@ -15,22 +15,31 @@
 
 from kat_framework.framework import KatherineApplication
 from kat_framework.config.config_props import AgentConfigurationProperty, KatConfigurationProperty
+from kat_framework.config.config_props import InferenceConfigurationProperty
 from kat_framework.core.descriptors import TensorDescriptor
+from kat_framework.networks.inference import InferenceServer
 from kat_framework.util import logger, tensors
+from kat_framework.util.timing import PhaseTimer, PREPROCESS_PHASE, PREDICT_PHASE
 from kat_api import ITensorDescriptor, IState, IObservation, INetwork, IConfigurationHandler, NetworkInputType
+from kat_api import IGame
 from kat_typing import Action, TrainLoss, Tensor, DistributionStrategy
-from typing import Collection, List
+from typing import Collection, List, Optional, Sequence, Tuple, Dict
 from abc import abstractmethod, ABCMeta
 from skimage.transform import resize
 from skimage.color import rgb2gray
 from collections import deque
 from overrides import overrides
 from logging import Logger
+from time import perf_counter
 import itertools as it
 import numpy as np
 import random
+import json
+import os
 
 UNCHECKED_WARN_MSG = "Unchecked input will be fed to the network, assuming unexpected behavior."
+STATE_FILE_NAME = "agent.json"
+NETWORK_STATE_DIRECTORY = "network"
 
 
 class BaseAgent(metaclass=ABCMeta):
@@ -55,6 +64,7 @@ class BaseAgent(metaclass=ABCMeta):
     _frame_stacking_enabled: bool = False
     _number_of_stacked_frames: int = 0
     _frame_buffer: deque = None
+    _env_frame_buffers: Dict[int, deque] = None
     _frame_buffer_output_shape: tuple = None
     _input_tensor_shape: tuple = None
     _observation_space_desc: Collection[ITensorDescriptor] = None
@@ -77,6 +87,7 @@ class BaseAgent(metaclass=ABCMeta):
     _current_episode: int = 0
     _current_step: int = 0
     _max_observe_episodes: int = 0
+    _phase_timer: PhaseTimer = None
     _initialized: bool = False
 
     # public members functions
@@ -126,6 +137,7 @@ class BaseAgent(metaclass=ABCMeta):
                 self._frame_buffer_output_shape = self._input_tensor_shape
         else:
             raise RuntimeError("Unexpected input type: {}".format(str(self._input_observation_type)))
+        self._env_frame_buffers = {}
         self._initialized = True
 
     def tick(self, current_episode: int, current_step: int) -> None:
@@ -151,11 +163,48 @@ class BaseAgent(metaclass=ABCMeta):
             self._log.warning(UNCHECKED_WARN_MSG)
         if observation is None:
             raise ValueError("No state specified.")
+        timer = self._phase_timer
+        if timer is not None:
+            start = perf_counter()
         processed_observation = self._pre_process_data(observation)
         processed_observation = self._stack_frames(processed_observation)
         self._epsilon = self._update_exploration_rate(game_state.get_state_id())
+        if timer is not None:
+            predict_start = perf_counter()
+            action = self._take_action(processed_observation)
+            timer.record(PREPROCESS_PHASE, predict_start - start)
+            timer.record(PREDICT_PHASE, perf_counter() - predict_start)
+            return action
         return self._take_action(processed_observation)
 
+    def take_actions(self, game_states: Sequence[IState], env_ids: Optional[Sequence[int]] = None) -> List[Action]:
+        """
+        Takes actions for multiple environments, based on policy.
+
+        #see: IAgent.take_actions(self, game_states: Sequence[IState], env_ids: Optional[Sequence[int]] = None)
+        """
+        if game_states is None or len(game_states) == 0:
+            raise ValueError("No states specified.")
+        if env_ids is None:
+            env_ids = range(len(game_states))
+        observations = np.empty((len(game_states), *self._frame_buffer_output_shape),
+                                dtype=self._input_observation_dtype)
+        epsilons = np.empty((len(game_states),), dtype=np.float32)
+        for i, (game_state, env_id) in enumerate(zip(game_states, env_ids)):
+            observation = game_state.get_observation()
+            if observation is None:
+                raise ValueError("No state specified.")
+            if self._observation_space_desc is not None:
+                if not tensors.check_same_observation_structure(observation, self._observation_space_desc):
+                    raise RuntimeError("Input structure vs observation mismatch.")
+            else:
+                self._log.warning(UNCHECKED_WARN_MSG)
+            processed_observation = self._pre_process_data(observation)
+            observations[i] = self._stack_env_frames(env_id, processed_observation, game_state.is_initial_state())
+            epsilons[i] = self._update_exploration_rate(game_state.get_state_id())
+        self._epsilon = float(np.mean(epsilons))
+        return self._take_actions(observations, epsilons)
+
     def train(self) -> TrainLoss:
         """
         Performs a train step on a specified batch.
@@ -192,11 +241,66 @@ class BaseAgent(metaclass=ABCMeta):
         if self.is_initialized():
             self._network.persist_model()
 
+    def save_state(self, directory: str) -> None:
+        """
+        Saves the counters (the exploration schedule is derived from them) and the network's state.
+
+        #see: IAgent.save_state(self, directory: str)
+        """
+        if directory is None:
+            raise ValueError("No directory specified.")
+        if not self.is_initialized():
+            raise RuntimeError("Agent is not initialized.")
+        with open(os.path.join(directory, STATE_FILE_NAME), "w") as state_file:
+            json.dump({"current_episode": self._current_episode,
+                       "current_step": self._current_step,
+                       "epsilon": self._epsilon}, state_file)
+        self._network.save_state(self._build_state_directory(directory, NETWORK_STATE_DIRECTORY))
+
+    def restore_state(self, directory: str) -> None:
+        """
+        #see: IAgent.restore_state(self, directory: str)
+        """
+        if directory is None:
+            raise ValueError("No directory specified.")
+        if not self.is_initialized():
+            raise RuntimeError("Agent is not initialized.")
+        with open(os.path.join(directory, STATE_FILE_NAME), "r") as state_file:
+            state = json.load(state_file)
+        self._current_episode = state["current_episode"]
+        self._current_step = state["current_step"]
+        self._epsilon = state["epsilon"]
+        self._network.restore_state(os.path.join(directory, NETWORK_STATE_DIRECTORY))
+
     def get_exploration_rate(self) -> float:
         return self._epsilon
 
+    def warm_up(self, game: IGame, max_episodes: int, max_steps: int, action_frequency: int) -> Tuple[int, int]:
+        """
+        No warm-up by default, the observing episodes are played by the driver.
+
+        #see: IAgent.warm_up(self, game: IGame, max_episodes: int, max_steps: int, action_frequency: int)
+        """
+        return 0, 0
+
     # protected member functions
 
+    @staticmethod
+    def _build_state_directory(directory: str, name: str) -> str:
+        """
+        Helper function for creating the sub directory of a state component.
+
+        :param directory:
+            the agent's state directory
+        :param name:
+            name of the component
+        :returns
+            path of the created directory
+        """
+        component_directory = os.path.join(directory, name)
+        os.makedirs(component_directory, exist_ok=True)
+        return component_directory
+
     @abstractmethod
     def _take_action(self, observation: Tensor) -> Action:
         """
@@ -210,6 +314,21 @@ class BaseAgent(metaclass=ABCMeta):
         """
         pass
 
+    @abstractmethod
+    def _take_actions(self, observations: Tensor, exploration_rates: Tensor) -> List[Action]:
+        """
+        `take_actions` method for derived classes, the public implementation of `take_actions` is
+        reserved for the base class.
+
+        :param observations:
+            batch of preprocessed observation tensors
+        :param exploration_rates:
+            exploration rate per observation
+        :return:
+            the actions taken by the network
+        """
+        pass
+
     @abstractmethod
     def _train(self) -> TrainLoss:
         """
@@ -282,6 +401,10 @@ class BaseAgent(metaclass=ABCMeta):
         self._max_observe_episodes = self._config_handler.get_config_property(
             AgentConfigurationProperty.MAX_OBSERVE_EPISODES,
             AgentConfigurationProperty.MAX_OBSERVE_EPISODES.prop_type)
+        if self._config_handler.get_config_property(
+                KatConfigurationProperty.PHASE_TIMING_ENABLED,
+                KatConfigurationProperty.PHASE_TIMING_ENABLED.prop_type):
+            self._phase_timer = PhaseTimer()
 
     def _pre_process_data(self, observation: IObservation) -> Tensor:
         """
@@ -301,6 +424,23 @@ class BaseAgent(metaclass=ABCMeta):
             tensor = tensor.astype(self._input_observation_dtype, copy=False)
         return tensor
 
+    def _pre_process_frames(self, frames: np.ndarray) -> np.ndarray:
+        """
+        Batched version of `_pre_process_data`, for the raw frames of recorded observations.
+
+        :param frames:
+            batch of raw observation tensors
+        :returns
+            batch of resized and reshaped observation data
+        """
+        if NetworkInputType.IMG == self._input_observation_type:
+            frames = resize(frames, (len(frames), *self._screen_size))
+            if self._convert_to_monochrome:
+                frames = rgb2gray(frames)
+            frames = np.reshape(frames, (len(frames), *self._input_tensor_shape))
+            frames = frames.astype(self._input_observation_dtype, copy=False)
+        return frames
+
     def _stack_frames(self, current_frame: Tensor) -> Tensor:
         """
         Persists the model on a specified storage.
@@ -313,6 +453,31 @@ class BaseAgent(metaclass=ABCMeta):
             stacked_state = np.squeeze(np.stack(self._frame_buffer, axis=2), axis=-1)
         return stacked_state
 
+    def _stack_env_frames(self, env_id: int, current_frame: Tensor, is_initial_state: bool) -> Tensor:
+        """
+        Per environment version of `_stack_frames`, the frame buffer of the environment
+        is cleared at the beginning of its episodes.
+
+        :param env_id:
+            environment id
+        :param current_frame:
+            preprocessed frame
+        :param is_initial_state:
+            first frame of an episode or not
+        :returns
+            stacked frames of the environment
+        """
+        if not self._frame_stacking_enabled or NetworkInputType.IMG != self._input_observation_type:
+            return current_frame
+        frame_buffer = self._env_frame_buffers.get(env_id)
+        if frame_buffer is None or is_initial_state:
+            frame_buffer = deque(
+                [np.zeros(self._input_tensor_shape, dtype=self._input_observation_dtype)
+                 for i in range(self._number_of_stacked_frames)], maxlen=self._number_of_stacked_frames)
+            self._env_frame_buffers[env_id] = frame_buffer
+        frame_buffer.append(current_frame)
+        return np.concatenate(frame_buffer, axis=2)
+
     def _update_exploration_rate(self, current_episode) -> float:
         """
         Calculates the exploration rate curve, based on the current epoch.
@@ -348,6 +513,8 @@ class DiscreteAgent(BaseAgent):
     _action_space: List[Action] = None
     _number_of_actions: int = 0
     _one_hot_encoded_action_space: bool = False
+    _inference_server_enabled: bool = False
+    _inference_server: InferenceServer = None
 
     # public member functions
 
@@ -393,6 +560,9 @@ class DiscreteAgent(BaseAgent):
         self._one_hot_encoded_action_space = self._config_handler.get_config_property(
             AgentConfigurationProperty.ONE_HOT_ENCODED_ACTION_SPACE,
             AgentConfigurationProperty.ONE_HOT_ENCODED_ACTION_SPACE.prop_type)
+        self._inference_server_enabled = self._config_handler.get_config_property(
+            InferenceConfigurationProperty.INFERENCE_SERVER_ENABLED,
+            InferenceConfigurationProperty.INFERENCE_SERVER_ENABLED.prop_type)
 
     @overrides
     def _take_action(self, observation: Tensor) -> Action:
@@ -405,16 +575,102 @@ class DiscreteAgent(BaseAgent):
         if np.random.rand() < self._epsilon:
             action_idx = random.randrange(self._number_of_actions)
         else:
-            input_t = np.array([observation])
-            policy = self._network.predict(input_t)
-            if isinstance(policy, np.ndarray):
-                action_idx = np.argmax(policy)
+            if self._inference_server is not None:
+                # batched together with the other actors' observations
+                policy = self._inference_server.predict(observation)
+                if isinstance(policy, np.ndarray):
+                    action_idx = np.argmax(policy)
+                else:
+                    action_idx = np.argmax(policy.numpy())
+                if isinstance(action_idx, np.ndarray):
+                    action_idx = action_idx[0]
             else:
-                action_idx = np.argmax(policy.numpy())
-            if isinstance(action_idx, np.ndarray):
-                action_idx = action_idx[0]
+                action_idx = self._network.predict_action(observation)
         return self._action_space[action_idx]
 
+    @overrides
+    def _take_actions(self, observations: Tensor, exploration_rates: Tensor) -> List[Action]:
+        """
+        Vectorized epsilon greedy, the greedy actions are evaluated by a single prediction
+        over the whole batch.
+
+        #see BaseAgent._take_actions()
+        #see BaseAgent.take_actions()
+        """
+        batch_size = len(observations)
+        is_exploring = np.random.rand(batch_size) < exploration_rates
+        action_ids = np.random.randint(self._number_of_actions, size=batch_size)
+        if not np.all(is_exploring):
+            policy = self._network.predict(observations)
+            if not isinstance(policy, np.ndarray):
+                policy = policy.numpy()
+            action_ids = np.where(is_exploring, action_ids, np.argmax(policy, axis=-1))
+        return [self._action_space[action_idx] for action_idx in action_ids]
+
+    def _process_transitions(self,
+                             states: Sequence[IState],
+                             env_ids: Optional[Sequence[int]] = None) -> Tuple[np.ndarray,
+                                                                               np.ndarray,
+                                                                               np.ndarray,
+                                                                               np.ndarray,
+                                                                               np.ndarray]:
+        """
+        Helper function for building a batch of transitions from the given states, for `store_transitions`.
+        The environments' frame buffers are containing the initiator frames (see `take_actions`).
+
+        :param states:
+            game states with transitions
+        :param env_ids:
+            environment ids of the states respectively
+        :returns
+            a tuple of (s1_states, action_ids, s2_states, rewards, terminals) arrays
+        """
+        if states is None or len(states) == 0:
+            raise ValueError("No states specified.")
+        if env_ids is None:
+            env_ids = range(len(states))
+        batch_size = len(states)
+        s1_states = np.empty((batch_size, *self._frame_buffer_output_shape), dtype=self._input_observation_dtype)
+        s2_states = np.empty((batch_size, *self._frame_buffer_output_shape), dtype=self._input_observation_dtype)
+        action_ids = np.empty((batch_size,), dtype=self._action_space_desc.get_data_type())
+        rewards = np.empty((batch_size,), dtype=np.float32)
+        terminals = np.empty((batch_size,), dtype=np.bool)
+        is_stacked = self._frame_stacking_enabled and NetworkInputType.IMG == self._input_observation_type
+        for i, (state, env_id) in enumerate(zip(states, env_ids)):
+            if state is None:
+                raise ValueError("No state specified.")
+            processed_s2_state = self._pre_process_data(state.get_transitioned_observation())
+            if is_stacked:
+                frame_buffer = self._env_frame_buffers[env_id]
+                s1_states[i] = np.concatenate(frame_buffer, axis=2)
+                # the transitioned state is the initiator without the oldest frame + the new frame
+                s2_states[i, ..., :-self._screen_channels] = s1_states[i, ..., self._screen_channels:]
+                s2_states[i, ..., -self._screen_channels:] = processed_s2_state
+            else:
+                s1_states[i] = self._pre_process_data(state.get_observation())
+                s2_states[i] = processed_s2_state
+            action_ids[i] = self._action_space.index(state.get_transition())
+            rewards[i] = state.get_reward()
+            terminals[i] = state.is_end_state()
+        return s1_states, action_ids, s2_states, rewards, terminals
+
+    def _build_inference_server(self) -> Optional[InferenceServer]:
+        """
+        Helper function for attaching the application scoped inference server, if it is enabled,
+        the agent is registered as an actor. Derived classes should call it after the network was built.
+
+        :returns
+            a running `InferenceServer` instance, or None
+        """
+        if not self._inference_server_enabled:
+            return None
+        inference_server = InferenceServer()
+        if not inference_server.is_initialized():
+            inference_server.init(self._network)
+        inference_server.register_actor()
+        inference_server.start()
+        return inference_server
+
     def _build_action_space(self) -> List[Action]:
         """
         Building the Agent's action space based on the provided
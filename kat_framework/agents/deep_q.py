@@ -14,15 +14,24 @@
 ##################################################
 
 from kat_framework.framework import KatherineApplication
-from kat_framework.config.config_props import AgentConfigurationProperty
+from kat_framework.config.config_props import AgentConfigurationProperty, NetworkConfigurationProperty
 from kat_framework.agents.base import DiscreteAgent
 from kat_framework.core.descriptors import TensorDescriptor
+from kat_framework.memory.loader import TrajectoryMemoryLoader
+from kat_framework.serialization.trajectory import INITIAL_RECORD, ACTIVE_RECORD, FINAL_RECORD
 from kat_api import INetwork, IAgent, ITensorDescriptor, IReplayMemory, IReadOnlyMemory
-from kat_api import NetworkInputType, IState
+from kat_api import NetworkInputType, IState, IGame, IObservation
 from kat_typing import TrainLoss
 from overrides import overrides
-from typing import Collection
+from typing import Collection, Dict, Sequence, Optional, Tuple
+from time import perf_counter
 import numpy as np
+import os
+
+MEMORY_STATE_DIRECTORY = "replay_memory"
+# array order of TrajectoryMemoryLoader.add_records
+WARM_UP_RECORD_KEYS = ("frames", "actions", "rewards", "terminals", "record_types")
+TARGET_NETWORK_STATE_DIRECTORY = "target_network"
 
 
 class QAgent(DiscreteAgent, IAgent):
@@ -34,6 +43,9 @@ class QAgent(DiscreteAgent, IAgent):
     _network_synchronization_frequency: int = 0
     _replay_memory: IReplayMemory = None
     _memory_access: IReadOnlyMemory = None
+    _steps_per_execution: int = 1
+    _deferred_train_steps: int = 0
+    _last_loss: TrainLoss = 0.0
 
     # public member functions
 
@@ -57,6 +69,7 @@ class QAgent(DiscreteAgent, IAgent):
                                  action_space_descriptor=action_space_descriptor)
         self._replay_memory = self._build_replay_memory()
         self._network = self._build_network()
+        self._inference_server = self._build_inference_server()
         self._initialized = True
 
     @overrides
@@ -90,6 +103,103 @@ class QAgent(DiscreteAgent, IAgent):
             reward,
             is_end_state)
 
+    @overrides
+    def store_transitions(self, states: Sequence[IState], env_ids: Optional[Sequence[int]] = None) -> None:
+        """
+        Stores a batch of transitions to the associated replay memory.
+
+        #see IAgent.store_transitions(self, states: Sequence[IState], env_ids: Optional[Sequence[int]] = None)
+        """
+        s1_states, action_ids, s2_states, rewards, terminals = self._process_transitions(states, env_ids)
+        self._replay_memory.add_transitions(s1_states, action_ids, s2_states, rewards, terminals)
+
+    @overrides
+    def warm_up(self, game: IGame, max_episodes: int, max_steps: int, action_frequency: int) -> Tuple[int, int]:
+        """
+        Plays the observing episodes with uniformly random actions (drawn in chunks), the raw frames are
+        collected in chunks, and each chunk is preprocessed, stacked and stored at once (see:
+        `TrajectoryMemoryLoader`). No policy evaluation, exploration schedule or train step is involved.
+        The episodes are ended like the driver's: an episode finished by the ticks ends after the
+        acted step, which is stored as not terminal.
+
+        #see: IAgent.warm_up(self, game: IGame, max_episodes: int, max_steps: int, action_frequency: int)
+        """
+        if game is None:
+            raise ValueError("No game specified.")
+        number_of_episodes = min(self._max_observe_episodes, max_episodes)
+        if number_of_episodes <= 0:
+            return 0, 0
+        # at least an acted and a final record
+        chunk_size = max(2, self._config_handler.get_config_property(
+            AgentConfigurationProperty.MEMORY_PREFILL_CHUNK_SIZE,
+            AgentConfigurationProperty.MEMORY_PREFILL_CHUNK_SIZE.prop_type))
+        loader = self._build_memory_loader(self._replay_memory, chunk_size)
+        generator = np.random.default_rng()
+        records = self._allocate_warm_up_records(generator, chunk_size)
+        size = 0
+        number_of_steps = 0
+        start = perf_counter()
+        for _ in range(number_of_episodes):
+            observation = game.reset()
+            record_type = INITIAL_RECORD
+            step_counter = 0
+            is_finished = False
+            while not is_finished:
+                self._copy_raw_frame(observation, records["frames"], size)
+                next_observation, reward = game.make_action(self._action_space[records["actions"][size]])
+                is_finished = game.is_episode_finished() or max_steps <= step_counter
+                records["rewards"][size] = reward
+                records["terminals"][size] = is_finished
+                records["record_types"][size] = record_type
+                size += 1
+                game.release_observation(observation)
+                if not is_finished and action_frequency > 0:
+                    game.process_ticks(action_frequency)
+                    game.release_observation(next_observation)
+                    next_observation = game.get_current_observation()
+                    # finished by the ticks, the acted step is kept not terminal (see: `EpisodeDriver._loop`)
+                    is_finished = game.is_episode_finished()
+                if is_finished:
+                    self._copy_raw_frame(next_observation, records["frames"], size)
+                    records["rewards"][size] = 0.0
+                    records["terminals"][size] = True
+                    records["record_types"][size] = FINAL_RECORD
+                    size += 1
+                    game.release_observation(next_observation)
+                observation = next_observation
+                record_type = ACTIVE_RECORD
+                step_counter += 1
+                if size > chunk_size - 2:
+                    loader.add_records(*(records[key][:size] for key in WARM_UP_RECORD_KEYS))
+                    records = self._allocate_warm_up_records(generator, chunk_size)
+                    size = 0
+            number_of_steps += step_counter
+        if size > 0:
+            loader.add_records(*(records[key][:size] for key in WARM_UP_RECORD_KEYS))
+        elapsed_time = perf_counter() - start
+        self._log.info("%d warm-up episodes (%d steps) played in %.2f sec (%.1f steps/sec).",
+                       number_of_episodes, number_of_steps, elapsed_time,
+                       number_of_steps / max(elapsed_time, 1e-9))
+        return number_of_episodes, number_of_steps
+
+    @overrides
+    def save_state(self, directory: str) -> None:
+        """
+        Saves the replay memory as well.
+
+        #see IAgent.save_state(self, directory: str)
+        """
+        super(QAgent, self).save_state(directory)
+        self._replay_memory.save_state(self._build_state_directory(directory, MEMORY_STATE_DIRECTORY))
+
+    @overrides
+    def restore_state(self, directory: str) -> None:
+        """
+        #see IAgent.restore_state(self, directory: str)
+        """
+        super(QAgent, self).restore_state(directory)
+        self._replay_memory.restore_state(os.path.join(directory, MEMORY_STATE_DIRECTORY))
+
     # protected member functions
 
     @overrides
@@ -101,16 +211,26 @@ class QAgent(DiscreteAgent, IAgent):
         self._network_synchronization_frequency = self._config_handler.get_config_property(
             AgentConfigurationProperty.NETWORK_SYNCHRONIZATION_FREQUENCY,
             AgentConfigurationProperty.NETWORK_SYNCHRONIZATION_FREQUENCY.prop_type)
+        self._steps_per_execution = self._config_handler.get_config_property(
+            NetworkConfigurationProperty.STEPS_PER_EXECUTION,
+            NetworkConfigurationProperty.STEPS_PER_EXECUTION.prop_type)
 
     @overrides
     def _train(self) -> TrainLoss:
         """
-        Performs a training step on the specified batch.
+        Performs a training step on the specified batch. The network performs `steps_per_execution`
+        gradient steps per call, so it is called in every x-th train step only (the last loss is
+        returned between the calls).
 
         :return:
             current train loss
         """
-        return self._network.train_batch(self._current_episode, self._current_step)
+        self._deferred_train_steps += 1
+        if self._deferred_train_steps < self._steps_per_execution:
+            return self._last_loss
+        self._deferred_train_steps = 0
+        self._last_loss = self._network.train_batch(self._current_episode, self._current_step)
+        return self._last_loss
 
     def _build_memory_access(self) -> None:
         """
@@ -157,8 +277,89 @@ class QAgent(DiscreteAgent, IAgent):
              TensorDescriptor('terminals', np.bool, (memory_max_size, )))
         memory = KatherineApplication.get_application_factory().build_memory()
         memory.init(memory_tensor_spec)
+        prefill_directory = self._config_handler.get_config_property(
+            AgentConfigurationProperty.MEMORY_PREFILL_DIRECTORY,
+            AgentConfigurationProperty.MEMORY_PREFILL_DIRECTORY.prop_type)
+        if prefill_directory is not None:
+            self._prefill_replay_memory(memory, prefill_directory, memory_max_size)
         return memory
 
+    def _prefill_replay_memory(self, memory: IReplayMemory, directory: str, memory_max_size: int) -> None:
+        """
+        Bulk loads recorded experience into the replay memory, instead of the observing episodes.
+
+        :param memory:
+            the initialized replay memory
+        :param directory:
+            directory of the recorded trajectory shards
+        :param memory_max_size:
+            capacity of the memory, the loading stops when it is full
+        """
+        chunk_size = self._config_handler.get_config_property(
+            AgentConfigurationProperty.MEMORY_PREFILL_CHUNK_SIZE,
+            AgentConfigurationProperty.MEMORY_PREFILL_CHUNK_SIZE.prop_type)
+        loader = self._build_memory_loader(memory, chunk_size, to_action_ids=self._to_action_ids)
+        number_of_transitions, _ = loader.load(directory, max_transitions=memory_max_size)
+        if number_of_transitions > 0:
+            self._max_observe_episodes = 0
+            self._log.info("Replay memory prefilled, the observing episodes are skipped.")
+
+    def _build_memory_loader(self,
+                             memory: IReplayMemory,
+                             chunk_size: int,
+                             to_action_ids=None) -> TrajectoryMemoryLoader:
+        """
+        Builds a bulk loader, which preprocesses and stacks the raw frames like the agent.
+
+        :param memory:
+            the initialized replay memory
+        :param chunk_size:
+            maximum number of records processed at once
+        :param to_action_ids:
+            batched mapping of the actions to action ids, or None if they are the ids
+        """
+        number_of_stacked_frames = 1
+        if self._frame_stacking_enabled and NetworkInputType.IMG == self._input_observation_type:
+            number_of_stacked_frames = self._number_of_stacked_frames
+        return TrajectoryMemoryLoader(memory,
+                                      self._input_observation_name,
+                                      number_of_stacked_frames=number_of_stacked_frames,
+                                      chunk_size=chunk_size,
+                                      pre_process=self._pre_process_frames,
+                                      to_action_ids=to_action_ids)
+
+    def _allocate_warm_up_records(self, generator: np.random.Generator, chunk_size: int) -> Dict[str, np.ndarray]:
+        """
+        Allocates a chunk of warm-up records (see: `TrajectoryMemoryLoader.add_records`), with the
+        random action ids drawn in advance.
+        """
+        return {"frames": np.empty((chunk_size, *self._input_observation_desc.get_tensor_shape()),
+                                   dtype=self._input_observation_desc.get_data_type()),
+                "actions": generator.integers(len(self._action_space), size=chunk_size,
+                                              dtype=self._action_space_desc.get_data_type()),
+                "rewards": np.empty((chunk_size,), dtype=np.float32),
+                "terminals": np.empty((chunk_size,), dtype=np.bool_),
+                "record_types": np.empty((chunk_size,), dtype=np.int8)}
+
+    def _copy_raw_frame(self, observation: Optional[IObservation], frames: np.ndarray, index: int) -> None:
+        """
+        Copies the input field of an observation into a record, the missing observations are zeros.
+        """
+        if observation is None:
+            frames[index] = 0
+        else:
+            frames[index] = getattr(observation, self._input_observation_name)
+
+    def _to_action_ids(self, actions: np.ndarray) -> np.ndarray:
+        """
+        Batched version of the action space lookup (see: `store_transition`).
+        """
+        dtype = self._action_space_desc.get_data_type()
+        if not self._one_hot_encoded_action_space:
+            return actions.astype(dtype, copy=False)
+        action_ids = {tuple(action): i for i, action in enumerate(self._action_space)}
+        return np.asarray([action_ids[tuple(action)] for action in actions.tolist()], dtype=dtype)
+
 
 class DQAgent(QAgent, IAgent):
     """
@@ -168,6 +369,7 @@ class DQAgent(QAgent, IAgent):
     # protected members
 
     _target_network: INetwork
+    _target_network_update_tau: float = 1.0
 
     # public member functions
 
@@ -192,14 +394,44 @@ class DQAgent(QAgent, IAgent):
         self._target_network = self._build_network()
         self._inject_target_network()
 
+    @overrides
+    def save_state(self, directory: str) -> None:
+        """
+        Saves the target network as well, it can be behind the evaluation network.
+
+        #see IAgent.save_state(self, directory: str)
+        """
+        super(DQAgent, self).save_state(directory)
+        self._target_network.save_state(self._build_state_directory(directory, TARGET_NETWORK_STATE_DIRECTORY))
+
+    @overrides
+    def restore_state(self, directory: str) -> None:
+        """
+        #see IAgent.restore_state(self, directory: str)
+        """
+        super(DQAgent, self).restore_state(directory)
+        self._target_network.restore_state(os.path.join(directory, TARGET_NETWORK_STATE_DIRECTORY))
+
     # protected member functions
 
+    @overrides
+    def _load_configuration(self):
+        """
+        Loads necessary configurations.
+        """
+        super(DQAgent, self)._load_configuration()
+        self._target_network_update_tau = self._config_handler.get_config_property(
+            AgentConfigurationProperty.TARGET_NETWORK_UPDATE_TAU,
+            AgentConfigurationProperty.TARGET_NETWORK_UPDATE_TAU.prop_type)
+        if not 0.0 < self._target_network_update_tau <= 1.0:
+            raise ValueError("The target network update tau must be in (0, 1].")
+
     def _update_networks(self) -> None:
         """
         Helper function for synchronizing network weights.
         """
         if self._target_network is not None:
-            self._target_network.set_weights(self._network.get_weights())
+            self._network.update_target_network(self._target_network_update_tau)
 
     @overrides
     def _train(self) -> TrainLoss:
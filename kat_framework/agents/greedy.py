@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework.framework import KatherineApplication
+from kat_framework.config.config_props import EvaluationConfigurationProperty
+from kat_framework.agents.base import DiscreteAgent
+from kat_api import IAgent, ITensorDescriptor, IState
+from kat_typing import TrainLoss
+from overrides import overrides
+from typing import Collection, Sequence, Optional
+
+
+class GreedyAgent(DiscreteAgent, IAgent):
+    """
+    Evaluation agent implementation.
+
+    Takes the greedy actions of a restored network (with an optional constant exploration rate).
+    It has no replay memory, and it is not training.
+    """
+
+    # protected members
+
+    _exploration_rate: float = 0.0
+
+    # public member functions
+
+    def __init__(self):
+        """
+        Default constructor.
+        """
+        super(GreedyAgent, self).__init__()
+
+    @overrides
+    def init(self,
+             observation_space_desc: Collection[ITensorDescriptor],
+             action_space_descriptor: ITensorDescriptor) -> None:
+        """
+        Object initialization.
+
+        #see: IAgent.init(observation_space_desc: Collection[ITensorDescriptor],
+                          action_space_desc: ITensorDescriptor)
+        """
+        super(GreedyAgent, self).init(observation_space_desc=observation_space_desc,
+                                      action_space_descriptor=action_space_descriptor)
+        self._network = KatherineApplication.get_application_factory().build_network()
+        self._network.init(output_descriptor=self._network_output_spec, input_descriptor=self._network_input_spec)
+        self._epsilon = self._exploration_rate
+        self._initialized = True
+
+    def restore_model(self, filepath: str) -> None:
+        """
+        Replaces the network's model with a persisted one.
+
+        :param filepath:
+            path of the persisted model
+        """
+        self._network.restore_model(filepath)
+
+    def restore_checkpoint(self, filepath: str) -> None:
+        """
+        Restores the network's weights from a checkpoint.
+
+        :param filepath:
+            path of the checkpoint
+        """
+        self._network.restore_checkpoint(filepath)
+
+    @overrides
+    def store_transition(self, state: IState) -> str:
+        """
+        Nothing to store.
+
+        #see IAgent.store_transition(self, state: IState) -> str:
+        """
+        pass
+
+    @overrides
+    def store_transitions(self, states: Sequence[IState], env_ids: Optional[Sequence[int]] = None) -> None:
+        """
+        Nothing to store.
+
+        #see IAgent.store_transitions(self, states: Sequence[IState], env_ids: Optional[Sequence[int]] = None)
+        """
+        pass
+
+    @overrides
+    def persist_model(self):
+        """
+        The evaluated model is already persisted.
+        """
+        pass
+
+    # protected member functions
+
+    @overrides
+    def _train(self) -> TrainLoss:
+        """
+        No training.
+        """
+        return 0.0
+
+    @overrides
+    def _load_configuration(self):
+        """
+        Loads necessary configurations.
+        """
+        super(GreedyAgent, self)._load_configuration()
+        self._exploration_rate = self._config_handler.get_config_property(
+            EvaluationConfigurationProperty.EVALUATION_EXPLORATION_RATE,
+            EvaluationConfigurationProperty.EVALUATION_EXPLORATION_RATE.prop_type)
+
+    @overrides
+    def _update_exploration_rate(self, current_episode) -> float:
+        """
+        Constant exploration rate.
+        """
+        return self._exploration_rate
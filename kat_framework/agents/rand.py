@@ -21,8 +21,11 @@ from kat_api import NetworkInputType, IAgent, ITensorDescriptor, IReplayMemory
 from kat_api import IState
 from kat_typing import TrainLoss
 from overrides import overrides
-from typing import Collection
+from typing import Collection, Sequence, Optional
 import numpy as np
+import os
+
+MEMORY_STATE_DIRECTORY = "replay_memory"
 
 
 class RandomChoiceAgent(DiscreteAgent, IAgent):
@@ -69,6 +72,7 @@ class RandomChoiceAgent(DiscreteAgent, IAgent):
             NetworkInputType.NONE)
         self._network = KatherineApplication.get_application_factory().build_network()
         self._network.init(output_descriptor=self._network_output_spec, input_descriptor=self._network_input_spec)
+        self._inference_server = self._build_inference_server()
         self._replay_memory = self._build_replay_memory()
 
     @overrides
@@ -102,6 +106,34 @@ class RandomChoiceAgent(DiscreteAgent, IAgent):
             reward,
             is_end_state)
 
+    @overrides
+    def store_transitions(self, states: Sequence[IState], env_ids: Optional[Sequence[int]] = None) -> None:
+        """
+        Stores a batch of transitions to the associated replay memory.
+
+        #see IAgent.store_transitions(self, states: Sequence[IState], env_ids: Optional[Sequence[int]] = None)
+        """
+        s1_states, action_ids, s2_states, rewards, terminals = self._process_transitions(states, env_ids)
+        self._replay_memory.add_transitions(s1_states, action_ids, s2_states, rewards, terminals)
+
+    @overrides
+    def save_state(self, directory: str) -> None:
+        """
+        Saves the replay memory as well.
+
+        #see IAgent.save_state(self, directory: str)
+        """
+        super(RandomChoiceAgent, self).save_state(directory)
+        self._replay_memory.save_state(self._build_state_directory(directory, MEMORY_STATE_DIRECTORY))
+
+    @overrides
+    def restore_state(self, directory: str) -> None:
+        """
+        #see IAgent.restore_state(self, directory: str)
+        """
+        super(RandomChoiceAgent, self).restore_state(directory)
+        self._replay_memory.restore_state(os.path.join(directory, MEMORY_STATE_DIRECTORY))
+
     # public member function
 
     @overrides
@@ -53,6 +53,48 @@ class KatConfigurationProperty(ConfigurationProperty):
     CLUSTER_INFO = ("cluster_info", tuple, None)
     # train batch size per train step
     TRAIN_BATCH_SIZE = ("train_batch_size", int, -1)
+    # timing of the drivers' hot path phases is enabled or not
+    PHASE_TIMING_ENABLED = ("phase_timing_enabled", bool, False)
+
+
+class GameConfigurationProperty(ConfigurationProperty):
+    """
+    Common game wrapper properties.
+    """
+    # number of environment steps per `make_action` call, with the same action (1: disabled)
+    ACTION_REPEAT = ("action_repeat", int, 1)
+    # the repeated action's observation is the maximum of the last two frames, or not (Atari flickering)
+    MAX_POOLING_ENABLED = ("max_pooling_enabled", bool, False)
+    # only the agent's input observation is fetched from the game, and the unused buffers are not rendered
+    SELECTIVE_OBSERVATION_ENABLED = ("selective_observation_enabled", bool, True)
+    # number of preallocated observation buffers, recycled after the consumption (0: disabled)
+    OBSERVATION_BUFFER_POOL_SIZE = ("observation_buffer_pool_size", int, 0)
+
+
+class SyntheticGameConfigurationProperty(ConfigurationProperty):
+    """
+    Synthetic (deterministic benchmark) game properties.
+    """
+    # observation (screen buffer) dimensions and numpy data type
+    SYNTHETIC_SCREEN_WEIGHT = ("synthetic_screen_weight", int, 640)
+    SYNTHETIC_SCREEN_HEIGHT = ("synthetic_screen_height", int, 480)
+    SYNTHETIC_SCREEN_CHANNELS = ("synthetic_screen_channels", int, 3)
+    SYNTHETIC_SCREEN_DTYPE = ("synthetic_screen_dtype", str, "float32")
+    # number of preallocated frames served in round robin (zero or less means a new frame per step)
+    SYNTHETIC_FRAME_POOL_SIZE = ("synthetic_frame_pool_size", int, 16)
+    # seed of the frame generator
+    SYNTHETIC_SEED = ("synthetic_seed", int, 0)
+    # number of steps per episode
+    SYNTHETIC_EPISODE_LENGTH = ("synthetic_episode_length", int, 100)
+    # simulated engine time per step in milliseconds (busy waiting, zero means no cost)
+    SYNTHETIC_STEP_COST = ("synthetic_step_cost", float, 0.0)
+    # number of discrete actions
+    SYNTHETIC_ACTION_SPACE_SIZE = ("synthetic_action_space_size", int, 4)
+    # reward of a step, if the rewarded action is taken (negative rewarded action means any action)
+    SYNTHETIC_STEP_REWARD = ("synthetic_step_reward", float, 1.0)
+    SYNTHETIC_REWARDED_ACTION = ("synthetic_rewarded_action", int, -1)
+    # additional reward of the last step in the episode
+    SYNTHETIC_TERMINAL_REWARD = ("synthetic_terminal_reward", float, 0.0)
 
 
 class ViZDoomConfigurationProperty(ConfigurationProperty):
@@ -123,6 +165,35 @@ class DriverConfigurationProperty(ConfigurationProperty):
     ACTION_FREQUENCY = ("action_frequency", int, 2)
     # network training is enabled or not
     TRAINING_ENABLED = ("training_enabled", bool, True)
+    # number of game instances stepped in lockstep by the vectorized drivers
+    NUMBER_OF_ENVIRONMENTS = ("number_of_environments", int, 4)
+    # number of actor pool worker processes (zero or less means one per CPU core,
+    # but not more than the number of environments)
+    ACTOR_POOL_WORKERS = ("actor_pool_workers", int, 0)
+    # number of observation slots per environment in the shared memory ring buffers
+    ACTOR_RING_BUFFER_SIZE = ("actor_ring_buffer_size", int, 4)
+    # maximum number of restarts per actor worker
+    ACTOR_MAX_RESTARTS = ("actor_max_restarts", int, 3)
+    # the games are hosted by watched worker processes (the episode drivers' game, or the actor pool's games),
+    # the hung workers are killed and restarted, and their episodes are truncated
+    GAME_WATCHDOG_ENABLED = ("game_watchdog_enabled", bool, False)
+    # deadline (sec) of the watched reset, make_action and process_ticks calls
+    GAME_CALL_DEADLINE = ("game_call_deadline", float, 30.0)
+    # step latency SLO (ms) of the watched make_action and process_ticks calls (zero or less means no SLO)
+    GAME_STEP_LATENCY_SLO = ("game_step_latency_slo", float, 0.0)
+    # target ratio of gradient steps to environment steps of the asynchronous driver
+    # (zero or less means no limit, the learner is only idling during the observation)
+    REPLAY_RATIO = ("replay_ratio", float, 0.25)
+    # maximum number of gradient steps the learner can lag behind the target ratio,
+    # before the environment steps are blocked
+    REPLAY_RATIO_MAX_LAG = ("replay_ratio_max_lag", int, 16)
+    # capacity of the queues between the stages of the pipelined driver
+    PIPELINE_QUEUE_SIZE = ("pipeline_queue_size", int, 8)
+    # the pipelined driver resets a spare game instance in the background, or not
+    RESET_PREFETCH_ENABLED = ("reset_prefetch_enabled", bool, True)
+    # the observing episodes are played by the agent's random warm-up policy, before the main loop
+    # (see: IAgent.warm_up), or not
+    FAST_WARM_UP_ENABLED = ("fast_warm_up_enabled", bool, False)
 
 
 class ModelSerializerProperty(ConfigurationProperty):
@@ -135,6 +206,37 @@ class ModelSerializerProperty(ConfigurationProperty):
     MODEL_CHECKPOINTS_ENABLED = ("model_checkpoints_enabled", bool, False)
 
 
+class RunStateConfigurationProperty(ConfigurationProperty):
+    """
+    Run state (checkpoint and resume of the whole training) configuration properties.
+    """
+    # the run state is saved after every n-th episode (0: disabled)
+    RUN_STATE_FREQUENCY = ("run_state_frequency", int, 100)
+    # number of the kept run states
+    RUN_STATE_MAX_TO_KEEP = ("run_state_max_to_keep", int, 2)
+    # resuming from the latest run state of the run state directory, or not
+    RUN_STATE_RESUME_ENABLED = ("run_state_resume_enabled", bool, True)
+    # directory of the saved and resumed run states (default: base_work_directory/game/agent/run_states,
+    # it is not scoped by the run tag, so a restarted process finds the run states of the previous one)
+    RUN_STATE_DIRECTORY = ("run_state_directory", str, None)
+
+
+class TrajectoryConfigurationProperty(ConfigurationProperty):
+    """
+    Trajectory (recorded experience) configuration properties.
+    """
+    # the episode drivers are recording the observations, actions, rewards and terminals, or not
+    TRAJECTORY_RECORDING_ENABLED = ("trajectory_recording_enabled", bool, False)
+    # number of records per compressed shard file
+    TRAJECTORY_SHARD_SIZE = ("trajectory_shard_size", int, 100)
+    # number of records waiting for the background writer, before the driver is blocked
+    TRAJECTORY_QUEUE_SIZE = ("trajectory_queue_size", int, 256)
+    # directory of the replayed trajectory shards (replay game)
+    TRAJECTORY_REPLAY_DIRECTORY = ("trajectory_replay_directory", str, None)
+    # the replay game starts over, after the last recorded episode, or not
+    TRAJECTORY_REPLAY_LOOP_ENABLED = ("trajectory_replay_loop_enabled", bool, True)
+
+
 class AgentConfigurationProperty(ConfigurationProperty):
     """
     Agent configuration properties.
@@ -151,12 +253,23 @@ class AgentConfigurationProperty(ConfigurationProperty):
     SCREEN_CHANNELS = ("screen_channels", int, 1)
     # maximum deepness of the replay memory
     MEMORY_MAX_SIZE = ("memory_max_size", int, 200)
+    # directory of recorded trajectory shards, the replay memory is prefilled from (None: disabled),
+    # the observing episodes are skipped, if it is prefilled
+    MEMORY_PREFILL_DIRECTORY = ("memory_prefill_directory", str, None)
+    # number of records preprocessed and stored at once, by the prefill
+    MEMORY_PREFILL_CHUNK_SIZE = ("memory_prefill_chunk_size", int, 1024)
+    # the replay memory caches the max target Q values of the transitioned states with the target network's
+    # version, and only the stale ones are recomputed (target network without double Q learning only)
+    TARGET_Q_CACHE_ENABLED = ("target_q_cache_enabled", bool, False)
     # distributed learning is enabled or not (if true, `CLUSTER_INFO` must be present)
     DISTRIBUTED_LEARNING_ENABLED = ("distributed_learning_enabled", bool, False)
     # name of the primary input observation in the observation vector
     INPUT_OBSERVATION_NAME = ("input_observation_name", str, "screen_buffer")
     # only used by eval/target network based architectures, weight synchronization rate (every x steps)
     NETWORK_SYNCHRONIZATION_FREQUENCY = ("network_synchronization_frequency", int, 100)
+    # weight of the evaluation network at the target network synchronization (1.0: hard copy,
+    # less than 1.0: soft (Polyak) update, mostly with a synchronization in every step)
+    TARGET_NETWORK_UPDATE_TAU = ("target_network_update_tau", float, 1.0)
     # if `SCREEN_CHANNELS` == 1 then it must be true, converting the screen buffer
     # into a monochrome buffer, the original buffer's channel dim must be 3
     CONVERT_TO_MONOCHROME = ("convert_to_monochrome", bool, True)
@@ -186,12 +299,52 @@ class NetworkConfigurationProperty(ConfigurationProperty):
     OPTIMIZER_LEARNING_RATE = ("optimizer_learning_rate", float, 0.001)
     # reward discount factor (0.0 - 1.0)
     REWARD_DISCOUNT_FACTOR = ("reward_discount_factor", float, 0.99)
+    # double Q learning targets, the online network selects the greedy actions of the transitioned
+    # states and the target network evaluates them (with target network only)
+    DOUBLE_Q_LEARNING_ENABLED = ("double_q_learning_enabled", bool, False)
+    # number of gradient steps per compiled train function call, the agents are dispatching a call
+    # in every x-th train step, so the number of gradient steps per train step is unchanged
+    STEPS_PER_EXECUTION = ("steps_per_execution", int, 1)
+    # keras mixed precision policy of the hidden layers, `mixed_bfloat16` (CPU) or `mixed_float16` (GPU, with
+    # loss scaling), the variables and the Q value outputs are float32 (None: float32 only)
+    MIXED_PRECISION_POLICY = ("mixed_precision_policy", str, None)
+    # XLA compilation of the forward pass and of the train step (without the input pipeline), the
+    # plain graph functions are used if the layers or the train step are not compilable, or if the
+    # variables are on parameter servers (distributed learning)
+    JIT_COMPILE_ENABLED = ("jit_compile_enabled", bool, False)
     # model's path to restore on process start (Optional)
     RESTORE_MODEL_FROM = ("restore_model_from", str, None)
     # checkpoint's path to restore on process start (Optional)
     RESTORE_CHECKPOINT_FROM = ("restore_checkpoint_from", str, None)
     # checkpoint creation episode frequency (episode % value == 0)
     CHECKPOINT_FREQUENCY = ("checkpoint_frequency", int, 100)
+    # maximum number of distributed train steps in flight, their losses are fetched lazily
+    # (0: the coordinator waits for each step before scheduling the next one)
+    MAX_IN_FLIGHT_STEPS = ("max_in_flight_steps", int, 0)
+
+
+class InferenceConfigurationProperty(ConfigurationProperty):
+    """
+    Batched inference server configuration properties.
+    """
+    # greedy actions are evaluated through the batched inference server or not
+    INFERENCE_SERVER_ENABLED = ("inference_server_enabled", bool, False)
+    # maximum number of pending observations evaluated by one predict call
+    INFERENCE_MAX_BATCH_SIZE = ("inference_max_batch_size", int, 32)
+    # maximum waiting time (in seconds) of the oldest pending observation before a flush
+    INFERENCE_MAX_LATENCY = ("inference_max_latency", float, 0.001)
+
+
+class EvaluationConfigurationProperty(ConfigurationProperty):
+    """
+    Evaluation driver configuration properties.
+    """
+    # number of evaluation episodes
+    EVALUATION_EPISODES = ("evaluation_episodes", int, 10)
+    # number of evaluation worker processes
+    EVALUATION_WORKERS = ("evaluation_workers", int, 2)
+    # constant exploration rate of the evaluation agent
+    EVALUATION_EXPLORATION_RATE = ("evaluation_exploration_rate", float, 0.0)
 
 
 class TensorBoardConfigurationProperty(ConfigurationProperty):
@@ -15,19 +15,54 @@
 
 from kat_framework.framework import KatherineApplication
 from kat_framework.monitor.properties import KatMetrics
-from kat_framework.drivers.state import KatState
+from kat_framework.drivers.state import KatState, KatStatePool
+from kat_framework.drivers.watchdog import GameWatchdog
+from kat_framework.drivers.scheduler import ReplayRatioScheduler
 from kat_framework.config.config_props import DriverConfigurationProperty, KatConfigurationProperty
+from kat_framework.config.config_props import AgentConfigurationProperty
+from kat_framework.config.config_props import InferenceConfigurationProperty, RunStateConfigurationProperty
+from kat_framework.config.config_props import TrajectoryConfigurationProperty, NetworkConfigurationProperty
+from kat_framework.networks.inference import InferenceServer
+from kat_framework.serialization.run_state import RunStateSerializer
+from kat_framework.serialization.trajectory import TrajectoryRecorder
 from kat_framework.util import logger
-from kat_api import IDriver, IGame, IAgent, StateType, IMetricTracer, IConfigurationHandler
+from kat_framework.util.timing import PhaseTimer, MAKE_ACTION_PHASE, PROCESS_TICKS_PHASE, PREPROCESS_PHASE
+from kat_framework.util.timing import PREDICT_PHASE, STORE_TRANSITION_PHASE, TRAIN_STEP_PHASE
+from kat_api import IDriver, IGame, IAgent, StateType, IMetricTracer, IConfigurationHandler, ITensorDescriptor
 from kat_typing import TrainLoss, MetricData
 from abc import abstractmethod
 from overrides import overrides
-from typing import Optional
-from time import sleep
+from typing import Any, Callable, Optional, Collection
+from time import sleep, perf_counter
 from logging import Logger
 import asyncio
+import hashlib
+import json
 import threading
 
+# mean and 99th percentile metrics of the phases
+PHASE_METRICS = {
+    MAKE_ACTION_PHASE: (KatMetrics.TENSORFLOW_PHASE_MAKE_ACTION_MEAN, KatMetrics.TENSORFLOW_PHASE_MAKE_ACTION_P99),
+    PROCESS_TICKS_PHASE: (KatMetrics.TENSORFLOW_PHASE_PROCESS_TICKS_MEAN,
+                          KatMetrics.TENSORFLOW_PHASE_PROCESS_TICKS_P99),
+    PREPROCESS_PHASE: (KatMetrics.TENSORFLOW_PHASE_PREPROCESS_MEAN, KatMetrics.TENSORFLOW_PHASE_PREPROCESS_P99),
+    PREDICT_PHASE: (KatMetrics.TENSORFLOW_PHASE_PREDICT_MEAN, KatMetrics.TENSORFLOW_PHASE_PREDICT_P99),
+    STORE_TRANSITION_PHASE: (KatMetrics.TENSORFLOW_PHASE_STORE_TRANSITION_MEAN,
+                             KatMetrics.TENSORFLOW_PHASE_STORE_TRANSITION_P99),
+    TRAIN_STEP_PHASE: (KatMetrics.TENSORFLOW_PHASE_TRAIN_STEP_MEAN, KatMetrics.TENSORFLOW_PHASE_TRAIN_STEP_P99),
+}
+# execution settings, which are not affecting the resumed state (see: `EpisodeDriver._build_run_state_fingerprint`)
+NOT_FINGERPRINTED_PROPERTIES = (
+    AgentConfigurationProperty.MEMORY_PREFILL_DIRECTORY,
+    AgentConfigurationProperty.MEMORY_PREFILL_CHUNK_SIZE,
+    NetworkConfigurationProperty.STEPS_PER_EXECUTION,
+    NetworkConfigurationProperty.JIT_COMPILE_ENABLED,
+    NetworkConfigurationProperty.RESTORE_MODEL_FROM,
+    NetworkConfigurationProperty.RESTORE_CHECKPOINT_FROM,
+    NetworkConfigurationProperty.CHECKPOINT_FREQUENCY,
+    NetworkConfigurationProperty.MAX_IN_FLIGHT_STEPS,
+)
+
 
 class EpisodeDriver(IDriver):
     """
@@ -49,6 +84,26 @@ class EpisodeDriver(IDriver):
     _sleep_time: int = None
     _action_frequency: int = None
     _training_mode: int = None
+    _inference_server_enabled: bool = False
+    _run_state_frequency: int = 0
+    _run_state_max_to_keep: int = 0
+    _run_state_resume_enabled: bool = False
+    _run_state_directory: str = None
+    _run_state_serializer: RunStateSerializer = None
+    _run_state_fingerprint: str = None
+    _last_run_state_episode: int = 0
+    _start_episode: int = 0
+    _start_step: int = 0
+    _phase_timer: PhaseTimer = None
+    _trajectory_recording_enabled: bool = False
+    _trajectory_shard_size: int = 0
+    _trajectory_queue_size: int = 0
+    _trajectory_recorder: TrajectoryRecorder = None
+    _game_watchdog_enabled: bool = False
+    _game_call_deadline: float = 0.0
+    _game_step_latency_slo: float = 0.0
+    _game_watchdog: GameWatchdog = None
+    _fast_warm_up_enabled: bool = False
 
     # public member functions
 
@@ -64,6 +119,10 @@ class EpisodeDriver(IDriver):
         self._agent = KatherineApplication.get_application_factory().build_agent()
         self._metrics = KatherineApplication.get_application_factory().build_metrics_tracer()
         self._load_configuration()
+        if self._game_watchdog_enabled:
+            self._game_watchdog = self._build_game_watchdog()
+        if self._game_watchdog is not None:
+            self._game = self._game_watchdog
 
     @overrides
     def run(self) -> None:
@@ -95,60 +154,222 @@ class EpisodeDriver(IDriver):
         """
         Initializing main loop.
         """
+        self._initialize_components()
+        self._prepare_run()
+        self._metrics.start_profiler()
+
+    def _initialize_components(self) -> None:
+        """
+        Initializes the game, the agent and the metrics tracer. Derived classes can override it,
+        if they are hosting the games differently.
+        """
         if not self._game.is_initialized():
             self._game.init()
         if not self._agent.is_initialized():
-            self._agent.init(self._game.get_observation_space_desc(),
-                             self._game.get_action_space_desc())
+            self._agent.init(self._get_observation_space_desc(), self._get_action_space_desc())
         if not self._metrics.is_initialized():
             self._metrics.init(self._agent.get_distribution_strategy())
-        self._metrics.start_profiler()
+
+    def _prepare_run(self) -> None:
+        """
+        Sets up the run with the initialized components: resumes the latest run state, plays the
+        fast warm-up and starts the trajectory recorder (if they are enabled).
+        """
+        self._restore_run_state()
+        if self._fast_warm_up_enabled and self._training_mode and self._start_episode == 0:
+            # the loop continues after the observing episodes
+            self._start_episode, self._start_step = self._agent.warm_up(self._game, self._max_episodes,
+                                                                        self._max_steps, self._action_frequency)
+        if self._trajectory_recording_enabled:
+            self._trajectory_recorder = TrajectoryRecorder(self._get_observation_space_desc(),
+                                                           self._get_action_space_desc(),
+                                                           self._trajectory_shard_size,
+                                                           self._trajectory_queue_size)
+            self._trajectory_recorder.start()
+
+    def _get_observation_space_desc(self) -> Collection[ITensorDescriptor]:
+        """
+        Observation space descriptors of the driven games.
+        """
+        return self._game.get_observation_space_desc()
+
+    def _get_action_space_desc(self) -> ITensorDescriptor:
+        """
+        Action space descriptor of the driven games.
+        """
+        return self._game.get_action_space_desc()
+
+    def _build_game_watchdog(self) -> Optional[GameWatchdog]:
+        """
+        Builds the watchdog, which hosts the game out-of-process. Derived classes can override it,
+        if they are not supporting the watched game.
+
+        :returns
+            the watchdog, or None if it is not supported by the driver
+        """
+        return GameWatchdog(self._game_call_deadline,
+                            self._game_step_latency_slo,
+                            self._config_handler.get_config_property(
+                                DriverConfigurationProperty.ACTOR_RING_BUFFER_SIZE,
+                                DriverConfigurationProperty.ACTOR_RING_BUFFER_SIZE.prop_type),
+                            self._config_handler.get_config_property(
+                                DriverConfigurationProperty.ACTOR_MAX_RESTARTS,
+                                DriverConfigurationProperty.ACTOR_MAX_RESTARTS.prop_type))
+
+    def _is_episode_truncated(self) -> bool:
+        """
+        Returns True if the current episode was interrupted by a game restart (see: `GameWatchdog`).
+        """
+        return self._game_watchdog is not None and self._game_watchdog.is_episode_truncated()
+
+    def _release_observations(self,
+                              state: KatState,
+                              next_state: Optional[KatState] = None,
+                              game: Optional[IGame] = None) -> None:
+        """
+        Gives back the consumed observations of a stored state to the game (see: `IGame.release_observation`),
+        except the one which is carried over to the next state. The trajectory recorder copies the
+        observations, when they are recorded.
+
+        :param state:
+            the stored state
+        :param next_state:
+            the following state of the episode (if any)
+        :param game:
+            the game, which has emitted the observations (default: the driver's game)
+        """
+        if game is None:
+            game = self._game
+        carried_observation = None if next_state is None else next_state.get_observation()
+        for observation in (state.get_observation(), state.get_transitioned_observation()):
+            if observation is not None and observation is not carried_observation:
+                game.release_observation(observation)
+
+    def _timed(self, phase: str, function: Callable, *args) -> Any:
+        """
+        Calls a hot path function, and records its duration if the phase timing is enabled.
+
+        :param phase:
+            name of the phase
+        :param function:
+            the called function
+        :param args:
+            arguments of the function
+        :returns
+            the function's result
+        """
+        timer = self._phase_timer
+        if timer is None:
+            return function(*args)
+        start = perf_counter()
+        result = function(*args)
+        timer.record(phase, perf_counter() - start)
+        return result
 
     def _loop(self) -> None:
         """
         Main loop.
         """
-        global_steps = 0
-        for i in range(self._max_episodes):
+        global_steps = self._start_step
+        recorder = self._trajectory_recorder
+        state_pool = KatStatePool()
+        for i in range(self._start_episode, self._max_episodes):
             is_finished = False
             step_counter = 0
-            current_state = KatState(i + 1, self._game.reset(), StateType.INITIAL_STATE)
+            current_state = state_pool.acquire(i + 1, self._game.reset(), StateType.INITIAL_STATE)
             while not is_finished:
                 action = self._agent.take_action(current_state)
                 current_state.set_transition(action)
-                next_observation, reward = self._game.make_action(action)
+                next_observation, reward = self._timed(MAKE_ACTION_PHASE, self._game.make_action, action)
+                if self._is_episode_truncated():
+                    # the simulator was restarted, the interrupted transition is dropped
+                    break
                 current_state.set_transitioned_observation(next_observation)
                 current_state.set_reward(reward)
                 if self._game.is_episode_finished() or self._max_steps <= step_counter:
                     current_state.state_type = StateType.END_STATE
-                    self._agent.store_transition(current_state)
                     is_finished = True
-                else:
-                    self._agent.store_transition(current_state)
+                self._timed(STORE_TRANSITION_PHASE, self._agent.store_transition, current_state)
+                if recorder is not None:
+                    recorder.record(current_state)
                 if self._action_frequency > 0:
-                    self._game.process_ticks(self._action_frequency)
-                    current_state = KatState(
+                    self._timed(PROCESS_TICKS_PHASE, self._game.process_ticks, self._action_frequency)
+                    # finished by the ticks (or truncated), the stored transition is kept, it is not terminal
+                    is_finished = is_finished or self._game.is_episode_finished() or self._is_episode_truncated()
+                    next_state = state_pool.acquire(
                         i + 1, self._game.get_current_observation(), StateType.ACTIVE_STATE)
                 else:
-                    current_state = KatState(
+                    next_state = state_pool.acquire(
                         i + 1, current_state.get_transitioned_observation(), StateType.ACTIVE_STATE)
+                # the transition is already stored and recorded
+                self._release_observations(current_state, next_state)
+                state_pool.release(current_state)
+                current_state = next_state
                 if self._sleep_time > 0:
                     sleep(self._sleep_time)
                 if self._training_mode:
-                    self._perform_train_step(i, global_steps)
+                    self._timed(TRAIN_STEP_PHASE, self._perform_train_step, i, global_steps)
                 step_counter += 1
                 global_steps += 1
+            self._release_observations(current_state)
+            state_pool.release(current_state)
             self._update_metrics(exploration_rate=self._agent.get_exploration_rate())
             self._update_metrics(score=self._game.get_total_score())
+            self._update_inference_metrics()
+            self._update_phase_metrics()
+            self._update_watchdog_metrics()
+            self._update_driver_metrics()
             self._metrics.flush_metrics(i + 1)
+            self._save_run_state(i + 1, global_steps)
 
     def _terminate(self) -> None:
         """
         Terminate loop.
         """
         self._metrics.stop_profiler()
+        if self._trajectory_recorder is not None:
+            self._trajectory_recorder.close()
+        if self._inference_server_enabled:
+            InferenceServer().stop()
+        if self._game_watchdog is not None:
+            self._game_watchdog.close()
         self._agent.persist_model()
 
+    def _restore_run_state(self) -> None:
+        """
+        Resumes the run from the latest run state of the run state directory, if there is one.
+        """
+        if self._run_state_serializer is None or not self._run_state_resume_enabled:
+            return
+        run_state_directory = self._run_state_serializer.get_latest()
+        if run_state_directory is None:
+            return
+        if self._run_state_serializer.get_fingerprint(run_state_directory) != self._run_state_fingerprint:
+            raise RuntimeError("The run state {} was saved with a different agent, network or memory configuration. "
+                               "Specify another run_state_directory, or disable run_state_resume_enabled."
+                               .format(run_state_directory))
+        self._start_episode, self._start_step = self._run_state_serializer.restore(self._agent, run_state_directory)
+        self._last_run_state_episode = self._start_episode
+        self._log.info("Resuming from episode %d (step %d).", self._start_episode, self._start_step)
+        if self._max_episodes <= self._start_episode:
+            self._log.warning("The resumed run is already finished (max_episodes: %d).", self._max_episodes)
+
+    def _save_run_state(self, finished_episodes: int, global_steps: int) -> None:
+        """
+        Saves the run state in every `run_state_frequency` episode.
+
+        :param finished_episodes:
+            number of the finished episodes
+        :param global_steps:
+            number of the performed steps
+        """
+        if self._run_state_frequency <= 0 or finished_episodes % self._run_state_frequency != 0:
+            return
+        if self._last_run_state_episode == finished_episodes:
+            return
+        self._last_run_state_episode = finished_episodes
+        self._run_state_serializer.save(self._agent, finished_episodes, global_steps, self._run_state_fingerprint)
+
     def _load_configuration(self) -> None:
         """
         Loads configuration.
@@ -168,6 +389,66 @@ class EpisodeDriver(IDriver):
         self._training_mode = self._config_handler.get_config_property(
             DriverConfigurationProperty.TRAINING_ENABLED,
             DriverConfigurationProperty.TRAINING_ENABLED.prop_type)
+        self._inference_server_enabled = self._config_handler.get_config_property(
+            InferenceConfigurationProperty.INFERENCE_SERVER_ENABLED,
+            InferenceConfigurationProperty.INFERENCE_SERVER_ENABLED.prop_type)
+        self._run_state_frequency = self._config_handler.get_config_property(
+            RunStateConfigurationProperty.RUN_STATE_FREQUENCY,
+            RunStateConfigurationProperty.RUN_STATE_FREQUENCY.prop_type)
+        self._run_state_max_to_keep = self._config_handler.get_config_property(
+            RunStateConfigurationProperty.RUN_STATE_MAX_TO_KEEP,
+            RunStateConfigurationProperty.RUN_STATE_MAX_TO_KEEP.prop_type)
+        self._run_state_resume_enabled = self._config_handler.get_config_property(
+            RunStateConfigurationProperty.RUN_STATE_RESUME_ENABLED,
+            RunStateConfigurationProperty.RUN_STATE_RESUME_ENABLED.prop_type)
+        self._run_state_directory = self._config_handler.get_config_property(
+            RunStateConfigurationProperty.RUN_STATE_DIRECTORY,
+            RunStateConfigurationProperty.RUN_STATE_DIRECTORY.prop_type)
+        self._trajectory_recording_enabled = self._config_handler.get_config_property(
+            TrajectoryConfigurationProperty.TRAJECTORY_RECORDING_ENABLED,
+            TrajectoryConfigurationProperty.TRAJECTORY_RECORDING_ENABLED.prop_type)
+        self._trajectory_shard_size = self._config_handler.get_config_property(
+            TrajectoryConfigurationProperty.TRAJECTORY_SHARD_SIZE,
+            TrajectoryConfigurationProperty.TRAJECTORY_SHARD_SIZE.prop_type)
+        self._trajectory_queue_size = self._config_handler.get_config_property(
+            TrajectoryConfigurationProperty.TRAJECTORY_QUEUE_SIZE,
+            TrajectoryConfigurationProperty.TRAJECTORY_QUEUE_SIZE.prop_type)
+        self._fast_warm_up_enabled = self._config_handler.get_config_property(
+            DriverConfigurationProperty.FAST_WARM_UP_ENABLED,
+            DriverConfigurationProperty.FAST_WARM_UP_ENABLED.prop_type)
+        self._game_watchdog_enabled = self._config_handler.get_config_property(
+            DriverConfigurationProperty.GAME_WATCHDOG_ENABLED,
+            DriverConfigurationProperty.GAME_WATCHDOG_ENABLED.prop_type)
+        self._game_call_deadline = self._config_handler.get_config_property(
+            DriverConfigurationProperty.GAME_CALL_DEADLINE,
+            DriverConfigurationProperty.GAME_CALL_DEADLINE.prop_type)
+        self._game_step_latency_slo = self._config_handler.get_config_property(
+            DriverConfigurationProperty.GAME_STEP_LATENCY_SLO,
+            DriverConfigurationProperty.GAME_STEP_LATENCY_SLO.prop_type)
+        if self._config_handler.get_config_property(
+                KatConfigurationProperty.PHASE_TIMING_ENABLED,
+                KatConfigurationProperty.PHASE_TIMING_ENABLED.prop_type):
+            self._phase_timer = PhaseTimer()
+        if self._run_state_frequency > 0 or self._run_state_resume_enabled:
+            self._run_state_serializer = RunStateSerializer(self._run_state_max_to_keep, self._run_state_directory)
+            self._run_state_fingerprint = self._build_run_state_fingerprint()
+
+    def _build_run_state_fingerprint(self) -> str:
+        """
+        Fingerprint of the configuration, which is restored by a run state: the game, agent, network and
+        memory classes, and the agent (including its memory) and network properties, except the execution
+        settings.
+
+        :returns
+            hex digest of the configured values
+        """
+        properties = [KatConfigurationProperty.GAME_CLASS, KatConfigurationProperty.AGENT_CLASS,
+                      KatConfigurationProperty.NETWORK_CLASS, KatConfigurationProperty.MEMORY_CLASS,
+                      *AgentConfigurationProperty, *NetworkConfigurationProperty]
+        settings = {"{}.{}".format(type(prop).__name__, prop.name):
+                    self._config_handler.get_config_property(prop, prop.prop_type)
+                    for prop in properties if prop not in NOT_FINGERPRINTED_PROPERTIES}
+        return hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode("utf-8")).hexdigest()
 
     def _update_metrics(self,
                         loss: Optional[TrainLoss] = None,
@@ -191,6 +472,49 @@ class EpisodeDriver(IDriver):
         if score is not None:
             self._metrics.update_metric(KatMetrics.TENSORFLOW_AGENT_TOTAL_SCORE, score)
 
+    def _update_inference_metrics(self) -> None:
+        """
+        Helper function for pushing the inference server's queue depth and batch size
+        histograms, collected since the last call.
+        """
+        if not self._inference_server_enabled:
+            return
+        queue_depths, batch_sizes = InferenceServer().pop_statistics()
+        if len(batch_sizes) > 0:
+            self._metrics.update_metric(KatMetrics.TENSORFLOW_INFERENCE_QUEUE_DEPTH, queue_depths)
+            self._metrics.update_metric(KatMetrics.TENSORFLOW_INFERENCE_BATCH_SIZE, batch_sizes)
+
+    def _update_phase_metrics(self) -> None:
+        """
+        Helper function for pushing the mean and the 99th percentile durations of the hot
+        path phases, collected since the last call.
+        """
+        if self._phase_timer is None:
+            return
+        for phase, (mean, p99) in self._phase_timer.pop_statistics().items():
+            metrics = PHASE_METRICS.get(phase)
+            if metrics is not None:
+                self._metrics.update_metric(metrics[0], mean)
+                self._metrics.update_metric(metrics[1], p99)
+
+    def _update_watchdog_metrics(self) -> None:
+        """
+        Helper function for pushing the number of the game SLO violations and restarts, collected
+        since the last call.
+        """
+        if self._game_watchdog is None:
+            return
+        slo_violations, restarts = self._game_watchdog.pop_statistics()
+        self._metrics.update_metric(KatMetrics.TENSORFLOW_GAME_SLO_VIOLATIONS, slo_violations)
+        self._metrics.update_metric(KatMetrics.TENSORFLOW_GAME_RESTARTS, restarts)
+
+    def _update_driver_metrics(self) -> None:
+        """
+        Helper function for pushing the driver specific metrics at the end of the episodes,
+        derived classes can override it.
+        """
+        pass
+
 
 class SyncEpisodeDriver(EpisodeDriver, IDriver):
     """
@@ -223,12 +547,18 @@ class AsyncEpisodeDriver(EpisodeDriver, IDriver):
     Asynchronous train step driver implementation.
 
     After the first `perform_train_step` call, it creates a new working thread
-    and training the network independently from the driver's main loop.
+    and training the network independently from the driver's main loop. The pace of
+    the training is controlled by a `ReplayRatioScheduler`.
     """
 
     _train_loop: asyncio.AbstractEventLoop = None
     _train_thread: threading.Thread = None
     _train_started: bool = None
+    _scheduler: ReplayRatioScheduler = None
+    _replay_ratio: float = 0.0
+    _replay_ratio_max_lag: int = 0
+    _max_observe_episodes: int = 0
+    _train_lock: threading.Lock = None
 
     def __init__(self):
         """
@@ -243,7 +573,7 @@ class AsyncEpisodeDriver(EpisodeDriver, IDriver):
         Performs a train step in asynchronous mode.
 
         Starting the worker thread if it haven't started yet, and it calls the agent's
-        `tick` method.
+        `tick` method. It blocks, while the learner is lagging behind the target replay ratio.
 
         :param current_episode:
             current iteration
@@ -254,6 +584,7 @@ class AsyncEpisodeDriver(EpisodeDriver, IDriver):
             self._train_started = True
             self._train_thread.start()
         self._agent.tick(current_episode, current_step)
+        self._scheduler.on_env_step(current_episode)
 
     @overrides
     def _terminate(self) -> None:
@@ -263,13 +594,57 @@ class AsyncEpisodeDriver(EpisodeDriver, IDriver):
         """
         super(AsyncEpisodeDriver, self)._terminate()
         self._train_started = False
-        self._train_thread.join()
+        if self._scheduler is not None:
+            self._scheduler.stop()
+        if self._train_thread is not None and self._train_thread.is_alive():
+            self._train_thread.join()
+
+    @overrides
+    def _load_configuration(self) -> None:
+        """
+        Loads configuration.
+        """
+        super(AsyncEpisodeDriver, self)._load_configuration()
+        self._replay_ratio = self._config_handler.get_config_property(
+            DriverConfigurationProperty.REPLAY_RATIO,
+            DriverConfigurationProperty.REPLAY_RATIO.prop_type)
+        self._replay_ratio_max_lag = self._config_handler.get_config_property(
+            DriverConfigurationProperty.REPLAY_RATIO_MAX_LAG,
+            DriverConfigurationProperty.REPLAY_RATIO_MAX_LAG.prop_type)
+        self._max_observe_episodes = self._config_handler.get_config_property(
+            AgentConfigurationProperty.MAX_OBSERVE_EPISODES,
+            AgentConfigurationProperty.MAX_OBSERVE_EPISODES.prop_type)
+
+    @overrides
+    def _save_run_state(self, finished_episodes: int, global_steps: int) -> None:
+        """
+        The train steps are paused while the run state is saved, so the networks and
+        the optimizers are saved in a consistent state.
+        """
+        with self._train_lock:
+            super(AsyncEpisodeDriver, self)._save_run_state(finished_episodes, global_steps)
+
+    @overrides
+    def _update_driver_metrics(self) -> None:
+        """
+        Pushes the achieved replay ratio and the wait times of the episode.
+        """
+        if self._scheduler is None:
+            return
+        actor_wait_time, learner_wait_time = self._scheduler.pop_wait_times()
+        self._metrics.update_metric(KatMetrics.TENSORFLOW_REPLAY_RATIO, self._scheduler.get_achieved_ratio())
+        self._metrics.update_metric(KatMetrics.TENSORFLOW_ACTOR_WAIT_TIME, actor_wait_time)
+        self._metrics.update_metric(KatMetrics.TENSORFLOW_LEARNER_WAIT_TIME, learner_wait_time)
 
     def _init_train_loop(self):
         """
         Initializing the working thread.
         """
+        self._train_lock = threading.Lock()
         if self._training_mode:
+            self._scheduler = ReplayRatioScheduler(self._replay_ratio,
+                                                   self._replay_ratio_max_lag,
+                                                   self._max_observe_episodes)
             self._train_thread = threading.Thread(name="training", target=self._train_async)
 
     def _train_async(self):
@@ -277,7 +652,11 @@ class AsyncEpisodeDriver(EpisodeDriver, IDriver):
         Worker thread implementation.
         """
         while self._train_started:
-            loss = self._agent.train()
+            if not self._scheduler.acquire_train_step():
+                break
+            with self._train_lock:
+                loss = self._agent.train()
+            self._scheduler.release_train_step()
             if isinstance(loss, list):
                 loss = loss.pop(0)
             self._update_metrics(loss=loss)
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework.framework import KatherineApplication
+from kat_framework.monitor.properties import KatMetrics
+from kat_framework.drivers.state import KatState
+from kat_framework.agents.greedy import GreedyAgent
+from kat_framework.config.config_props import EvaluationConfigurationProperty, KatConfigurationProperty
+from kat_framework.config.config_props import DriverConfigurationProperty, NetworkConfigurationProperty
+from kat_framework.util import logger
+from kat_api import IDriver, IGame, IMetricTracer, IConfigurationHandler, StateType
+from concurrent.futures import ProcessPoolExecutor
+from overrides import overrides
+from typing import Optional, Tuple, List
+from logging import Logger
+import multiprocessing
+import numpy as np
+import time
+
+# worker process scoped game and agent (see: _init_evaluator)
+_game: Optional[IGame] = None
+_agent: Optional[GreedyAgent] = None
+_restored_paths: Tuple[Optional[str], Optional[str]] = (None, None)
+
+
+class EvaluationResult:
+    """
+    Aggregated statistics of an evaluation.
+    """
+
+    # public member functions
+
+    def __init__(self, scores: List[float], episode_lengths: List[int], elapsed_time: float):
+        """
+        Default constructor.
+
+        :param scores:
+            total scores of the episodes
+        :param episode_lengths:
+            number of steps of the episodes
+        :param elapsed_time:
+            wall time of the evaluation (sec)
+        """
+        self.scores = np.asarray(scores, dtype=np.float32)
+        self.episode_lengths = np.asarray(episode_lengths, dtype=np.int64)
+        self.elapsed_time = elapsed_time
+        self.number_of_episodes = len(self.scores)
+        self.total_steps = int(self.episode_lengths.sum())
+        self.score_mean = float(self.scores.mean())
+        self.score_std = float(self.scores.std())
+        self.score_min = float(self.scores.min())
+        self.score_max = float(self.scores.max())
+        self.score_median = float(np.median(self.scores))
+        self.steps_per_sec = self.total_steps / max(elapsed_time, 1e-9)
+
+    def __str__(self):
+        return "episodes: {}, score mean: {:.3f}, std: {:.3f}, min: {:.3f}, median: {:.3f}, max: {:.3f}, " \
+               "steps: {}, steps/sec: {:.1f}".format(self.number_of_episodes, self.score_mean, self.score_std,
+                                                    self.score_min, self.score_median, self.score_max,
+                                                    self.total_steps, self.steps_per_sec)
+
+
+class EvaluationDriver(IDriver):
+    """
+    Evaluation only driver implementation.
+
+    Plays greedy episodes with a restored model (or checkpoint) across a process pool, without replay
+    memory and training. The pool is kept alive between the `evaluate` calls, so evaluating after every
+    checkpoint doesn't pay the process and the model building costs again.
+    """
+
+    # protected members
+
+    _log: Logger = None
+    _config_handler: IConfigurationHandler = None
+    _metrics: IMetricTracer = None
+    _number_of_episodes: int = 0
+    _number_of_workers: int = 0
+    _max_steps: int = 0
+    _action_frequency: int = 0
+    _restore_model_path: str = None
+    _restore_checkpoint_path: str = None
+    _executor: ProcessPoolExecutor = None
+    _evaluation_counter: int = 0
+
+    # public member functions
+
+    def __init__(self):
+        """
+        Default constructor.
+        """
+        self._log = logger.get_logger(self.__class__.__name__)
+        self._config_handler = KatherineApplication.get_application_config()
+        if not self._config_handler:
+            raise ValueError("No config specified.")
+        self._metrics = KatherineApplication.get_application_factory().build_metrics_tracer()
+        self._load_configuration()
+
+    @overrides
+    def run(self) -> None:
+        """
+        Evaluates the configured model or checkpoint (`restore_model_from`, `restore_checkpoint_from`).
+
+        # see : IDriver.run()
+        """
+        if self._restore_model_path is None and self._restore_checkpoint_path is None:
+            raise ValueError("No model or checkpoint specified for the evaluation.")
+        try:
+            self.evaluate(self._restore_model_path, self._restore_checkpoint_path)
+        finally:
+            self.close()
+
+    def evaluate(self, model_path: Optional[str] = None, checkpoint_path: Optional[str] = None) -> EvaluationResult:
+        """
+        Plays the evaluation episodes with the specified model, and reports the statistics.
+
+        :param model_path:
+            persisted model to evaluate (optional)
+        :param checkpoint_path:
+            checkpoint to evaluate, restored after the model (optional)
+        :returns
+            aggregated statistics
+        """
+        if self._executor is None:
+            self._start_workers()
+        start = time.perf_counter()
+        futures = [self._executor.submit(_play_episode, i + 1, model_path, checkpoint_path,
+                                         self._max_steps, self._action_frequency)
+                   for i in range(self._number_of_episodes)]
+        episodes = [future.result() for future in futures]
+        result = EvaluationResult([score for score, _ in episodes],
+                                  [steps for _, steps in episodes],
+                                  time.perf_counter() - start)
+        self._evaluation_counter += 1
+        self._update_metrics(result)
+        self._log.info("Evaluation %d (%s) - %s", self._evaluation_counter,
+                       checkpoint_path or model_path, str(result))
+        return result
+
+    def close(self) -> None:
+        """
+        Stops the worker processes.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    # protected member functions
+
+    def _start_workers(self) -> None:
+        """
+        Starts the worker processes, each of them builds its own game and agent.
+        """
+        app_args = KatherineApplication.get_application_args()
+        if app_args is None:
+            raise RuntimeError("Application is not initialized.")
+        if not self._metrics.is_initialized():
+            self._metrics.init()
+        self._executor = ProcessPoolExecutor(max_workers=min(self._number_of_workers, self._number_of_episodes),
+                                             mp_context=multiprocessing.get_context("spawn"),
+                                             initializer=_init_evaluator,
+                                             initargs=(app_args,))
+
+    def _load_configuration(self) -> None:
+        """
+        Loads configuration.
+        """
+        self._number_of_episodes = self._config_handler.get_config_property(
+            EvaluationConfigurationProperty.EVALUATION_EPISODES,
+            EvaluationConfigurationProperty.EVALUATION_EPISODES.prop_type)
+        self._number_of_workers = self._config_handler.get_config_property(
+            EvaluationConfigurationProperty.EVALUATION_WORKERS,
+            EvaluationConfigurationProperty.EVALUATION_WORKERS.prop_type)
+        self._max_steps = self._config_handler.get_config_property(
+            KatConfigurationProperty.MAX_STEPS,
+            KatConfigurationProperty.MAX_STEPS.prop_type)
+        self._action_frequency = self._config_handler.get_config_property(
+            DriverConfigurationProperty.ACTION_FREQUENCY,
+            DriverConfigurationProperty.ACTION_FREQUENCY.prop_type)
+        self._restore_model_path = self._config_handler.get_config_property(
+            NetworkConfigurationProperty.RESTORE_MODEL_FROM,
+            NetworkConfigurationProperty.RESTORE_MODEL_FROM.prop_type)
+        self._restore_checkpoint_path = self._config_handler.get_config_property(
+            NetworkConfigurationProperty.RESTORE_CHECKPOINT_FROM,
+            NetworkConfigurationProperty.RESTORE_CHECKPOINT_FROM.prop_type)
+        if self._number_of_episodes < 1 or self._number_of_workers < 1:
+            raise ValueError("At least one evaluation episode and worker must be specified.")
+
+    def _update_metrics(self, result: EvaluationResult) -> None:
+        """
+        Helper function for pushing and flushing the evaluation statistics.
+        """
+        self._metrics.update_metric(KatMetrics.TENSORFLOW_EVALUATION_SCORE_MEAN, result.score_mean)
+        self._metrics.update_metric(KatMetrics.TENSORFLOW_EVALUATION_SCORE_STD, result.score_std)
+        self._metrics.update_metric(KatMetrics.TENSORFLOW_EVALUATION_SCORE_MIN, result.score_min)
+        self._metrics.update_metric(KatMetrics.TENSORFLOW_EVALUATION_SCORE_MAX, result.score_max)
+        self._metrics.update_metric(KatMetrics.TENSORFLOW_EVALUATION_STEPS_PER_SEC, result.steps_per_sec)
+        self._metrics.flush_metrics(self._evaluation_counter)
+
+
+def _init_evaluator(app_args: Tuple[str, str, str]) -> None:
+    """
+    Worker process initializer, builds the game and the greedy agent.
+
+    :param app_args:
+        `KatherineApplication.init` arguments
+    """
+    global _game, _agent
+    KatherineApplication.init(*app_args)
+    _game = KatherineApplication.get_application_factory().build_game()
+    _game.init()
+    _agent = GreedyAgent()
+    _agent.init(_game.get_observation_space_desc(), _game.get_action_space_desc())
+
+
+def _play_episode(episode_id: int,
+                  model_path: Optional[str],
+                  checkpoint_path: Optional[str],
+                  max_steps: int,
+                  action_frequency: int) -> Tuple[float, int]:
+    """
+    Plays an evaluation episode in a worker process. The model is restored only if it
+    differs from the previous one.
+
+    :returns
+        total score and the number of steps of the episode
+    """
+    global _restored_paths
+    if _restored_paths != (model_path, checkpoint_path):
+        if model_path is not None:
+            _agent.restore_model(model_path)
+        if checkpoint_path is not None:
+            _agent.restore_checkpoint(checkpoint_path)
+        _restored_paths = (model_path, checkpoint_path)
+    step_counter = 0
+    current_state = KatState(episode_id, _game.reset(), StateType.INITIAL_STATE)
+    while True:
+        action = _agent.take_action(current_state)
+        _game.make_action(action)
+        step_counter += 1
+        if _game.is_episode_finished() or max_steps <= step_counter:
+            break
+        if action_frequency > 0:
+            _game.process_ticks(action_frequency)
+        current_state = KatState(episode_id, _game.get_current_observation(), StateType.ACTIVE_STATE)
+    return _game.get_total_score(), step_counter
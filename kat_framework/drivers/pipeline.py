@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework.framework import KatherineApplication
+from kat_framework.monitor.properties import KatMetrics
+from kat_framework.drivers.state import KatState, KatStatePool
+from kat_framework.drivers.episode import EpisodeDriver
+from kat_framework.drivers.watchdog import GameWatchdog
+from kat_framework.config.config_props import DriverConfigurationProperty
+from kat_api import IDriver, IGame, IObservation, StateType
+from kat_typing import Action
+from concurrent.futures import ThreadPoolExecutor
+from overrides import overrides
+from collections import deque
+from typing import Dict, Optional, Tuple
+import asyncio
+import time
+
+ACTING_STAGE = "acting"
+SIMULATION_STAGE = "simulation"
+TRAINING_STAGE = "training"
+
+
+class PipelinedEpisodeDriver(EpisodeDriver, IDriver):
+    """
+    Pipelined (asyncio based) episodic driver implementation.
+
+    The stages are coroutines connected by bounded queues:
+        * simulation: `make_action` and `process_ticks` (simulation executor)
+        * acting: `store_transition` and `take_action` (agent executor)
+        * training: `tick` and `train` (training executor)
+        * reporting: metrics update and flush
+    The transitions are stored before the next action is taken, so the agent's state stays consistent,
+    while the training and the reporting are overlapping the simulation. The episode resets are prefetched
+    with a spare game instance. The busy time ratio of the stages is reported at the end of the episodes.
+    """
+
+    # protected members
+
+    _queue_size: int = 0
+    _reset_prefetch_enabled: bool = True
+    _spare_game: IGame = None
+    _simulation_executor: ThreadPoolExecutor = None
+    _agent_executor: ThreadPoolExecutor = None
+    _training_executor: ThreadPoolExecutor = None
+    _reset_executor: ThreadPoolExecutor = None
+    _pending_resets: deque = None
+    _busy_times: Dict[str, float] = None
+    _busy_since: float = 0.0
+
+    # public member functions
+
+    def __init__(self):
+        """
+        Default constructor.
+        """
+        super(PipelinedEpisodeDriver, self).__init__()
+        if self._reset_prefetch_enabled:
+            self._spare_game = KatherineApplication.get_application_factory().build_game()
+        self._busy_times = {ACTING_STAGE: 0.0, SIMULATION_STAGE: 0.0, TRAINING_STAGE: 0.0}
+
+    # protected member functions
+
+    @overrides
+    def _build_game_watchdog(self) -> Optional[GameWatchdog]:
+        """
+        The pipelined driver is not watching its games.
+
+        # see : EpisodeDriver._build_game_watchdog()
+        """
+        self._log.warning("The game watchdog is not supported by the pipelined driver.")
+        return None
+
+    @overrides
+    def _perform_train_step(self, current_episode: int, current_step: int) -> None:
+        """
+        Performs a train step, it is called by the training stage.
+
+        :param current_episode:
+            current iteration
+        :param current_step:
+            current step in the episode
+        """
+        self._agent.tick(current_episode, current_step)
+        loss = self._agent.train()
+        if isinstance(loss, list):
+            loss = loss.pop(0)
+        self._update_metrics(loss=loss)
+
+    @overrides
+    def _initialize(self) -> None:
+        """
+        Initializing the spare game and the executors.
+        """
+        super(PipelinedEpisodeDriver, self)._initialize()
+        if self._spare_game is not None and not self._spare_game.is_initialized():
+            self._spare_game.init()
+        self._simulation_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=SIMULATION_STAGE)
+        self._agent_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=ACTING_STAGE)
+        self._training_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=TRAINING_STAGE)
+        self._reset_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reset")
+
+    @overrides
+    def _loop(self) -> None:
+        """
+        Main loop, runs the pipeline until all of the stages are finished.
+        """
+        asyncio.run(self._run_pipeline())
+
+    @overrides
+    def _terminate(self) -> None:
+        """
+        Shuts down the executors.
+        """
+        for executor in (self._simulation_executor, self._agent_executor,
+                         self._training_executor, self._reset_executor):
+            if executor is not None:
+                executor.shutdown(wait=True)
+        super(PipelinedEpisodeDriver, self)._terminate()
+
+    @overrides
+    def _load_configuration(self) -> None:
+        """
+        Loads configuration.
+        """
+        super(PipelinedEpisodeDriver, self)._load_configuration()
+        self._queue_size = self._config_handler.get_config_property(
+            DriverConfigurationProperty.PIPELINE_QUEUE_SIZE,
+            DriverConfigurationProperty.PIPELINE_QUEUE_SIZE.prop_type)
+        self._reset_prefetch_enabled = self._config_handler.get_config_property(
+            DriverConfigurationProperty.RESET_PREFETCH_ENABLED,
+            DriverConfigurationProperty.RESET_PREFETCH_ENABLED.prop_type)
+        if self._queue_size < 1:
+            raise ValueError("The pipeline queue size must be positive.")
+
+    @overrides
+    def _update_driver_metrics(self) -> None:
+        """
+        Pushes the stage utilizations since the last call.
+        """
+        now = time.perf_counter()
+        elapsed = max(now - self._busy_since, 1e-9)
+        self._busy_since = now
+        # a long call is accounted in the window where it has finished, so the ratio is capped
+        self._metrics.update_metric(KatMetrics.TENSORFLOW_PIPELINE_ACTING_UTILIZATION,
+                                    min(self._busy_times[ACTING_STAGE] / elapsed, 1.0))
+        self._metrics.update_metric(KatMetrics.TENSORFLOW_PIPELINE_SIMULATION_UTILIZATION,
+                                    min(self._busy_times[SIMULATION_STAGE] / elapsed, 1.0))
+        self._metrics.update_metric(KatMetrics.TENSORFLOW_PIPELINE_TRAINING_UTILIZATION,
+                                    min(self._busy_times[TRAINING_STAGE] / elapsed, 1.0))
+        for stage in self._busy_times:
+            self._busy_times[stage] = 0.0
+
+    async def _run_pipeline(self) -> None:
+        """
+        Builds the queues, and runs the stages.
+        """
+        act_queue = asyncio.Queue(maxsize=1)
+        action_queue = asyncio.Queue(maxsize=1)
+        train_queue = asyncio.Queue(maxsize=self._queue_size)
+        report_queue = asyncio.Queue(maxsize=self._queue_size)
+        self._pending_resets = deque()
+        self._prefetch_reset(self._game)
+        if self._spare_game is not None:
+            self._prefetch_reset(self._spare_game)
+        # the states are acquired and released by the coroutines, on the event loop's thread
+        state_pool = KatStatePool()
+        self._busy_since = time.perf_counter()
+        await asyncio.gather(
+            self._simulation_stage(act_queue, action_queue, report_queue, state_pool),
+            self._acting_stage(act_queue, action_queue, train_queue, state_pool),
+            self._training_stage(train_queue),
+            self._reporting_stage(report_queue))
+        # the resets after the last episodes are not played
+        while len(self._pending_resets) > 0:
+            game, observation = await self._next_reset()
+            game.release_observation(observation)
+
+    async def _simulation_stage(self,
+                                act_queue: asyncio.Queue,
+                                action_queue: asyncio.Queue,
+                                report_queue: asyncio.Queue,
+                                state_pool: KatStatePool) -> None:
+        """
+        Simulation stage, plays the episodes. It sends the completed transitions and the
+        next states to the acting stage, and waits for the actions.
+        """
+        loop = asyncio.get_running_loop()
+        for i in range(self._start_episode, self._max_episodes):
+            game, observation = await self._next_reset()
+            current_state = state_pool.acquire(i + 1, observation, StateType.INITIAL_STATE)
+            completed_state = None
+            step_counter = 0
+            while True:
+                await act_queue.put((game, completed_state, current_state))
+                action = await action_queue.get()
+                start = time.perf_counter()
+                is_finished, current_observation = await loop.run_in_executor(
+                    self._simulation_executor, self._simulate, game, current_state, action, step_counter)
+                self._busy_times[SIMULATION_STAGE] += time.perf_counter() - start
+                step_counter += 1
+                if self._sleep_time > 0:
+                    await asyncio.sleep(self._sleep_time)
+                if is_finished:
+                    score = game.get_total_score()
+                    self._prefetch_reset(game)
+                    await act_queue.put((game, current_state, None))
+                    await report_queue.put((i + 1, score))
+                    break
+                completed_state = current_state
+                current_state = state_pool.acquire(i + 1, current_observation, StateType.ACTIVE_STATE)
+        await act_queue.put(None)
+        await report_queue.put(None)
+
+    async def _acting_stage(self,
+                            act_queue: asyncio.Queue,
+                            action_queue: asyncio.Queue,
+                            train_queue: asyncio.Queue,
+                            state_pool: KatStatePool) -> None:
+        """
+        Acting stage, stores the completed transitions and takes the actions. Every stored
+        transition schedules a train step, and its state is given back to the pool. The run
+        state is saved at the end of the episodes.
+        """
+        loop = asyncio.get_running_loop()
+        global_steps = self._start_step
+        while True:
+            message = await act_queue.get()
+            if message is None:
+                break
+            game, completed_state, current_state = message
+            start = time.perf_counter()
+            action = await loop.run_in_executor(self._agent_executor, self._act, game, completed_state, current_state)
+            self._busy_times[ACTING_STAGE] += time.perf_counter() - start
+            if current_state is not None:
+                await action_queue.put(action)
+            if completed_state is not None and self._training_mode:
+                await train_queue.put((completed_state.get_state_id() - 1, global_steps))
+                global_steps += 1
+            if completed_state is not None and current_state is None:
+                # the training executor orders the save with the scheduled train steps
+                await loop.run_in_executor(self._training_executor, self._save_run_state,
+                                           completed_state.get_state_id(), global_steps)
+            if completed_state is not None:
+                state_pool.release(completed_state)
+        await train_queue.put(None)
+
+    async def _training_stage(self, train_queue: asyncio.Queue) -> None:
+        """
+        Training stage, it is overlapping the simulation. The bounded queue throttles
+        the acting stage, if the training is slower.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await train_queue.get()
+            if message is None:
+                break
+            current_episode, current_step = message
+            start = time.perf_counter()
+            await loop.run_in_executor(self._training_executor, self._perform_train_step,
+                                       current_episode, current_step)
+            self._busy_times[TRAINING_STAGE] += time.perf_counter() - start
+
+    async def _reporting_stage(self, report_queue: asyncio.Queue) -> None:
+        """
+        Reporting stage, updates and flushes the metrics of the finished episodes.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await report_queue.get()
+            if message is None:
+                break
+            episode, score = message
+            await loop.run_in_executor(None, self._report, episode, score)
+
+    def _simulate(self,
+                  game: IGame,
+                  current_state: KatState,
+                  action: Action,
+                  step_counter: int) -> Tuple[bool, Optional[IObservation]]:
+        """
+        Makes the action and processes the ticks (simulation executor).
+
+        :returns
+            episode finished flag and the current observation of the game
+        """
+        current_state.set_transition(action)
+        next_observation, reward = game.make_action(action)
+        current_state.set_transitioned_observation(next_observation)
+        current_state.set_reward(reward)
+        if game.is_episode_finished() or self._max_steps <= step_counter:
+            current_state.state_type = StateType.END_STATE
+            return True, None
+        if self._action_frequency > 0:
+            game.process_ticks(self._action_frequency)
+            return False, game.get_current_observation()
+        return False, next_observation
+
+    def _act(self,
+             game: IGame,
+             completed_state: Optional[KatState],
+             current_state: Optional[KatState]) -> Optional[Action]:
+        """
+        Stores the completed transition and gives back its observations to the game, then takes
+        the next action (agent executor).
+        """
+        if completed_state is not None:
+            self._agent.store_transition(completed_state)
+            if self._trajectory_recorder is not None:
+                self._trajectory_recorder.record(completed_state)
+            # the game's buffer pool is thread-safe, the game can be simulated meanwhile
+            self._release_observations(completed_state, current_state, game)
+        if current_state is not None:
+            return self._agent.take_action(current_state)
+        return None
+
+    def _report(self, episode: int, score: float) -> None:
+        """
+        Updates and flushes the metrics of a finished episode.
+        """
+        self._update_metrics(exploration_rate=self._agent.get_exploration_rate())
+        self._update_metrics(score=score)
+        self._update_inference_metrics()
+        self._update_phase_metrics()
+        self._update_driver_metrics()
+        self._metrics.flush_metrics(episode)
+
+    def _prefetch_reset(self, game: IGame) -> None:
+        """
+        Starts the reset of a game in the background.
+        """
+        loop = asyncio.get_running_loop()
+        self._pending_resets.append((game, loop.run_in_executor(self._reset_executor, game.reset)))
+
+    async def _next_reset(self) -> Tuple[IGame, IObservation]:
+        """
+        Waits for the oldest pending reset.
+
+        :returns
+            the game and its initial observation
+        """
+        game, reset_future = self._pending_resets.popleft()
+        return game, await reset_future
@@ -0,0 +1,593 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework.framework import KatherineApplication
+from kat_framework.util import logger
+from kat_api import IObservation, ITensorDescriptor
+from kat_typing import Action
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.connection import Connection
+from typing import Collection, Dict, List, Optional, Sequence, Tuple
+from overrides import overrides
+from logging import Logger
+from time import perf_counter
+import multiprocessing
+import numpy as np
+
+READY_COMMAND = "ready"
+ATTACH_COMMAND = "attach"
+RESET_COMMAND = "reset"
+STEP_COMMAND = "step"
+TICKS_COMMAND = "ticks"
+CLOSE_COMMAND = "close"
+# marks a missing observation (e.g. end of the episode) instead of a ring slot
+NO_OBSERVATION = -1
+# ring buffer field alignment in bytes
+FIELD_ALIGNMENT = 64
+# liveness check interval while waiting for a worker (sec)
+POLL_INTERVAL = 0.5
+# grace period of the workers at shutdown (sec)
+JOIN_TIMEOUT = 5.0
+
+log = logger.get_logger(__name__)
+
+
+class SharedObservation(IObservation):
+    """
+    Observation backed by the actor pool's shared memory ring buffers.
+
+    The fields are read-only views of a ring slot, and they are valid until the slot is overwritten,
+    it means the next `ring buffer size - 1` observations of the same environment.
+    """
+
+    # public member functions
+
+    def __init__(self, observation_id: int, fields: Dict[str, np.ndarray]):
+        """
+        Default constructor.
+
+        :param observation_id:
+            unique id of the observation
+        :param fields:
+            observation fields by name (see: observation space descriptors)
+        """
+        self._observation_id = observation_id
+        for name, tensor in fields.items():
+            setattr(self, name, tensor)
+
+    @overrides
+    def get_observation_id(self) -> int:
+        """
+        # see : IObservation.get_observation_id()
+        """
+        return self._observation_id
+
+    def __str__(self):
+        return "Observation number: " + str(self.get_observation_id())
+
+
+class ActorPool:
+    """
+    Pool of game worker processes.
+
+    Each worker process hosts one or more `IGame` instances (built by the application factory).
+    The actions are dispatched to the workers in batches (one message per worker), the observations
+    are coming back through per environment shared memory ring buffers, only the slot indices,
+    rewards and flags are sent through the pipes. The crashed workers are restarted, their running
+    episodes are reported as finished. If a call deadline is specified, the workers not replying in
+    time are considered as hung, they are killed and restarted like the crashed ones.
+    """
+
+    # protected members
+
+    _log: Logger = None
+    _app_args: Tuple[str, str, str] = None
+    _number_of_environments: int = 0
+    _number_of_workers: int = 0
+    _ring_buffer_size: int = 0
+    _max_restarts: int = 0
+    _call_deadline: float = 0.0
+    _context: multiprocessing.context.BaseContext = None
+    _processes: List[multiprocessing.process.BaseProcess] = None
+    _connections: List[Connection] = None
+    _restarts: List[int] = None
+    _memories: List[SharedMemory] = None
+    _ring_layout: List[Tuple[str, np.dtype, tuple, int]] = None
+    _ring_views: List[Dict[str, np.ndarray]] = None
+    _total_scores: List[float] = None
+    _observation_counter: int = 0
+    _observation_space_desc: Collection[ITensorDescriptor] = None
+    _action_space_desc: ITensorDescriptor = None
+    _running: bool = False
+
+    # public member functions
+
+    def __init__(self, number_of_environments: int, number_of_workers: int,
+                 ring_buffer_size: int, max_restarts: int, call_deadline: float = 0.0):
+        """
+        Default constructor.
+
+        :param number_of_environments:
+            total number of game instances
+        :param number_of_workers:
+            number of worker processes (zero or less means one per CPU core)
+        :param ring_buffer_size:
+            number of observation slots per environment
+        :param max_restarts:
+            maximum number of restarts per worker
+        :param call_deadline:
+            deadline (sec) of the reset, step and ticks calls (zero or less means no deadline)
+        """
+        if number_of_environments < 1:
+            raise ValueError("At least one environment must be specified.")
+        if ring_buffer_size < 4:
+            # the driver holds the initiator, the transitioned and the current observation at once
+            raise ValueError("At least 4 ring buffer slots are needed.")
+        if number_of_workers <= 0:
+            number_of_workers = multiprocessing.cpu_count()
+        self._log = logger.get_logger(self.__class__.__name__)
+        self._number_of_environments = number_of_environments
+        self._number_of_workers = min(number_of_workers, number_of_environments)
+        self._ring_buffer_size = ring_buffer_size
+        self._max_restarts = max_restarts
+        self._call_deadline = call_deadline
+        self._context = multiprocessing.get_context("spawn")
+
+    def start(self) -> None:
+        """
+        Starts the worker processes, and allocates the ring buffers based on the
+        observation space of the games.
+        """
+        if self._running:
+            return
+        self._app_args = KatherineApplication.get_application_args()
+        if self._app_args is None:
+            raise RuntimeError("Application is not initialized.")
+        self._processes = [None] * self._number_of_workers
+        self._connections = [None] * self._number_of_workers
+        self._restarts = [0] * self._number_of_workers
+        self._total_scores = [0.0] * self._number_of_environments
+        for worker_id in range(self._number_of_workers):
+            self._spawn_worker(worker_id)
+        for worker_id in range(self._number_of_workers):
+            if not self._attach_worker(worker_id):
+                self.close()
+                raise RuntimeError("Actor worker {} failed to start.".format(worker_id))
+        self._running = True
+
+    def is_running(self) -> bool:
+        """
+        Running flag.
+        """
+        return self._running
+
+    def get_observation_space_desc(self) -> Collection[ITensorDescriptor]:
+        """
+        Observation space of the games (available after `start`).
+        """
+        return self._observation_space_desc
+
+    def get_action_space_desc(self) -> ITensorDescriptor:
+        """
+        Action space of the games (available after `start`).
+        """
+        return self._action_space_desc
+
+    def reset(self, env_ids: Sequence[int]) -> List[Optional[IObservation]]:
+        """
+        Starts new episodes in the specified environments.
+
+        :param env_ids:
+            environment ids
+        :returns
+            initial observations, respectively
+        """
+        observations = {}
+        pending = self._group_by_worker(env_ids)
+        while len(pending) > 0:
+            for worker_id, worker_env_ids in pending.items():
+                self._send(worker_id, (RESET_COMMAND, [self._local_index(e) for e in worker_env_ids]))
+            crashed = {}
+            for worker_id, worker_env_ids in pending.items():
+                slots = self._receive(worker_id, self._call_deadline)
+                if slots is None:
+                    self._restart_worker(worker_id)
+                    crashed[worker_id] = worker_env_ids
+                    continue
+                for env_id, slot in zip(worker_env_ids, slots):
+                    self._total_scores[env_id] = 0.0
+                    observations[env_id] = self._read_observation(env_id, slot)
+            pending = crashed
+        return [observations[env_id] for env_id in env_ids]
+
+    def step(self,
+             env_ids: Sequence[int],
+             actions: Sequence[Action],
+             num_of_ticks: int) -> List[Tuple[Optional[IObservation], float, bool, Optional[IObservation]]]:
+        """
+        Makes the actions in the specified environments, then processes the ticks in the
+        unfinished ones.
+
+        :param env_ids:
+            environment ids
+        :param actions:
+            actions to make, respectively
+        :param num_of_ticks:
+            number of ticks to process after the actions
+        :returns
+            tuples of (transitioned observation, reward, episode finished flag, current observation)
+            respectively, the episodes of the crashed workers are reported as finished
+            without observations
+        """
+        grouped_env_ids = self._group_by_worker(env_ids)
+        grouped_actions = self._group_by_worker(env_ids, actions)
+        for worker_id, worker_env_ids in grouped_env_ids.items():
+            self._send(worker_id, (STEP_COMMAND,
+                                   [self._local_index(e) for e in worker_env_ids],
+                                   grouped_actions[worker_id],
+                                   num_of_ticks))
+        results = {}
+        for worker_id, worker_env_ids in grouped_env_ids.items():
+            worker_results = self._receive(worker_id, self._call_deadline)
+            if worker_results is None:
+                self._restart_worker(worker_id)
+                for env_id in worker_env_ids:
+                    results[env_id] = (None, 0.0, True, None)
+                continue
+            for env_id, (t_slot, reward, is_finished, total_score, c_slot) in zip(worker_env_ids, worker_results):
+                self._total_scores[env_id] = total_score
+                transitioned_observation = self._read_observation(env_id, t_slot)
+                current_observation = transitioned_observation if c_slot == t_slot \
+                    else self._read_observation(env_id, c_slot)
+                results[env_id] = (transitioned_observation, reward, is_finished, current_observation)
+        return [results[env_id] for env_id in env_ids]
+
+    def process_ticks(self, env_ids: Sequence[int], num_of_ticks: int) -> List[Tuple[bool, Optional[IObservation]]]:
+        """
+        Processes ticks in the specified environments (see: `IGame.process_ticks`).
+
+        :param env_ids:
+            environment ids
+        :param num_of_ticks:
+            number of ticks to process
+        :returns
+            tuples of (episode finished flag, current observation) respectively, the episodes of
+            the crashed workers are reported as finished without observation
+        """
+        grouped_env_ids = self._group_by_worker(env_ids)
+        for worker_id, worker_env_ids in grouped_env_ids.items():
+            self._send(worker_id, (TICKS_COMMAND, [self._local_index(e) for e in worker_env_ids], num_of_ticks))
+        results = {}
+        for worker_id, worker_env_ids in grouped_env_ids.items():
+            worker_results = self._receive(worker_id, self._call_deadline)
+            if worker_results is None:
+                self._restart_worker(worker_id)
+                for env_id in worker_env_ids:
+                    results[env_id] = (True, None)
+                continue
+            for env_id, (c_slot, is_finished, total_score) in zip(worker_env_ids, worker_results):
+                self._total_scores[env_id] = total_score
+                results[env_id] = (is_finished, self._read_observation(env_id, c_slot))
+        return [results[env_id] for env_id in env_ids]
+
+    def get_number_of_restarts(self) -> int:
+        """
+        Total number of the worker restarts (crashed or hung workers).
+        """
+        return sum(self._restarts or [])
+
+    def get_total_score(self, env_id: int) -> float:
+        """
+        Total score of the current (or last) episode of the specified environment.
+        """
+        return self._total_scores[env_id]
+
+    def close(self) -> None:
+        """
+        Stops the workers and releases the shared memory blocks.
+        """
+        for worker_id in range(self._number_of_workers if self._processes is not None else 0):
+            self._send(worker_id, (CLOSE_COMMAND,))
+        for worker_id in range(self._number_of_workers if self._processes is not None else 0):
+            self._stop_worker(worker_id)
+        self._ring_views = None
+        for memory in self._memories or []:
+            try:
+                memory.close()
+            except BufferError:
+                # observations are still referenced, the mapping is released by the gc
+                pass
+            memory.unlink()
+        self._memories = None
+        self._running = False
+
+    # protected member functions
+
+    def _spawn_worker(self, worker_id: int) -> None:
+        """
+        Starts a worker process.
+        """
+        parent_connection, child_connection = self._context.Pipe()
+        number_of_games = len(range(worker_id, self._number_of_environments, self._number_of_workers))
+        process = self._context.Process(target=_run_actor,
+                                        name="actor-{}".format(worker_id),
+                                        args=(self._app_args, number_of_games, child_connection),
+                                        daemon=True)
+        process.start()
+        child_connection.close()
+        self._processes[worker_id] = process
+        self._connections[worker_id] = parent_connection
+
+    def _attach_worker(self, worker_id: int) -> bool:
+        """
+        Waits for the worker's games, and attaches the worker to its ring buffers. The ring
+        buffers are allocated at the first call.
+
+        :returns
+            True if the worker is ready, False if it has crashed
+        """
+        message = self._receive(worker_id)
+        if message is None:
+            return False
+        _, observation_space_desc, action_space_desc = message
+        if self._memories is None:
+            self._observation_space_desc = observation_space_desc
+            self._action_space_desc = action_space_desc
+            self._ring_layout, ring_nbytes = _build_ring_layout(observation_space_desc, self._ring_buffer_size)
+            self._memories = [SharedMemory(create=True, size=ring_nbytes)
+                              for _ in range(self._number_of_environments)]
+            self._ring_views = [_map_ring(memory, self._ring_layout, read_only=True) for memory in self._memories]
+        env_ids = range(worker_id, self._number_of_environments, self._number_of_workers)
+        return self._send(worker_id, (ATTACH_COMMAND, [self._memories[e].name for e in env_ids], self._ring_layout))
+
+    def _restart_worker(self, worker_id: int) -> None:
+        """
+        Replaces a crashed worker with a new process.
+
+        :raises RuntimeError
+            if the worker has exceeded the maximum number of restarts
+        """
+        self._stop_worker(worker_id)
+        while True:
+            self._restarts[worker_id] += 1
+            if self._restarts[worker_id] > self._max_restarts:
+                raise RuntimeError("Actor worker {} exceeded the maximum number of restarts.".format(worker_id))
+            self._log.warning("Actor worker %d crashed or hung, restarting (%d/%d).",
+                              worker_id, self._restarts[worker_id], self._max_restarts)
+            self._spawn_worker(worker_id)
+            if self._attach_worker(worker_id):
+                return
+            self._stop_worker(worker_id)
+
+    def _stop_worker(self, worker_id: int) -> None:
+        """
+        Joins (or terminates) a worker process, and closes its pipe.
+        """
+        process = self._processes[worker_id]
+        if process is not None:
+            process.join(JOIN_TIMEOUT)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        if self._connections[worker_id] is not None:
+            self._connections[worker_id].close()
+        self._processes[worker_id] = None
+        self._connections[worker_id] = None
+
+    def _send(self, worker_id: int, message: tuple) -> bool:
+        """
+        Sends a message to a worker.
+
+        :returns
+            False if the worker is not reachable, else True
+        """
+        connection = self._connections[worker_id]
+        if connection is None:
+            return False
+        try:
+            connection.send(message)
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def _receive(self, worker_id: int, deadline: float = 0.0) -> Optional[object]:
+        """
+        Waits for the reply of a worker.
+
+        :param deadline:
+            maximum waiting time (sec), the worker is killed if it is exceeded (zero or less means no deadline)
+        :returns
+            the reply, or None if the worker has crashed (or it has been killed)
+        """
+        connection = self._connections[worker_id]
+        process = self._processes[worker_id]
+        if connection is None:
+            return None
+        poll_interval = POLL_INTERVAL if deadline <= 0.0 else min(POLL_INTERVAL, deadline)
+        start = perf_counter()
+        while True:
+            try:
+                if connection.poll(poll_interval):
+                    return connection.recv()
+            except (EOFError, OSError):
+                return None
+            if not process.is_alive():
+                return None
+            if 0.0 < deadline < perf_counter() - start:
+                self._log.warning("Actor worker %d missed the call deadline (%.3f sec), killing it.",
+                                  worker_id, deadline)
+                process.kill()
+                process.join()
+                return None
+
+    def _read_observation(self, env_id: int, slot: int) -> Optional[IObservation]:
+        """
+        Builds an observation from a ring slot of the specified environment.
+        """
+        if slot == NO_OBSERVATION:
+            return None
+        self._observation_counter += 1
+        return SharedObservation(self._observation_counter,
+                                 {name: view[slot] for name, view in self._ring_views[env_id].items()})
+
+    def _local_index(self, env_id: int) -> int:
+        """
+        Index of the environment's game in its worker.
+        """
+        return env_id // self._number_of_workers
+
+    def _group_by_worker(self, env_ids: Sequence[int], values: Optional[Sequence] = None) -> Dict[int, list]:
+        """
+        Groups the environment ids (or the values belonging to them) by worker.
+        """
+        groups = {}
+        for i, env_id in enumerate(env_ids):
+            groups.setdefault(env_id % self._number_of_workers, []).append(env_id if values is None else values[i])
+        return groups
+
+
+def _build_ring_layout(observation_space_desc: Collection[ITensorDescriptor],
+                       ring_buffer_size: int) -> Tuple[List[Tuple[str, np.dtype, tuple, int]], int]:
+    """
+    Helper function for computing the layout of a ring buffer.
+
+    :param observation_space_desc:
+        observation descriptors, only the tensor descriptors are buffered
+    :param ring_buffer_size:
+        number of slots
+    :returns
+        list of (field name, dtype, shape, offset), and the total size in bytes
+    """
+    layout = []
+    offset = 0
+    for descriptor in observation_space_desc:
+        if not isinstance(descriptor, ITensorDescriptor):
+            continue
+        dtype = np.dtype(descriptor.get_data_type())
+        shape = (ring_buffer_size, *descriptor.get_tensor_shape())
+        layout.append((descriptor.get_display_name(), dtype, shape, offset))
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        offset += -(-nbytes // FIELD_ALIGNMENT) * FIELD_ALIGNMENT
+    return layout, max(offset, FIELD_ALIGNMENT)
+
+
+def _map_ring(memory: SharedMemory,
+              layout: List[Tuple[str, np.dtype, tuple, int]],
+              read_only: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Helper function for mapping the ring buffer fields of a shared memory block.
+    """
+    views = {}
+    for name, dtype, shape, offset in layout:
+        view = np.ndarray(shape, dtype=dtype, buffer=memory.buf, offset=offset)
+        view.flags.writeable = not read_only
+        views[name] = view
+    return views
+
+
+def _write_observation(views: Dict[str, np.ndarray], slot: int, observation: IObservation) -> int:
+    """
+    Copies the observation into a ring slot, the missing fields are zeroed.
+
+    :returns
+        the slot, or `NO_OBSERVATION` if there is no observation
+    """
+    if observation is None:
+        return NO_OBSERVATION
+    for name, view in views.items():
+        tensor = getattr(observation, name, None)
+        if tensor is None:
+            view[slot] = 0
+        else:
+            view[slot] = tensor
+    return slot
+
+
+def _run_actor(app_args: Tuple[str, str, str], number_of_games: int, connection: Connection) -> None:
+    """
+    Worker process entry point.
+
+    :param app_args:
+        `KatherineApplication.init` arguments
+    :param number_of_games:
+        number of game instances to host
+    :param connection:
+        pipe to the pool
+    """
+    KatherineApplication.init(*app_args)
+    factory = KatherineApplication.get_application_factory()
+    games = [factory.build_game() for _ in range(number_of_games)]
+    for game in games:
+        game.init()
+    connection.send((READY_COMMAND, games[0].get_observation_space_desc(), games[0].get_action_space_desc()))
+    _, memory_names, layout = connection.recv()
+    memories = [SharedMemory(name=name) for name in memory_names]
+    views = [_map_ring(memory, layout) for memory in memories]
+    ring_buffer_size = layout[0][2][0] if len(layout) > 0 else 1
+    write_counters = [0] * number_of_games
+
+    def write(game_idx: int, observation: IObservation) -> int:
+        slot = _write_observation(views[game_idx], write_counters[game_idx] % ring_buffer_size, observation)
+        if slot != NO_OBSERVATION:
+            write_counters[game_idx] += 1
+            # copied into the shared memory, the game can recycle its buffer
+            games[game_idx].release_observation(observation)
+        return slot
+
+    try:
+        while True:
+            message = connection.recv()
+            command = message[0]
+            if RESET_COMMAND == command:
+                connection.send([write(i, games[i].reset()) for i in message[1]])
+            elif STEP_COMMAND == command:
+                _, game_indices, actions, num_of_ticks = message
+                results = []
+                for i, action in zip(game_indices, actions):
+                    game = games[i]
+                    observation, reward = game.make_action(action)
+                    t_slot = write(i, observation)
+                    is_finished = bool(game.is_episode_finished())
+                    c_slot = t_slot
+                    if not is_finished and num_of_ticks > 0:
+                        game.process_ticks(num_of_ticks)
+                        c_slot = write(i, game.get_current_observation())
+                    results.append((t_slot, float(reward), is_finished, float(game.get_total_score()), c_slot))
+                connection.send(results)
+            elif TICKS_COMMAND == command:
+                _, game_indices, num_of_ticks = message
+                results = []
+                for i in game_indices:
+                    game = games[i]
+                    game.process_ticks(num_of_ticks)
+                    results.append((write(i, game.get_current_observation()), bool(game.is_episode_finished()),
+                                    float(game.get_total_score())))
+                connection.send(results)
+            elif CLOSE_COMMAND == command:
+                break
+    except EOFError:
+        # pool is gone
+        pass
+    except Exception:
+        log.exception("Actor worker failed.")
+        raise
+    finally:
+        del views
+        for memory in memories:
+            try:
+                memory.close()
+            except BufferError:
+                pass
+        connection.close()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework.util import logger
+from typing import Tuple
+from logging import Logger
+import threading
+import time
+
+
+class ReplayRatioScheduler:
+    """
+    Replay ratio scheduler for asynchronous training.
+
+    Keeps the ratio of gradient steps (learner) to environment steps (actor) around the target
+    ratio, with blocking in both directions:
+        * the learner waits, if it would get ahead of the target ratio
+        * the actor waits, if the learner is lagging more than `max_lag` steps behind
+    During the observation episodes the learner is idling, and the environment steps are not counted.
+    """
+
+    # protected members
+
+    _log: Logger = None
+    _condition: threading.Condition = None
+    _replay_ratio: float = 0.0
+    _max_lag: int = 0
+    _max_observe_episodes: int = 0
+    _observing: bool = True
+    _stopped: bool = False
+    _env_steps: int = 0
+    _train_steps: int = 0
+    _actor_wait_time: float = 0.0
+    _learner_wait_time: float = 0.0
+
+    # public member functions
+
+    def __init__(self, replay_ratio: float, max_lag: int, max_observe_episodes: int):
+        """
+        Default constructor.
+
+        :param replay_ratio:
+            target gradient steps per environment step (zero or less means no limit)
+        :param max_lag:
+            maximum lag of the learner (in gradient steps), before blocking the actor
+        :param max_observe_episodes:
+            number of observation episodes (see: `IAgent.train`)
+        """
+        if max_lag < 0:
+            raise ValueError("The maximum lag must be zero or positive.")
+        self._log = logger.get_logger(self.__class__.__name__)
+        self._condition = threading.Condition()
+        self._replay_ratio = replay_ratio
+        self._max_lag = max_lag
+        self._max_observe_episodes = max_observe_episodes
+
+    def on_env_step(self, current_episode: int) -> None:
+        """
+        Actor side, counts an environment step. It is blocking while the learner is lagging
+        too much behind.
+
+        :param current_episode:
+            current episode number (as it is passed to `IAgent.tick`)
+        """
+        with self._condition:
+            if self._observing:
+                if current_episode <= self._max_observe_episodes:
+                    return
+                self._observing = False
+                self._log.info("Observation is over, the learner is starting.")
+            self._env_steps += 1
+            self._condition.notify_all()
+            if self._replay_ratio <= 0:
+                return
+            start = time.perf_counter()
+            while not self._stopped and self._allowed_train_steps() - self._train_steps > self._max_lag:
+                self._condition.wait()
+            self._actor_wait_time += time.perf_counter() - start
+
+    def acquire_train_step(self) -> bool:
+        """
+        Learner side, waits until a gradient step is allowed.
+
+        :returns
+            True if the step is allowed, False if the scheduler was stopped
+        """
+        with self._condition:
+            start = time.perf_counter()
+            while not self._stopped and (self._observing or (
+                    self._replay_ratio > 0 and self._train_steps >= self._allowed_train_steps())):
+                self._condition.wait()
+            self._learner_wait_time += time.perf_counter() - start
+            return not self._stopped
+
+    def release_train_step(self) -> None:
+        """
+        Learner side, counts a finished gradient step.
+        """
+        with self._condition:
+            self._train_steps += 1
+            self._condition.notify_all()
+
+    def stop(self) -> None:
+        """
+        Releases all of the waiting parties, the subsequent `acquire_train_step` calls are returning False.
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    def get_achieved_ratio(self) -> float:
+        """
+        Achieved ratio of gradient steps to environment steps, since the observation is over.
+        """
+        with self._condition:
+            if self._env_steps == 0:
+                return 0.0
+            return self._train_steps / self._env_steps
+
+    def pop_wait_times(self) -> Tuple[float, float]:
+        """
+        Returns and resets the total wait times.
+
+        :returns
+            tuple of (actor wait time, learner wait time) in seconds, since the last call
+        """
+        with self._condition:
+            wait_times = (self._actor_wait_time, self._learner_wait_time)
+            self._actor_wait_time = 0.0
+            self._learner_wait_time = 0.0
+            return wait_times
+
+    # protected member functions
+
+    def _allowed_train_steps(self) -> int:
+        """
+        Number of gradient steps allowed by the target ratio.
+        """
+        return int(self._env_steps * self._replay_ratio)
@@ -15,24 +15,29 @@
 from kat_typing import Action
 from kat_api import IObservation, IState, StateType
 from overrides import overrides
+from typing import List
 
 
 class KatState(IState):
     """
     Default `IState` implementation.
 
-    An `IState` contains a time step of the full episode trajectory.
+    An `IState` contains a time step of the full episode trajectory. The class is slotted,
+    the instances can be reused through a `KatStatePool`.
     """
 
+    __slots__ = ("_observation", "_transitioned_observation", "_state_type", "_transition",
+                 "_reward", "_discount", "_state_id")
+
     # protected members
 
-    _observation: IObservation = None
-    _transitioned_observation: IObservation = None
-    _state_type: StateType = None
-    _transition: Action = None
-    _reward: float = float(-1.0)
-    _discount: float = float(0.99)
-    _state_id: int = 0
+    _observation: IObservation
+    _transitioned_observation: IObservation
+    _state_type: StateType
+    _transition: Action
+    _reward: float
+    _discount: float
+    _state_id: int
 
     # public member functions
 
@@ -49,8 +54,17 @@ class KatState(IState):
         :param discount:
             discount factor
         """
+        self.reset(state_id, observation, state_type, discount)
+
+    def reset(self, state_id: int, observation: IObservation, state_type: StateType, discount: float = None) -> None:
+        """
+        (Re)initializes all of the fields, like the constructor.
+        """
         self._observation = observation
+        self._transitioned_observation = None
         self._state_type = state_type
+        self._transition = None
+        self._reward = -1.0
         self._discount = discount
         self._state_id = state_id
 
@@ -178,7 +192,55 @@ class KatState(IState):
 
     def __str__(self):
         output = ""
-        for _, var in vars(self).items():
-            output += str(var) + "::"
+        for name in self.__slots__:
+            output += str(getattr(self, name)) + "::"
         return output
 
+
+class KatStatePool:
+    """
+    Free list of `KatState` objects, for the drivers.
+
+    A driver releases a state when nothing references it anymore (e.g. the transition is
+    already stored), and the next `acquire` resets and returns it, instead of allocating
+    a new one.
+    """
+
+    __slots__ = ("_free_states",)
+
+    # protected members
+
+    _free_states: List[KatState]
+
+    # public member functions
+
+    def __init__(self):
+        """
+        Default constructor.
+        """
+        self._free_states = []
+
+    def acquire(self, state_id: int, observation: IObservation, state_type: StateType,
+                discount: float = None) -> KatState:
+        """
+        Returns a reset state from the pool, or a new one if the pool is empty.
+
+        # see : KatState.reset(...)
+        """
+        if self._free_states:
+            state = self._free_states.pop()
+            state.reset(state_id, observation, state_type, discount)
+            return state
+        return KatState(state_id, observation, state_type, discount)
+
+    def release(self, state: KatState) -> None:
+        """
+        Gives back a state to the pool, its observations are dropped immediately.
+
+        :param state:
+            state which is not referenced anymore
+        """
+        state._observation = None
+        state._transitioned_observation = None
+        self._free_states.append(state)
+
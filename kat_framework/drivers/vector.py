@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework.framework import KatherineApplication
+from kat_framework.drivers.state import KatState, KatStatePool
+from kat_framework.drivers.episode import SyncEpisodeDriver
+from kat_framework.drivers.pool import ActorPool
+from kat_framework.drivers.watchdog import GameWatchdog
+from kat_framework.config.config_props import DriverConfigurationProperty
+from kat_api import IDriver, IGame, IObservation, ITensorDescriptor, StateType
+from overrides import overrides
+from typing import List, Optional, Dict, Collection
+from time import sleep
+
+
+class VectorEpisodeDriver(SyncEpisodeDriver, IDriver):
+    """
+    Vectorized environment driver implementation.
+
+    This driver owns N game instances and steps them in lockstep. In each step the actions are
+    taken by one `IAgent.take_actions` call (one policy evaluation for all of the observations),
+    and the transitions are stored by one `IAgent.store_transitions` call. The environments are
+    resetting independently, when their episodes are finished. `max_episodes` is the total number
+    of episodes played by all environments.
+
+    The global step counter is counting environment steps, and one train step is performed per
+    stepped environment, so the replay ratio is the same as the sequential drivers'. The recorded
+    trajectories are buffered per environment, and written when the episodes are finished.
+    """
+
+    # protected members
+
+    _games: List[IGame] = None
+    _number_of_environments: int = 0
+    _state_pool: KatStatePool = None
+
+    # public member functions
+
+    def __init__(self):
+        """
+        Default constructor.
+        """
+        super(VectorEpisodeDriver, self).__init__()
+        self._games = self._build_games()
+        self._state_pool = KatStatePool()
+
+    # protected member functions
+
+    @overrides
+    def _build_game_watchdog(self) -> Optional[GameWatchdog]:
+        """
+        The lockstep games are not watched, the actor pool driver is enforcing the call deadlines itself.
+
+        # see : EpisodeDriver._build_game_watchdog()
+        """
+        self._log.warning("The game watchdog is not supported by the vectorized drivers.")
+        return None
+
+    @overrides
+    def _initialize_components(self) -> None:
+        """
+        Initializing all of the environments.
+
+        # see : EpisodeDriver._initialize_components()
+        """
+        for game in self._games:
+            if not game.is_initialized():
+                game.init()
+        super(VectorEpisodeDriver, self)._initialize_components()
+
+    @overrides
+    def _loop(self) -> None:
+        """
+        Main loop.
+        """
+        global_steps = self._start_step
+        started_episodes = self._start_episode
+        finished_episodes = self._start_episode
+        states: List[Optional[KatState]] = [None] * self._number_of_environments
+        step_counters = [0] * self._number_of_environments
+        recorder = self._trajectory_recorder
+        # records of the running episodes, so the episodes are not interleaved in the shards
+        episode_records: List[list] = [[] for _ in range(self._number_of_environments)]
+        for env_id in range(self._number_of_environments):
+            if started_episodes < self._max_episodes:
+                started_episodes += 1
+                states[env_id] = self._reset_game(env_id, started_episodes)
+        while finished_episodes < self._max_episodes:
+            env_ids = [env_id for env_id, state in enumerate(states) if state is not None]
+            current_states = [states[env_id] for env_id in env_ids]
+            actions = self._agent.take_actions(current_states, env_ids)
+            finished_env_ids = self._step_games(env_ids, current_states, actions, step_counters)
+            self._agent.store_transitions(current_states, env_ids)
+            finished_episode_ids = []
+            for env_id, current_state in zip(env_ids, current_states):
+                if recorder is not None:
+                    episode_records[env_id].extend(recorder.extract(current_state))
+                if env_id in finished_env_ids:
+                    if recorder is not None:
+                        recorder.write(episode_records[env_id])
+                        episode_records[env_id] = []
+                    self._release_env_observations(env_id, current_state)
+                    finished_episodes += 1
+                    finished_episode_ids.append(finished_episodes)
+                    step_counters[env_id] = 0
+                    self._update_episode_metrics(env_id, finished_episodes)
+                    if started_episodes < self._max_episodes:
+                        started_episodes += 1
+                        states[env_id] = self._reset_game(env_id, started_episodes)
+                    else:
+                        states[env_id] = None
+                else:
+                    states[env_id] = self._next_state(env_id, current_state)
+                    self._release_env_observations(env_id, current_state, states[env_id])
+                # the transition is already stored
+                self._state_pool.release(current_state)
+            if self._sleep_time > 0:
+                sleep(self._sleep_time)
+            for _ in env_ids:
+                if self._training_mode:
+                    self._perform_train_step(finished_episodes, global_steps)
+                global_steps += 1
+            # the in-flight episodes of the other environments are restarted on resume
+            for episode_id in finished_episode_ids:
+                self._save_run_state(episode_id, global_steps)
+
+    @overrides
+    def _load_configuration(self) -> None:
+        """
+        Loads configuration.
+        """
+        super(VectorEpisodeDriver, self)._load_configuration()
+        self._number_of_environments = self._config_handler.get_config_property(
+            DriverConfigurationProperty.NUMBER_OF_ENVIRONMENTS,
+            DriverConfigurationProperty.NUMBER_OF_ENVIRONMENTS.prop_type)
+        if self._number_of_environments < 1:
+            raise ValueError("At least one environment must be specified.")
+
+    def _build_games(self) -> List[IGame]:
+        """
+        Helper function for building the environments, the first one is the
+        driver's own game instance.
+
+        :returns
+            list of `IGame` instances (not initialized)
+        """
+        factory = KatherineApplication.get_application_factory()
+        return [self._game] + [factory.build_game() for _ in range(self._number_of_environments - 1)]
+
+    def _reset_game(self, env_id: int, episode_id: int) -> KatState:
+        """
+        Starts a new episode in the specified environment.
+
+        :param env_id:
+            environment id
+        :param episode_id:
+            id of the new episode
+        :returns
+            initial state of the episode
+        """
+        return self._state_pool.acquire(episode_id, self._games[env_id].reset(), StateType.INITIAL_STATE)
+
+    def _step_games(self,
+                    env_ids: List[int],
+                    current_states: List[KatState],
+                    actions: list,
+                    step_counters: List[int]) -> List[int]:
+        """
+        Makes the actions in the specified environments, and updates the states with the transitions.
+
+        :param env_ids:
+            active environment ids
+        :param current_states:
+            current states of the environments respectively
+        :param actions:
+            actions to make respectively
+        :param step_counters:
+            step counters of all environments (updated in place)
+        :returns
+            ids of the environments, where the episode has finished
+        """
+        finished_env_ids = []
+        for env_id, current_state, action in zip(env_ids, current_states, actions):
+            game = self._games[env_id]
+            current_state.set_transition(action)
+            next_observation, reward = game.make_action(action)
+            current_state.set_transitioned_observation(next_observation)
+            current_state.set_reward(reward)
+            if game.is_episode_finished() or self._max_steps <= step_counters[env_id]:
+                current_state.state_type = StateType.END_STATE
+                finished_env_ids.append(env_id)
+            step_counters[env_id] += 1
+        return finished_env_ids
+
+    def _next_state(self, env_id: int, current_state: KatState) -> KatState:
+        """
+        Builds the next state of a running episode.
+
+        :param env_id:
+            environment id
+        :param current_state:
+            the state of the environment, which was already stepped
+        :returns
+            next active state
+        """
+        if self._action_frequency > 0:
+            self._games[env_id].process_ticks(self._action_frequency)
+            return self._state_pool.acquire(current_state.get_state_id(),
+                                            self._games[env_id].get_current_observation(), StateType.ACTIVE_STATE)
+        return self._state_pool.acquire(current_state.get_state_id(), current_state.get_transitioned_observation(),
+                                        StateType.ACTIVE_STATE)
+
+    def _release_env_observations(self, env_id: int, state: KatState, next_state: Optional[KatState] = None) -> None:
+        """
+        Gives back the consumed observations of a stored state to its environment.
+
+        # see : EpisodeDriver._release_observations(state, next_state, game)
+        """
+        self._release_observations(state, next_state, self._games[env_id])
+
+    def _get_total_score(self, env_id: int) -> float:
+        """
+        Total score of the current episode in the specified environment.
+
+        :param env_id:
+            environment id
+        :returns
+            total score
+        """
+        return self._games[env_id].get_total_score()
+
+    def _update_episode_metrics(self, env_id: int, finished_episodes: int) -> None:
+        """
+        Pushes and flushes the metrics of a finished episode.
+
+        :param env_id:
+            environment id
+        :param finished_episodes:
+            number of finished episodes (used as metrics step)
+        """
+        self._update_metrics(exploration_rate=self._agent.get_exploration_rate())
+        self._update_metrics(score=self._get_total_score(env_id))
+        self._update_inference_metrics()
+        self._update_phase_metrics()
+        self._update_driver_metrics()
+        self._metrics.flush_metrics(finished_episodes)
+
+
+class ActorPoolEpisodeDriver(VectorEpisodeDriver, IDriver):
+    """
+    Multi-process vectorized environment driver implementation.
+
+    The games are simulated by an `ActorPool` (worker processes), the driver's process is only
+    taking the actions and training. The observations are read from shared memory, and the actions
+    of a step are dispatched to each worker in one batch.
+    """
+
+    # protected members
+
+    _actor_pool: ActorPool = None
+    _number_of_workers: int = 0
+    _ring_buffer_size: int = 0
+    _max_restarts: int = 0
+    _current_observations: Dict[int, IObservation] = None
+
+    # public member functions
+
+    def __init__(self):
+        """
+        Default constructor.
+        """
+        super(ActorPoolEpisodeDriver, self).__init__()
+        if self._fast_warm_up_enabled:
+            # the warm-up plays a local game, the pool's games are living in the worker processes
+            self._log.warning("The fast warm-up is not supported by the actor pool driver.")
+            self._fast_warm_up_enabled = False
+        self._actor_pool = ActorPool(self._number_of_environments,
+                                     self._number_of_workers,
+                                     self._ring_buffer_size,
+                                     self._max_restarts,
+                                     self._game_call_deadline if self._game_watchdog_enabled else 0.0)
+        self._current_observations = {}
+
+    # protected member functions
+
+    @overrides
+    def _initialize_components(self) -> None:
+        """
+        Starting the actor pool, the games are initialized by the workers.
+
+        # see : EpisodeDriver._initialize_components()
+        """
+        self._actor_pool.start()
+        if not self._agent.is_initialized():
+            self._agent.init(self._get_observation_space_desc(), self._get_action_space_desc())
+        if not self._metrics.is_initialized():
+            self._metrics.init(self._agent.get_distribution_strategy())
+
+    @overrides
+    def _get_observation_space_desc(self) -> Collection[ITensorDescriptor]:
+        """
+        # see : EpisodeDriver._get_observation_space_desc()
+        """
+        return self._actor_pool.get_observation_space_desc()
+
+    @overrides
+    def _get_action_space_desc(self) -> ITensorDescriptor:
+        """
+        # see : EpisodeDriver._get_action_space_desc()
+        """
+        return self._actor_pool.get_action_space_desc()
+
+    @overrides
+    def _terminate(self) -> None:
+        """
+        Stopping the actor pool.
+        """
+        try:
+            super(ActorPoolEpisodeDriver, self)._terminate()
+        finally:
+            self._actor_pool.close()
+
+    @overrides
+    def _load_configuration(self) -> None:
+        """
+        Loads configuration.
+        """
+        super(ActorPoolEpisodeDriver, self)._load_configuration()
+        self._number_of_workers = self._config_handler.get_config_property(
+            DriverConfigurationProperty.ACTOR_POOL_WORKERS,
+            DriverConfigurationProperty.ACTOR_POOL_WORKERS.prop_type)
+        self._ring_buffer_size = self._config_handler.get_config_property(
+            DriverConfigurationProperty.ACTOR_RING_BUFFER_SIZE,
+            DriverConfigurationProperty.ACTOR_RING_BUFFER_SIZE.prop_type)
+        self._max_restarts = self._config_handler.get_config_property(
+            DriverConfigurationProperty.ACTOR_MAX_RESTARTS,
+            DriverConfigurationProperty.ACTOR_MAX_RESTARTS.prop_type)
+
+    @overrides
+    def _build_games(self) -> List[IGame]:
+        """
+        The games are living in the actor pool's processes.
+        """
+        return []
+
+    @overrides
+    def _reset_game(self, env_id: int, episode_id: int) -> KatState:
+        """
+        # see : VectorEpisodeDriver._reset_game(env_id, episode_id)
+        """
+        return self._state_pool.acquire(episode_id, self._actor_pool.reset([env_id])[0], StateType.INITIAL_STATE)
+
+    @overrides
+    def _step_games(self,
+                    env_ids: List[int],
+                    current_states: List[KatState],
+                    actions: list,
+                    step_counters: List[int]) -> List[int]:
+        """
+        # see : VectorEpisodeDriver._step_games(env_ids, current_states, actions, step_counters)
+        """
+        finished_env_ids = []
+        results = self._actor_pool.step(env_ids, actions, self._action_frequency)
+        for env_id, current_state, action, result in zip(env_ids, current_states, actions, results):
+            next_observation, reward, is_finished, current_observation = result
+            current_state.set_transition(action)
+            current_state.set_transitioned_observation(next_observation)
+            current_state.set_reward(reward)
+            if is_finished or self._max_steps <= step_counters[env_id]:
+                current_state.state_type = StateType.END_STATE
+                finished_env_ids.append(env_id)
+            self._current_observations[env_id] = current_observation
+            step_counters[env_id] += 1
+        return finished_env_ids
+
+    @overrides
+    def _next_state(self, env_id: int, current_state: KatState) -> KatState:
+        """
+        The ticks are already processed by the workers.
+
+        # see : VectorEpisodeDriver._next_state(env_id, current_state)
+        """
+        return self._state_pool.acquire(current_state.get_state_id(), self._current_observations[env_id],
+                                        StateType.ACTIVE_STATE)
+
+    @overrides
+    def _release_env_observations(self, env_id: int, state: KatState, next_state: Optional[KatState] = None) -> None:
+        """
+        The observations are views of the shared memory, the workers are releasing the games' buffers,
+        when the observations are copied.
+
+        # see : VectorEpisodeDriver._release_env_observations(env_id, state, next_state)
+        """
+        pass
+
+    @overrides
+    def _get_total_score(self, env_id: int) -> float:
+        """
+        # see : VectorEpisodeDriver._get_total_score(env_id)
+        """
+        return self._actor_pool.get_total_score(env_id)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework.drivers.pool import ActorPool
+from kat_api import IGame, IObservation, ITensorDescriptor
+from kat_typing import Action
+from typing import Collection, Optional, Tuple
+from overrides import overrides
+from time import perf_counter
+
+
+class GameWatchdog(IGame):
+    """
+    Out-of-process game, with call deadlines.
+
+    The game (built by the application factory) is hosted by a single worker `ActorPool`, and the
+    `reset`, `make_action` and `process_ticks` calls have a deadline. A hung (or crashed) simulator is
+    killed and restarted, and its interrupted episode is truncated: the call returns no observation,
+    the episode is finished, and `is_episode_truncated` is set until the next reset. The calls exceeding
+    the step latency SLO are counted.
+
+    The observations are read-only views of the pool's ring buffers (see: `SharedObservation`).
+    """
+
+    # protected members
+
+    _actor_pool: ActorPool = None
+    _step_latency_slo: float = 0.0
+    _current_observation: Optional[IObservation] = None
+    _episode_finished: bool = False
+    _episode_truncated: bool = False
+    _slo_violations: int = 0
+    _reported_restarts: int = 0
+    _initialized: bool = False
+
+    # public member functions
+
+    def __init__(self, call_deadline: float, step_latency_slo: float, ring_buffer_size: int, max_restarts: int):
+        """
+        Default constructor.
+
+        :param call_deadline:
+            deadline (sec) of the game calls
+        :param step_latency_slo:
+            step latency SLO (ms) of the make_action and process_ticks calls (zero or less means no SLO)
+        :param ring_buffer_size:
+            number of observation slots (see: `ActorPool`)
+        :param max_restarts:
+            maximum number of simulator restarts
+        """
+        if call_deadline <= 0.0:
+            raise ValueError("The call deadline must be positive.")
+        self._actor_pool = ActorPool(1, 1, ring_buffer_size, max_restarts, call_deadline)
+        self._step_latency_slo = step_latency_slo / 1000.0
+
+    @overrides
+    def init(self) -> None:
+        """
+        Starts the worker process, the game is initialized by the worker.
+
+        # see : IGame.init()
+        """
+        self._actor_pool.start()
+        self._initialized = True
+
+    @overrides
+    def reset(self) -> IObservation:
+        """
+        # see : IGame.reset()
+        """
+        self._current_observation = self._actor_pool.reset([0])[0]
+        self._episode_finished = False
+        self._episode_truncated = False
+        return self._current_observation
+
+    @overrides
+    def make_action(self, action: Action) -> Tuple[IObservation, float]:
+        """
+        # see : IGame.make_action(action)
+        """
+        restarts = self._actor_pool.get_number_of_restarts()
+        start = perf_counter()
+        transitioned_observation, reward, self._episode_finished, _ = \
+            self._actor_pool.step([0], [action], num_of_ticks=0)[0]
+        self._check_call(perf_counter() - start, restarts)
+        self._current_observation = transitioned_observation
+        return transitioned_observation, reward
+
+    @overrides
+    def get_current_observation(self) -> IObservation:
+        """
+        # see : IGame.get_current_observation()
+        """
+        return self._current_observation
+
+    @overrides
+    def is_initialized(self) -> bool:
+        """
+        # see : IGame.is_initialized()
+        """
+        return self._initialized
+
+    @overrides
+    def is_episode_finished(self) -> bool:
+        """
+        # see : IGame.is_episode_finished()
+        """
+        return self._episode_finished
+
+    @overrides
+    def get_action_space_desc(self) -> ITensorDescriptor:
+        """
+        # see : IGame.get_action_space_desc()
+        """
+        return self._actor_pool.get_action_space_desc()
+
+    @overrides
+    def get_observation_space_desc(self) -> Collection[ITensorDescriptor]:
+        """
+        # see : IGame.get_observation_space_desc()
+        """
+        return self._actor_pool.get_observation_space_desc()
+
+    @overrides
+    def process_ticks(self, num_of_ticks: int) -> None:
+        """
+        # see : IGame.process_ticks(num_of_ticks)
+        """
+        if num_of_ticks <= 0 or self._episode_finished:
+            return
+        restarts = self._actor_pool.get_number_of_restarts()
+        start = perf_counter()
+        self._episode_finished, self._current_observation = self._actor_pool.process_ticks([0], num_of_ticks)[0]
+        self._check_call(perf_counter() - start, restarts)
+
+    @overrides
+    def get_total_score(self) -> float:
+        """
+        # see : IGame.get_total_score()
+        """
+        return self._actor_pool.get_total_score(0)
+
+    @overrides
+    def release_observation(self, observation: IObservation) -> None:
+        """
+        The ring slots are recycled by the pool.
+
+        # see : IGame.release_observation(observation)
+        """
+        pass
+
+    def is_episode_truncated(self) -> bool:
+        """
+        Returns True if the current episode was interrupted by a simulator restart.
+        """
+        return self._episode_truncated
+
+    def pop_statistics(self) -> Tuple[int, int]:
+        """
+        Returns the number of the SLO violations and the simulator restarts since the last call.
+        """
+        restarts = self._actor_pool.get_number_of_restarts()
+        statistics = (self._slo_violations, restarts - self._reported_restarts)
+        self._slo_violations = 0
+        self._reported_restarts = restarts
+        return statistics
+
+    def close(self) -> None:
+        """
+        Stops the worker process.
+        """
+        self._actor_pool.close()
+        self._initialized = False
+
+    # protected member functions
+
+    def _check_call(self, latency: float, restarts: int) -> None:
+        """
+        Counts the SLO violation, and truncates the episode if the simulator was restarted during the call.
+
+        :param latency:
+            duration of the call (sec)
+        :param restarts:
+            number of restarts before the call
+        """
+        if 0.0 < self._step_latency_slo < latency:
+            self._slo_violations += 1
+        if self._actor_pool.get_number_of_restarts() > restarts:
+            self._episode_finished = True
+            self._episode_truncated = True
+            self._current_observation = None
@@ -17,6 +17,7 @@
 from kat_api import IFactory
 from kat_api import IConfigurationHandler
 from kat_framework.util import reflection, logger
+from typing import Tuple
 
 LOGO_STRING = \
     "\n ##################################################\n \
@@ -40,6 +41,7 @@ class KatherineApplication:
     """
     application_factory: IFactory
     config_handler: IConfigurationHandler
+    application_args: Tuple[str, str, str] = None
 
     @staticmethod
     def init(factory_class: str, config_handler_class: str, config_uri: str) -> None:
@@ -62,6 +64,7 @@ class KatherineApplication:
         KatherineApplication.config_handler = reflection.get_instance(
             config_handler_class, IConfigurationHandler, config_uri)
         KatherineApplication.application_factory = reflection.get_instance(factory_class, IFactory)
+        KatherineApplication.application_args = (factory_class, config_handler_class, config_uri)
 
     @staticmethod
     def run(factory_class: str, config_handler_class: str, config_uri: str, enable_logo: bool = True) -> None:
@@ -102,3 +105,14 @@ class KatherineApplication:
             `IConfigurationHandler` instance, or None
         """
         return KatherineApplication.config_handler
+
+    @staticmethod
+    def get_application_args() -> Tuple[str, str, str]:
+        """
+        Returns the arguments of the last `init` call, so the runtime can be
+        initialized the same way in other (e.g. worker) processes.
+
+        :return:
+            tuple of (factory_class, config_handler_class, config_uri), or None
+        """
+        return KatherineApplication.application_args
@@ -14,6 +14,8 @@
 ##################################################
 
 from kat_framework.framework import KatherineApplication
+from kat_framework.config.config_props import GameConfigurationProperty
+from kat_framework.games.buffers import ObservationBufferPool
 from kat_framework.util import logger
 from kat_api import IObservation, ITensorDescriptor, IConfigurationHandler
 from kat_typing import Action, Tensor
@@ -37,6 +39,11 @@ class Game(metaclass=ABCMeta):
     _action_space: Tensor = None
     _action_space_desc: ITensorDescriptor = None
     _observation_space_desc: List[ITensorDescriptor] = None
+    _action_repeat: int = 1
+    _max_pooling_enabled: bool = False
+    _observation_buffer_pool_size: int = 0
+    _observation_buffer_pool: ObservationBufferPool = None
+    _pooled_observation_field: str = None
 
     # public member functions
 
@@ -48,6 +55,17 @@ class Game(metaclass=ABCMeta):
         if not self._config_handler:
             raise ValueError("No config_handler specified")
         self._log = logger.get_logger(self.__class__.__name__)
+        self._action_repeat = self._config_handler.get_config_property(
+            GameConfigurationProperty.ACTION_REPEAT,
+            GameConfigurationProperty.ACTION_REPEAT.prop_type)
+        self._max_pooling_enabled = self._config_handler.get_config_property(
+            GameConfigurationProperty.MAX_POOLING_ENABLED,
+            GameConfigurationProperty.MAX_POOLING_ENABLED.prop_type)
+        self._observation_buffer_pool_size = self._config_handler.get_config_property(
+            GameConfigurationProperty.OBSERVATION_BUFFER_POOL_SIZE,
+            GameConfigurationProperty.OBSERVATION_BUFFER_POOL_SIZE.prop_type)
+        if self._action_repeat < 1:
+            raise ValueError("The action repeat must be positive.")
 
     def init(self) -> None:
         """
@@ -61,6 +79,8 @@ class Game(metaclass=ABCMeta):
         """
         if action is None:
             raise ValueError("No action specified")
+        if self._action_repeat > 1:
+            return self._repeat_action(action, self._action_repeat)
         return self._make_action(action)
 
     def get_current_observation(self) -> IObservation:
@@ -69,6 +89,13 @@ class Game(metaclass=ABCMeta):
         """
         return self._current_observation
 
+    def release_observation(self, observation: IObservation) -> None:
+        """
+        # see: IGame.release_observation(observation)
+        """
+        if self._observation_buffer_pool is not None and observation is not None:
+            self._observation_buffer_pool.release(getattr(observation, self._pooled_observation_field, None))
+
     def is_initialized(self) -> bool:
         """
         # see: IGame.is_initialized()
@@ -115,6 +142,42 @@ class Game(metaclass=ABCMeta):
         """
         pass
 
+    def _repeat_action(self, action: Action, num_of_repeats: int) -> Tuple[IObservation, float]:
+        """
+        Repeats an action, until the episode is finished. Generic implementation, based on
+        `_make_action`, the wrappers should override it with a fast path which builds only the
+        last observation (and max-pools the last two frames, if it is enabled).
+
+        :param action:
+            chosen action
+        :param num_of_repeats:
+            number of environment steps
+        :return:
+            the last observation, accumulated reward
+        """
+        observation, total_reward = None, 0.0
+        for i in range(num_of_repeats):
+            observation, reward = self._make_action(action)
+            total_reward += reward
+            if self.is_episode_finished():
+                break
+        return observation, total_reward
+
+    def _build_observation_buffer_pool(self, field_name: str, shape: tuple, dtype: type) -> None:
+        """
+        Builds the observation buffer pool of the wrapper, if it is enabled.
+
+        :param field_name:
+            the observation field, which is written into the pooled buffers
+        :param shape:
+            shape of the field
+        :param dtype:
+            data type of the field
+        """
+        if self._observation_buffer_pool_size > 0:
+            self._pooled_observation_field = field_name
+            self._observation_buffer_pool = ObservationBufferPool(shape, dtype, self._observation_buffer_pool_size)
+
     def _init_check(self) -> None:
         """
         Checks that the game is initialised or not.
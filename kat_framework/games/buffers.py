@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from typing import List, Optional
+import numpy as np
+import threading
+import weakref
+
+
+class ObservationBufferPool:
+    """
+    Preallocated observation buffers of a game wrapper.
+
+    The wrappers are writing the observations into acquired buffers (instead of allocating new arrays
+    in every step), and the buffers are recycled when the consumer releases the observation (see:
+    `IGame.release_observation`). If there is no free buffer, a new one is allocated, so a not
+    released observation is never overwritten.
+
+    The pool is thread-safe, the consumer can release the observations from an other thread
+    than the game's (e.g. the pipelined driver's acting stage).
+    """
+
+    __slots__ = ("_shape", "_dtype", "_max_size", "_free_buffers", "_issued_buffers", "_lock")
+
+    # public member functions
+
+    def __init__(self, shape: tuple, dtype: type, max_size: int):
+        """
+        Default constructor.
+
+        :param shape:
+            shape of the buffers
+        :param dtype:
+            data type of the buffers
+        :param max_size:
+            number of preallocated buffers, and the maximum number of kept free buffers
+        """
+        if max_size < 1:
+            raise ValueError("The pool size must be positive.")
+        self._shape = tuple(shape)
+        self._dtype = np.dtype(dtype)
+        self._max_size = max_size
+        self._free_buffers: List[np.ndarray] = [np.empty(self._shape, self._dtype) for _ in range(max_size)]
+        # buffers in use by id, without keeping them alive (the not released ones are simply collected)
+        self._issued_buffers = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> np.ndarray:
+        """
+        Returns a free buffer, the content is undefined.
+        """
+        with self._lock:
+            if len(self._free_buffers) > 0:
+                buffer = self._free_buffers.pop()
+            else:
+                buffer = np.empty(self._shape, self._dtype)
+            self._issued_buffers[id(buffer)] = buffer
+        return buffer
+
+    def release(self, buffer: Optional[np.ndarray]) -> None:
+        """
+        Gives back a buffer to the pool. The buffers which are not issued by this pool (or already
+        released) are ignored.
+
+        :param buffer:
+            an acquired buffer
+        """
+        if buffer is None:
+            return
+        with self._lock:
+            if self._issued_buffers.pop(id(buffer), None) is not buffer:
+                return
+            if len(self._free_buffers) < self._max_size:
+                self._free_buffers.append(buffer)
+
+    def get_number_of_free_buffers(self) -> int:
+        """
+        Number of the buffers ready to be acquired without allocation.
+        """
+        return len(self._free_buffers)
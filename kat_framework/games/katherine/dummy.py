@@ -37,13 +37,15 @@ class DummyGame(Game, IGame):
     """
     Dummy game wrapper.
 
-    Mainly for testing purposes.
+    Mainly for testing purposes, the frames, rewards and episode ends are random. For the
+    (deterministic) framework throughput benchmarks see `SyntheticGame`.
     """
 
     # protected members
 
     _done: bool = None
     _total_reward: float = 0.0
+    _generator: np.random.Generator = None
 
     # public member functions
 
@@ -59,6 +61,9 @@ class DummyGame(Game, IGame):
         # see : IGame.init()
         """
         super(DummyGame, self).init()
+        self._generator = np.random.default_rng()
+        self._build_observation_buffer_pool(SCREEN_BUFFER, (SCREEN_WEIGHT, SCREEN_HEIGHT, SCREEN_CHANNELS),
+                                            np.float32)
         self._initialized = True
 
     @overrides
@@ -74,7 +79,7 @@ class DummyGame(Game, IGame):
         # see : IGame.process_ticks(num_of_ticks)
         """
         self._total_reward = 0.0
-        return DummyObservation(np.random.rand(SCREEN_WEIGHT, SCREEN_HEIGHT, SCREEN_CHANNELS).astype(np.float32))
+        return DummyObservation(self._random_frame())
 
     @overrides
     def is_episode_finished(self) -> bool:
@@ -92,7 +97,7 @@ class DummyGame(Game, IGame):
         if self._observation_space_desc is None:
             self._observation_space_desc = []
             self._observation_space_desc.append(
-                TensorDescriptor(display_name="screen_buffer",
+                TensorDescriptor(display_name=SCREEN_BUFFER,
                                  data_type=np.float32,
                                  tensor_shape=(SCREEN_WEIGHT, SCREEN_HEIGHT, SCREEN_CHANNELS),
                                  input_type=NetworkInputType.IMG))
@@ -113,7 +118,7 @@ class DummyGame(Game, IGame):
         # see : Game._make_action(action)
         """
         # TODO: config for randomized values
-        observation = np.random.rand(SCREEN_WEIGHT, SCREEN_HEIGHT, SCREEN_CHANNELS).astype(np.float32)
+        observation = self._random_frame()
         reward = np.random.uniform(MIN_REWARD, MAX_REWARD)
         self._done = random.choice([True, False])
         self._total_reward += reward
@@ -136,3 +141,11 @@ class DummyGame(Game, IGame):
         # see : Game._init_config()
         """
         pass
+
+    def _random_frame(self) -> np.ndarray:
+        """
+        Generates a random frame, directly into a pooled buffer if the pool is enabled.
+        """
+        if self._observation_buffer_pool is None:
+            return self._generator.random((SCREEN_WEIGHT, SCREEN_HEIGHT, SCREEN_CHANNELS), dtype=np.float32)
+        return self._generator.random(dtype=np.float32, out=self._observation_buffer_pool.acquire())
@@ -15,6 +15,7 @@
 
 from kat_api import IObservation
 from overrides import overrides
+from typing import Dict
 import numpy as np
 
 
@@ -23,6 +24,8 @@ class DummyObservation(IObservation):
     Dummy observation implementation for testing purposes.
     """
 
+    __slots__ = ("_observation_id", "screen_buffer")
+
     # public member functions
 
     def __init__(self, game_state: np.ndarray):
@@ -51,3 +54,39 @@ class DummyObservation(IObservation):
 
     def __str__(self):
         return "Observation number: " + str(self.get_observation_id())
+
+
+class ReplayObservation(IObservation):
+    """
+    Replayed (recorded) observation, the fields are set by name.
+    """
+
+    # public member functions
+
+    def __init__(self, observation_id: int, fields: Dict[str, np.ndarray]):
+        """
+        Default constructor.
+
+        :param observation_id:
+            unique id of the observation
+        :param fields:
+            observation fields by name (see: observation space descriptors)
+        """
+        self._observation_id = observation_id
+        for name, tensor in fields.items():
+            setattr(self, name, tensor)
+
+    def __eq__(self, other):
+        if isinstance(other, ReplayObservation):
+            return self.get_observation_id() == other.get_observation_id()
+        return False
+
+    @overrides
+    def get_observation_id(self) -> int:
+        """
+        # see : IObservation.get_observation_id()
+        """
+        return self._observation_id
+
+    def __str__(self):
+        return "Observation number: " + str(self.get_observation_id())
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework.config.config_props import TrajectoryConfigurationProperty
+from kat_framework.games.base import Game
+from kat_framework.games.katherine.observation import ReplayObservation
+from kat_framework.serialization.trajectory import TrajectoryReader, TrajectoryRecord, INITIAL_RECORD
+from kat_api import IGame, ITensorDescriptor, IObservation
+from kat_typing import Action
+from typing import Collection, Iterator, Optional, Tuple
+from overrides import overrides
+
+
+class ReplayGame(Game, IGame):
+    """
+    Replays the recorded trajectories (see: `TrajectoryRecorder`) as a game.
+
+    The shards are streamed back at disk speed, the observations, rewards and episode ends are the
+    recorded ones, independently from the taken actions. Useful for reproducing episodes, and for
+    benchmarking the agents without a simulator.
+    """
+
+    # protected members
+
+    _replay_directory: str = None
+    _loop_enabled: bool = True
+    _reader: TrajectoryReader = None
+    _records: Iterator[TrajectoryRecord] = None
+    _current_record: Optional[TrajectoryRecord] = None
+    _next_initial_record: Optional[TrajectoryRecord] = None
+    _record_counter: int = 0
+    _done: bool = False
+    _total_reward: float = 0.0
+
+    # public member functions
+
+    def __init__(self):
+        """
+        Default constructor.
+        """
+        super(ReplayGame, self).__init__()
+
+    @overrides
+    def init(self) -> None:
+        """
+        # see : IGame.init()
+        """
+        super(ReplayGame, self).init()
+        self._reader = TrajectoryReader(self._replay_directory)
+        self._records = iter(self._reader)
+        self._initialized = True
+
+    @overrides
+    def process_ticks(self, num_of_ticks: int) -> None:
+        """
+        The recorded observations are already containing the effects of the ticks.
+
+        # see : IGame.process_ticks(num_of_ticks)
+        """
+        pass
+
+    @overrides
+    def reset(self) -> IObservation:
+        """
+        Skips to the next recorded episode.
+
+        # see : IGame.reset()
+        """
+        self._init_check()
+        record = self._next_initial_record
+        self._next_initial_record = None
+        while record is None or INITIAL_RECORD != record[4]:
+            record = self._next_record()
+        self._current_record = record
+        self._done = False
+        self._total_reward = 0.0
+        self._current_observation = self._build_observation(record)
+        return self._current_observation
+
+    @overrides
+    def is_episode_finished(self) -> bool:
+        """
+        # see : IGame.is_episode_finished()
+        """
+        return self._done
+
+    @overrides
+    def get_observation_space_desc(self) -> Collection[ITensorDescriptor]:
+        """
+        # see : IGame.get_observation_space_desc()
+        """
+        self._init_check()
+        return self._reader.get_observation_space_desc()
+
+    @overrides
+    def get_total_score(self):
+        """
+        # see : IGame.get_total_score()
+        """
+        return self._total_reward
+
+    # protected member functions
+
+    @overrides
+    def _make_action(self, action: Action) -> Tuple[IObservation, float]:
+        """
+        The action is ignored, the recorded transition is replayed.
+
+        # see : Game._make_action(action)
+        """
+        if self._done:
+            raise RuntimeError("The episode is finished.")
+        _, _, reward, terminal, _ = self._current_record
+        next_record = self._next_record()
+        if INITIAL_RECORD == next_record[4]:
+            # the recording of the episode was interrupted
+            self._next_initial_record = next_record
+            terminal = True
+        self._current_record = next_record
+        self._done = terminal
+        self._total_reward += reward
+        self._current_observation = self._build_observation(next_record)
+        return self._current_observation, reward
+
+    @overrides
+    def _build_actions_space_desc(self):
+        """
+        # see : Game._build_actions_space_desc()
+        """
+        return self._reader.get_action_space_desc()
+
+    @overrides
+    def _init_config(self) -> None:
+        """
+        # see : Game._init_config()
+        """
+        self._replay_directory = self._config_handler.get_config_property(
+            TrajectoryConfigurationProperty.TRAJECTORY_REPLAY_DIRECTORY,
+            TrajectoryConfigurationProperty.TRAJECTORY_REPLAY_DIRECTORY.prop_type)
+        self._loop_enabled = self._config_handler.get_config_property(
+            TrajectoryConfigurationProperty.TRAJECTORY_REPLAY_LOOP_ENABLED,
+            TrajectoryConfigurationProperty.TRAJECTORY_REPLAY_LOOP_ENABLED.prop_type)
+        if self._replay_directory is None:
+            raise ValueError("No trajectory replay directory specified.")
+
+    def _next_record(self) -> TrajectoryRecord:
+        """
+        Next record of the stream, it starts over at the end of the recording, if the loop is enabled.
+
+        :raises RuntimeError
+            if there are no more records
+        """
+        record = next(self._records, None)
+        if record is None and self._loop_enabled:
+            self._records = iter(self._reader)
+            record = next(self._records, None)
+        if record is None:
+            raise RuntimeError("No more recorded episodes in {}.".format(self._replay_directory))
+        self._record_counter += 1
+        return record
+
+    def _build_observation(self, record: TrajectoryRecord) -> IObservation:
+        """
+        Observation of the record.
+        """
+        return ReplayObservation(self._record_counter, record[0])
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework.core.descriptors import TensorDescriptor
+from kat_framework.config.config_props import SyntheticGameConfigurationProperty
+from kat_framework.games.base import Game
+from kat_framework.games.katherine.observation import DummyObservation
+from kat_api import IGame, ITensorDescriptor, IObservation, NetworkInputType
+from kat_typing import Action
+from typing import Collection, List, Tuple
+from overrides import overrides
+import numpy as np
+import time
+
+SCREEN_BUFFER = "screen_buffer"
+ACTION_SPACE = "action_space"
+
+
+class SyntheticGame(Game, IGame):
+    """
+    Deterministic synthetic game wrapper.
+
+    Baseline environment for the framework throughput benchmarks: the frames are generated once (seeded)
+    and served from a preallocated pool, the episodes have a fixed length, the rewards are depending only
+    on the taken actions, and the engine time per step is simulated by a configurable busy wait.
+    """
+
+    # protected members
+
+    _screen_shape: Tuple[int, int, int] = None
+    _screen_dtype: np.dtype = None
+    _frame_pool_size: int = 16
+    _seed: int = 0
+    _episode_length: int = 100
+    _step_cost: float = 0.0
+    _action_space_size: int = 4
+    _step_reward: float = 1.0
+    _rewarded_action: int = -1
+    _terminal_reward: float = 0.0
+    _frames: List[np.ndarray] = None
+    _frame_index: int = 0
+    _current_step: int = 0
+    _total_reward: float = 0.0
+
+    # public member functions
+
+    def __init__(self):
+        """
+        Default constructor.
+        """
+        super(SyntheticGame, self).__init__()
+
+    @overrides
+    def init(self) -> None:
+        """
+        # see : IGame.init()
+        """
+        super(SyntheticGame, self).init()
+        self._frames = self._generate_frames()
+        self._initialized = True
+
+    @overrides
+    def process_ticks(self, num_of_ticks: int) -> None:
+        """
+        The ticks are costing the same as the steps, but they are not counted into the episode length.
+
+        # see : IGame.process_ticks(num_of_ticks)
+        """
+        for _ in range(num_of_ticks):
+            self._simulate_step_cost()
+            self._current_observation = self._next_observation()
+
+    @overrides
+    def reset(self) -> IObservation:
+        """
+        # see : IGame.reset()
+        """
+        self._init_check()
+        self._current_step = 0
+        self._total_reward = 0.0
+        self._frame_index = 0
+        self._current_observation = self._next_observation()
+        return self._current_observation
+
+    @overrides
+    def is_episode_finished(self) -> bool:
+        """
+        # see : IGame.is_episode_finished()
+        """
+        return self._current_step >= self._episode_length
+
+    @overrides
+    def get_observation_space_desc(self) -> Collection[ITensorDescriptor]:
+        """
+        # see : IGame.get_observation_space_desc()
+        """
+        self._init_check()
+        if self._observation_space_desc is None:
+            self._observation_space_desc = []
+            self._observation_space_desc.append(
+                TensorDescriptor(display_name=SCREEN_BUFFER,
+                                 data_type=self._screen_dtype.type,
+                                 tensor_shape=self._screen_shape,
+                                 input_type=NetworkInputType.IMG))
+        return self._observation_space_desc
+
+    @overrides
+    def get_total_score(self):
+        """
+        # see : IGame.get_total_score()
+        """
+        return self._total_reward
+
+    # protected member functions
+
+    @overrides
+    def _make_action(self, action: Action) -> Tuple[IObservation, float]:
+        """
+        # see : Game._make_action(action)
+        """
+        self._simulate_step_cost()
+        self._current_step += 1
+        reward = 0.0
+        if self._rewarded_action < 0 or self._rewarded_action == self._get_action_index(action):
+            reward = self._step_reward
+        if self._current_step >= self._episode_length:
+            reward += self._terminal_reward
+        self._total_reward += reward
+        self._current_observation = self._next_observation()
+        return self._current_observation, reward
+
+    @overrides
+    def _build_actions_space_desc(self):
+        """
+        # see : Game._build_actions_space_desc()
+        """
+        return TensorDescriptor(display_name=ACTION_SPACE,
+                                data_type=np.int32,
+                                tensor_shape=(self._action_space_size,),
+                                input_type=NetworkInputType.NONE)
+
+    @overrides
+    def _init_config(self) -> None:
+        """
+        # see : Game._init_config()
+        """
+        prop = SyntheticGameConfigurationProperty
+        self._screen_shape = (self._config_handler.get_config_property(prop.SYNTHETIC_SCREEN_WEIGHT,
+                                                                       prop.SYNTHETIC_SCREEN_WEIGHT.prop_type),
+                              self._config_handler.get_config_property(prop.SYNTHETIC_SCREEN_HEIGHT,
+                                                                       prop.SYNTHETIC_SCREEN_HEIGHT.prop_type),
+                              self._config_handler.get_config_property(prop.SYNTHETIC_SCREEN_CHANNELS,
+                                                                       prop.SYNTHETIC_SCREEN_CHANNELS.prop_type))
+        self._screen_dtype = np.dtype(self._config_handler.get_config_property(
+            prop.SYNTHETIC_SCREEN_DTYPE, prop.SYNTHETIC_SCREEN_DTYPE.prop_type))
+        self._frame_pool_size = self._config_handler.get_config_property(
+            prop.SYNTHETIC_FRAME_POOL_SIZE, prop.SYNTHETIC_FRAME_POOL_SIZE.prop_type)
+        self._seed = self._config_handler.get_config_property(
+            prop.SYNTHETIC_SEED, prop.SYNTHETIC_SEED.prop_type)
+        self._episode_length = self._config_handler.get_config_property(
+            prop.SYNTHETIC_EPISODE_LENGTH, prop.SYNTHETIC_EPISODE_LENGTH.prop_type)
+        self._step_cost = self._config_handler.get_config_property(
+            prop.SYNTHETIC_STEP_COST, prop.SYNTHETIC_STEP_COST.prop_type) / 1000.0
+        self._action_space_size = self._config_handler.get_config_property(
+            prop.SYNTHETIC_ACTION_SPACE_SIZE, prop.SYNTHETIC_ACTION_SPACE_SIZE.prop_type)
+        self._step_reward = self._config_handler.get_config_property(
+            prop.SYNTHETIC_STEP_REWARD, prop.SYNTHETIC_STEP_REWARD.prop_type)
+        self._rewarded_action = self._config_handler.get_config_property(
+            prop.SYNTHETIC_REWARDED_ACTION, prop.SYNTHETIC_REWARDED_ACTION.prop_type)
+        self._terminal_reward = self._config_handler.get_config_property(
+            prop.SYNTHETIC_TERMINAL_REWARD, prop.SYNTHETIC_TERMINAL_REWARD.prop_type)
+        if min(self._screen_shape) < 1:
+            raise ValueError("The screen dimensions must be positive.")
+        if self._episode_length < 1:
+            raise ValueError("The episode length must be positive.")
+        if self._action_space_size < 1:
+            raise ValueError("The action space size must be positive.")
+        if self._rewarded_action >= self._action_space_size:
+            raise ValueError("The rewarded action is out of the action space.")
+
+    def _generate_frames(self) -> List[np.ndarray]:
+        """
+        Generates the (read only) frames of the pool, with the configured seed.
+
+        :returns
+            list of frames, at least one
+        """
+        generator = np.random.default_rng(self._seed)
+        frames = []
+        for _ in range(max(1, self._frame_pool_size)):
+            if np.issubdtype(self._screen_dtype, np.integer):
+                frame = generator.integers(0, min(256, np.iinfo(self._screen_dtype).max + 1),
+                                           size=self._screen_shape, dtype=self._screen_dtype)
+            else:
+                frame = generator.random(size=self._screen_shape).astype(self._screen_dtype)
+            frame.flags.writeable = False
+            frames.append(frame)
+        return frames
+
+    def _next_observation(self) -> IObservation:
+        """
+        Serves the next frame of the pool, or a new copy of it if the pool is disabled.
+        """
+        frame = self._frames[self._frame_index]
+        self._frame_index = (self._frame_index + 1) % len(self._frames)
+        if self._frame_pool_size <= 0:
+            frame = frame.copy()
+        return DummyObservation(frame)
+
+    def _simulate_step_cost(self) -> None:
+        """
+        Busy waiting for the configured step cost (keeps the core busy, like an emulator would).
+        """
+        if self._step_cost > 0.0:
+            deadline = time.perf_counter() + self._step_cost
+            while time.perf_counter() < deadline:
+                pass
+
+    @staticmethod
+    def _get_action_index(action: Action) -> int:
+        """
+        Index of the discrete action, either a plain index or an one-hot encoded vector.
+        """
+        if np.ndim(action) == 0:
+            return int(action)
+        return int(np.argmax(action))
@@ -25,6 +25,8 @@ class OpenAIObservation(IObservation):
     Mostly openai games have a Box (ArrayLike) observation.
     """
 
+    __slots__ = ("_observation_id", "ram_vector", "screen_buffer")
+
     # public member functions
 
     def __init__(self, game_state: np.ndarray, network_input: NetworkInputType):
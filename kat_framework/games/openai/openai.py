@@ -110,6 +110,11 @@ class OpenAI(Game, IGame):
         Object initialization.
         """
         super(OpenAI, self).init()
+        if self._max_pooling_enabled and NetworkInputType.IMG == self._game_spec.network_type:
+            # only the max-pooled frames are built by the wrapper, the others are allocated by the environment
+            self._build_observation_buffer_pool(self._game_spec.buffer_name,
+                                                self._game_instance.observation_space.shape,
+                                                self._game_instance.observation_space.dtype)
         self._initialized = True
 
     @overrides
@@ -118,7 +123,7 @@ class OpenAI(Game, IGame):
         # see : IGame.process_ticks(num_of_ticks)
         """
         if num_of_ticks > 0:
-            [self.make_action(self.last_action) for i in range(num_of_ticks)]
+            self._repeat_action(self.last_action, num_of_ticks)
 
     @overrides
     def reset(self) -> IObservation:
@@ -196,6 +201,36 @@ class OpenAI(Game, IGame):
             self._game_instance.render()
         return self._current_observation, reward
 
+    @overrides
+    def _repeat_action(self, action: Action, num_of_repeats: int) -> Tuple[IObservation, float]:
+        """
+        Steps the environment directly, only the last observation is built and rendered.
+        Image observations are max-pooled over the last two frames, if it is enabled.
+
+        # see Game._repeat_action(action, num_of_repeats)
+        """
+        max_pooling = self._max_pooling_enabled and NetworkInputType.IMG == self._game_spec.network_type
+        previous_observation, observation, total_reward = None, None, 0.0
+        for i in range(num_of_repeats):
+            if max_pooling:
+                previous_observation = observation
+            observation, reward, self.done, _ = self._game_instance.step(action)
+            total_reward += reward
+            if self.done:
+                break
+        self._total_reward += total_reward
+        if observation is not None:
+            if previous_observation is not None:
+                buffer = None if self._observation_buffer_pool is None else self._observation_buffer_pool.acquire()
+                observation = np.maximum(previous_observation, observation, out=buffer)
+            self._current_observation = OpenAIObservation(observation, self._game_spec.network_type)
+        else:
+            self._current_observation = None
+        self.last_action = action
+        if self._render_enabled:
+            self._game_instance.render()
+        return self._current_observation, total_reward
+
     @overrides
     def _build_actions_space_desc(self):
         """
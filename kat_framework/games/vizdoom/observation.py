@@ -13,36 +13,58 @@
 # Copyright (C) 2020-2021 d33are                 #
 ##################################################
 
+from typing import Optional, AbstractSet
 from kat_api import IObservation
 from overrides import overrides
 from vizdoom.vizdoom import GameState
 
+# observation field name -> zDoom game state attribute name
+GAME_STATE_FIELDS = {
+    "screen_buffer": "screen_buffer",
+    "game_variables": "game_variables",
+    "depth_buffer": "depth_buffer",
+    "label_buffer": "labels_buffer",
+    "automap_buffer": "automap_buffer",
+    "game_labels": "labels",
+    "game_objects": "objects",
+    "game_sectors": "sectors"
+}
+
 
 class DoomObservation(IObservation):
     """
     `IObservation implementation for zDoom.
 
-    All game buffer is mapped to a python buffer.
+    The game buffers are mapped to python buffers lazily, on the first access of the field. If the observed
+    fields are specified, then only those are available (the others are raising `AttributeError`).
     """
 
-    def __init__(self, game_state: GameState):
+    __slots__ = ("_observation_id", "_game_state", "_observed_fields", "screen_buffer", "game_variables",
+                 "depth_buffer", "label_buffer", "automap_buffer", "game_labels", "game_objects", "game_sectors")
+
+    def __init__(self, game_state: GameState, observed_fields: Optional[AbstractSet[str]] = None):
         """
         Default constructor.
 
         :param game_state:
             current game state from zDoom
+        :param observed_fields:
+            names of the fetchable fields (see: `GAME_STATE_FIELDS`), or None for all of them
         """
         if game_state is None:
             raise ValueError("No state specified.")
         self._observation_id = game_state.number
-        self.screen_buffer = game_state.screen_buffer
-        self.game_variables = game_state.game_variables
-        self.depth_buffer = game_state.depth_buffer
-        self.label_buffer = game_state.labels_buffer
-        self.automap_buffer = game_state.automap_buffer
-        self.game_labels = game_state.labels
-        self.game_objects = game_state.objects
-        self.game_sectors = game_state.sectors
+        self._game_state = game_state
+        self._observed_fields = observed_fields
+
+    def __getattr__(self, name: str):
+        # only called for the not yet fetched fields
+        attribute = GAME_STATE_FIELDS.get(name)
+        if attribute is None or (self._observed_fields is not None and name not in self._observed_fields):
+            raise AttributeError("'{}' object has no attribute '{}'".format(self.__class__.__name__, name))
+        value = getattr(self._game_state, attribute)
+        setattr(self, name, value)
+        return value
 
     def __eq__(self, other):
         if isinstance(other, DoomObservation):
@@ -12,12 +12,13 @@
 # General Video Game AI                          #
 # Copyright (C) 2020-2021 d33are                 #
 ##################################################
-from typing import Collection
+from typing import Collection, Optional, FrozenSet
 
 from kat_framework.games.base import Game
-from kat_framework.config.config_props import ViZDoomConfigurationProperty
+from kat_framework.config.config_props import ViZDoomConfigurationProperty, GameConfigurationProperty, \
+    AgentConfigurationProperty
 from kat_framework.core.descriptors import TensorDescriptor
-from kat_framework.games.vizdoom.observation import DoomObservation
+from kat_framework.games.vizdoom.observation import DoomObservation, GAME_STATE_FIELDS
 from kat_api import IGame, ITensorDescriptor, IObservation, NetworkInputType
 from kat_typing import Action
 from vizdoom.vizdoom import DoomGame, AMMO2, HEALTH, KILLCOUNT
@@ -27,6 +28,16 @@ import numpy as np
 
 CONFIGURATION_ATTRIBUTE_ERROR_MSG = "ViZDoom has no attribute named: %s"
 SET_ATTRIBUTE_PREFIX = "set_"
+UNKNOWN_OBSERVATION_FIELD_ERROR_MSG = "ViZDoom observation has no field named: %s"
+
+# engine buffer switch -> observation fields rendered by it
+ENGINE_BUFFER_SWITCHES = {
+    "set_depth_buffer_enabled": ("depth_buffer",),
+    "set_labels_buffer_enabled": ("label_buffer", "game_labels"),
+    "set_automap_buffer_enabled": ("automap_buffer",),
+    "set_objects_info_enabled": ("game_objects",),
+    "set_sectors_info_enabled": ("game_sectors",)
+}
 
 
 class ViZDoomGame(Game, IGame):
@@ -40,6 +51,7 @@ class ViZDoomGame(Game, IGame):
     _last_ammo_2: int = 0
     _last_kill_count: int = 0
     _last_health: int = 0
+    _observed_fields: Optional[FrozenSet[str]] = None
 
     # public member functions
 
@@ -49,6 +61,16 @@ class ViZDoomGame(Game, IGame):
         """
         super(ViZDoomGame, self).__init__()
         self._game_instance = DoomGame()
+        selective_observation_enabled = self._config_handler.get_config_property(
+            GameConfigurationProperty.SELECTIVE_OBSERVATION_ENABLED,
+            GameConfigurationProperty.SELECTIVE_OBSERVATION_ENABLED.prop_type)
+        if selective_observation_enabled:
+            input_observation_name = self._config_handler.get_config_property(
+                AgentConfigurationProperty.INPUT_OBSERVATION_NAME,
+                AgentConfigurationProperty.INPUT_OBSERVATION_NAME.prop_type)
+            if input_observation_name not in GAME_STATE_FIELDS:
+                raise ValueError(UNKNOWN_OBSERVATION_FIELD_ERROR_MSG % input_observation_name)
+            self._observed_fields = frozenset([input_observation_name])
 
     @overrides
     def init(self) -> None:
@@ -66,7 +88,7 @@ class ViZDoomGame(Game, IGame):
         """
         self._game_instance.new_episode()
         initial_state = self._game_instance.get_state()
-        self._current_observation = DoomObservation(initial_state)
+        self._current_observation = DoomObservation(initial_state, self._observed_fields)
         return self._current_observation
 
     @overrides
@@ -89,12 +111,15 @@ class ViZDoomGame(Game, IGame):
         """
         # see : IGame.get_observation_space_desc()
 
-        Currently we are filtering out non array like buffers.
+        Currently we are filtering out non array like buffers, and the not observed ones.
         """
         self._init_check()
         if self._observation_space_desc is None:
             self._observation_space_desc = []
             dummy_state = self._game_instance.get_state()
+            observed_state_attributes = None
+            if self._observed_fields is not None:
+                observed_state_attributes = [GAME_STATE_FIELDS[f] for f in self._observed_fields]
             observed_attributes = \
                 filter(lambda a:
                        not a.startswith('__')
@@ -103,7 +128,9 @@ class ViZDoomGame(Game, IGame):
                        and not a.startswith('labels')
                        and not a.startswith('objects')
                        and not a.startswith('sectors')
-                       and not callable(getattr(dummy_state, a)), dir(dummy_state))
+                       and not callable(getattr(dummy_state, a))
+                       and (observed_state_attributes is None or a in observed_state_attributes),
+                       dir(dummy_state))
             for attr in observed_attributes:
                 tensor = np.array(getattr(dummy_state, attr))
                 self._observation_space_desc.append(TensorDescriptor(display_name=attr,
@@ -134,6 +161,8 @@ class ViZDoomGame(Game, IGame):
                 getattr(self._game_instance, SET_ATTRIBUTE_PREFIX + config_property.label)(config_value)
             except (AttributeError, TypeError):
                 self._log.warning(CONFIGURATION_ATTRIBUTE_ERROR_MSG, config_property.label)
+        if self._observed_fields is not None:
+            self._disable_unused_buffers()
 
     @overrides
     def _make_action(self, action: Action) -> Tuple[IObservation, float]:
@@ -145,6 +174,19 @@ class ViZDoomGame(Game, IGame):
         self._update_variables()
         return self._current_observation, reward
 
+    @overrides
+    def _repeat_action(self, action: Action, num_of_repeats: int) -> Tuple[IObservation, float]:
+        """
+        ViZDoom repeats the action natively (skipping the rendering of the intermediate tics), and
+        accumulates the rewards. The intermediate frames are not available, so there is no max-pooling.
+
+        # see : Game._repeat_action(action, num_of_repeats)
+        """
+        reward = self._game_instance.make_action(action, num_of_repeats)
+        self._update_current_observation()
+        self._update_variables()
+        return self._current_observation, reward
+
     @overrides
     def _build_actions_space_desc(self):
         """
@@ -161,7 +203,15 @@ class ViZDoomGame(Game, IGame):
         """
         observation = self._game_instance.get_state()
         if observation is not None:
-            self._current_observation = DoomObservation(observation)
+            self._current_observation = DoomObservation(observation, self._observed_fields)
+
+    def _disable_unused_buffers(self) -> None:
+        """
+        Turns off the engine buffers which are not rendering any of the observed fields (costs time per tick).
+        """
+        for switch, fields in ENGINE_BUFFER_SWITCHES.items():
+            if self._observed_fields.isdisjoint(fields):
+                getattr(self._game_instance, switch)(False)
 
     def _update_variables(self) -> None:
         """
@@ -14,7 +14,7 @@
 ##################################################
 
 from kat_api import IReadOnlyMemory, IReplayMemory
-from kat_typing import IterableDataset
+from kat_typing import IterableDataset, Tensor
 from kat_framework.util import logger
 
 
@@ -57,3 +57,9 @@ class MemoryAccessor(IReadOnlyMemory):
             iterable dataset instance
         """
         return self._replay_memory.as_iterable_dataset(input_context)
+
+    def update_target_q_values(self, indices: Tensor, values: Tensor, version: int) -> None:
+        """
+        # see : IReadOnlyMemory.update_target_q_values(indices, values, version)
+        """
+        self._replay_memory.update_target_q_values(indices, values, version)
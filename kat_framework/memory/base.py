@@ -19,6 +19,9 @@ from abc import ABCMeta, abstractmethod
 from typing import Tuple
 from kat_framework.util import tensors
 import numpy as np
+import os
+
+STATE_FILE_NAME = "replay_memory.npz"
 
 
 class BaseMemory(metaclass=ABCMeta):
@@ -128,6 +131,66 @@ class BaseMemory(metaclass=ABCMeta):
             raise ValueError("s2 state input vs s2 state spec mismatch")
         return self._add_transition(s1_state, action_idx, s2_state, reward, is_end_state)
 
+    def add_transitions(self,
+                        s1_states: Tensor,
+                        action_ids: Tensor,
+                        s2_states: Tensor,
+                        rewards: Tensor,
+                        end_states: Tensor) -> None:
+        """
+        Adds a batch of transitions to the specified buffers.
+
+        # see : IReplayMemory.add_transitions()
+        """
+        if not tensors.check_same_tensor_structure(s1_states, self._s1_states_spec, reduce_batch_dim=True):
+            raise ValueError("s1 states input vs s1 state spec mismatch")
+        if not tensors.check_same_tensor_structure(s2_states, self._s2_states_spec, reduce_batch_dim=True):
+            raise ValueError("s2 states input vs s2 state spec mismatch")
+        batch_size = len(s1_states)
+        if not (batch_size == len(action_ids) == len(s2_states) == len(rewards) == len(end_states)):
+            raise ValueError("Batch dimension mismatch between the transition buffers.")
+        if batch_size == 0:
+            return
+        return self._add_transitions(s1_states, action_ids, s2_states, rewards, end_states)
+
+    def save_state(self, directory: str) -> None:
+        """
+        Saves the buffers (uncompressed) and the write position into one file.
+
+        # see : IReplayMemory.save_state(directory)
+        """
+        if directory is None:
+            raise ValueError("No directory specified.")
+        np.savez(os.path.join(directory, STATE_FILE_NAME),
+                 deep=np.asarray(self._deep, dtype=np.int64),
+                 s1_states=self._s1_states,
+                 action_ids=self._action_ids,
+                 s2_states=self._s2_states,
+                 rewards=self._rewards,
+                 terminals=self._terminals)
+
+    def restore_state(self, directory: str) -> None:
+        """
+        Restores the buffers into the already allocated ones.
+
+        # see : IReplayMemory.restore_state(directory)
+        """
+        if directory is None:
+            raise ValueError("No directory specified.")
+        with np.load(os.path.join(directory, STATE_FILE_NAME)) as state:
+            buffers = ((self._s1_states, state["s1_states"]),
+                       (self._action_ids, state["action_ids"]),
+                       (self._s2_states, state["s2_states"]),
+                       (self._rewards, state["rewards"]),
+                       (self._terminals, state["terminals"]))
+            for buffer, saved_buffer in buffers:
+                if buffer.shape != saved_buffer.shape:
+                    raise ValueError("Saved buffer {} vs memory layout {} mismatch."
+                                     .format(saved_buffer.shape, buffer.shape))
+            for buffer, saved_buffer in buffers:
+                buffer[...] = saved_buffer
+            self._deep = int(state["deep"])
+
     # protected member functions
 
     @abstractmethod
@@ -152,3 +215,16 @@ class BaseMemory(metaclass=ABCMeta):
             is end state or not
         """
         pass
+
+    @abstractmethod
+    def _add_transitions(self,
+                         s1_states: Tensor,
+                         action_ids: Tensor,
+                         s2_states: Tensor,
+                         rewards: Tensor,
+                         end_states: Tensor) -> None:
+        """
+        Abstract method for derived classes, batched version of `_add_transition`.
+        The arguments are already checked.
+        """
+        pass
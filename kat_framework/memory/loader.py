@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_api import IReplayMemory
+from kat_framework.serialization.trajectory import TrajectoryReader, OBSERVATION_KEY_PREFIX, ACTION_KEY
+from kat_framework.serialization.trajectory import REWARD_KEY, TERMINAL_KEY, RECORD_TYPE_KEY
+from kat_framework.serialization.trajectory import INITIAL_RECORD, FINAL_RECORD
+from kat_framework.util import logger
+from typing import Callable, Dict, Optional, Tuple
+from logging import Logger
+from time import perf_counter
+import numpy as np
+
+TAIL_KEYS = ("frames", "positions", "actions", "rewards", "terminals", "record_types")
+
+
+class TrajectoryMemoryLoader:
+    """
+    Bulk loads recorded trajectories (see: `TrajectoryRecorder`) into a replay memory.
+
+    The shards are streamed in chunks, the frames of a chunk are preprocessed at once, the frame
+    stacks are built with slice writes (episode aware, zero frames before the first one, like the
+    agents' frame buffers), and the transitions are added with one `add_transitions` call per chunk.
+    The last records of a chunk are carried over to the next one, so the chunk and shard boundaries
+    are transparent. The transitioned state is the next recorded (acted) observation, it means the
+    ticks between the actions are part of the transition.
+    """
+
+    # protected members
+
+    _log: Logger = None
+    _memory: IReplayMemory = None
+    _observation_name: str = None
+    _number_of_stacked_frames: int = 1
+    _chunk_size: int = 0
+    _pre_process: Optional[Callable[[np.ndarray], np.ndarray]] = None
+    _to_action_ids: Optional[Callable[[np.ndarray], np.ndarray]] = None
+    _tail: Optional[Dict[str, np.ndarray]] = None
+
+    # public member functions
+
+    def __init__(self,
+                 memory: IReplayMemory,
+                 observation_name: str,
+                 number_of_stacked_frames: int = 1,
+                 chunk_size: int = 1024,
+                 pre_process: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+                 to_action_ids: Optional[Callable[[np.ndarray], np.ndarray]] = None):
+        """
+        Default constructor.
+
+        :param memory:
+            the initialized replay memory
+        :param observation_name:
+            name of the recorded observation field, the memory is filled with
+        :param number_of_stacked_frames:
+            number of frames stacked along the last axis (1: no stacking)
+        :param chunk_size:
+            maximum number of records processed at once
+        :param pre_process:
+            batched frame preprocessing (raw frames -> memory layout), or None if the recorded frames
+            are already in the memory layout
+        :param to_action_ids:
+            batched mapping of the recorded actions to action ids, or None if they are the ids
+        """
+        if memory is None:
+            raise ValueError("No memory specified.")
+        if observation_name is None:
+            raise ValueError("No observation name specified.")
+        if number_of_stacked_frames < 1 or chunk_size < 1:
+            raise ValueError("The number of stacked frames and the chunk size must be positive.")
+        self._log = logger.get_logger(self.__class__.__name__)
+        self._memory = memory
+        self._observation_name = observation_name
+        self._number_of_stacked_frames = number_of_stacked_frames
+        self._chunk_size = chunk_size
+        self._pre_process = pre_process
+        self._to_action_ids = to_action_ids
+
+    def load(self, directory: str, max_transitions: Optional[int] = None) -> Tuple[int, float]:
+        """
+        Loads the transitions of a recording into the memory.
+
+        :param directory:
+            directory of the recorded shards
+        :param max_transitions:
+            the loading stops after this many transitions (None: all of them)
+        :returns
+            number of the loaded transitions, and the load throughput (transitions/sec)
+        """
+        reader = TrajectoryReader(directory)
+        if self._observation_name not in [d.get_display_name() for d in reader.get_observation_space_desc()]:
+            raise ValueError("No recorded observation named {} in {}.".format(self._observation_name, directory))
+        self._tail = None
+        number_of_transitions = 0
+        start = perf_counter()
+        for shard in reader.iterate_shards():
+            observations = shard[OBSERVATION_KEY_PREFIX + self._observation_name]
+            for offset in range(0, len(observations), self._chunk_size):
+                chunk = slice(offset, offset + self._chunk_size)
+                number_of_transitions += self._load_chunk(observations[chunk],
+                                                          shard[ACTION_KEY][chunk],
+                                                          shard[REWARD_KEY][chunk],
+                                                          shard[TERMINAL_KEY][chunk],
+                                                          shard[RECORD_TYPE_KEY][chunk],
+                                                          max_transitions, number_of_transitions)
+                if max_transitions is not None and number_of_transitions >= max_transitions:
+                    break
+            if max_transitions is not None and number_of_transitions >= max_transitions:
+                break
+        self._tail = None
+        elapsed_time = perf_counter() - start
+        throughput = number_of_transitions / max(elapsed_time, 1e-9)
+        self._log.info("%d transitions loaded from %s in %.2f sec (%.1f transitions/sec).",
+                       number_of_transitions, directory, elapsed_time, throughput)
+        return number_of_transitions, throughput
+
+    def add_records(self,
+                    observations: np.ndarray,
+                    actions: np.ndarray,
+                    rewards: np.ndarray,
+                    terminals: np.ndarray,
+                    record_types: np.ndarray) -> int:
+        """
+        Adds a chunk of in-memory records (in the recorded layout, see: `TrajectoryRecorder.record`),
+        continuing the records of the previous call. The arrays must not be modified later, the last
+        records are carried over to the next call.
+
+        :param observations:
+            the raw frames of the records
+        :param actions:
+            the taken actions
+        :param rewards:
+            the rewards
+        :param terminals:
+            the terminal flags
+        :param record_types:
+            the record types
+        :returns
+            number of the added transitions
+        """
+        return self._load_chunk(observations, actions, rewards, terminals, record_types, None, 0)
+
+    def reset(self) -> None:
+        """
+        Drops the carried over records, the next records are not continuing the previous ones.
+        """
+        self._tail = None
+
+    # protected member functions
+
+    def _load_chunk(self,
+                    observations: np.ndarray,
+                    actions: np.ndarray,
+                    rewards: np.ndarray,
+                    terminals: np.ndarray,
+                    record_types: np.ndarray,
+                    max_transitions: Optional[int],
+                    loaded_transitions: int) -> int:
+        """
+        Adds the transitions of a chunk (and the carried over records) to the memory.
+
+        :returns
+            number of the added transitions
+        """
+        frames = observations if self._pre_process is None else self._pre_process(observations)
+        # steps since the beginning of the episode
+        positions = np.empty((len(record_types),), dtype=np.int64)
+        position = -1 if self._tail is None else int(self._tail["positions"][-1])
+        for i, record_type in enumerate(record_types):
+            position = 0 if INITIAL_RECORD == record_type else position + 1
+            positions[i] = position
+        records = {"frames": frames, "positions": positions, "actions": actions, "rewards": rewards,
+                   "terminals": terminals, "record_types": record_types}
+        first = 0
+        if self._tail is not None:
+            first = len(self._tail["positions"]) - 1
+            records = {key: np.concatenate((self._tail[key], records[key])) for key in TAIL_KEYS}
+        # an acted record with its next record, which is from the same episode
+        indices = np.arange(first, len(records["positions"]) - 1)
+        indices = indices[(records["record_types"][indices] != FINAL_RECORD)
+                          & (records["record_types"][indices + 1] != INITIAL_RECORD)]
+        if max_transitions is not None:
+            indices = indices[:max(0, max_transitions - loaded_transitions)]
+        self._tail = {key: records[key][-self._number_of_stacked_frames:] for key in TAIL_KEYS}
+        if len(indices) == 0:
+            return 0
+        action_ids = records["actions"][indices]
+        if self._to_action_ids is not None:
+            action_ids = self._to_action_ids(action_ids)
+        self._memory.add_transitions(self._stack_frames(records, indices),
+                                     action_ids,
+                                     self._stack_frames(records, indices + 1),
+                                     records["rewards"][indices],
+                                     records["terminals"][indices])
+        return len(indices)
+
+    def _stack_frames(self, records: Dict[str, np.ndarray], indices: np.ndarray) -> np.ndarray:
+        """
+        Frame stacks of the specified records, the frames before the episode are zeros.
+        """
+        frames = records["frames"]
+        if self._number_of_stacked_frames == 1:
+            return frames[indices]
+        channels = frames.shape[-1]
+        stacks = np.zeros((len(indices), *frames.shape[1:-1], channels * self._number_of_stacked_frames),
+                          dtype=frames.dtype)
+        positions = records["positions"][indices]
+        for slot in range(self._number_of_stacked_frames):
+            distance = self._number_of_stacked_frames - 1 - slot
+            valid = positions >= distance
+            stacks[valid, ..., slot * channels:(slot + 1) * channels] = frames[indices[valid] - distance]
+        return stacks
@@ -21,8 +21,11 @@ from typing import Tuple, List
 from overrides import overrides
 from logging import Logger
 import numpy as np
+import threading
 import uuid
 
+NO_TARGET_Q_VERSION = -1
+
 
 class UniformMemory(BaseMemory, IReplayMemory):
     """
@@ -35,6 +38,11 @@ class UniformMemory(BaseMemory, IReplayMemory):
 
     _log: Logger = None
     _transition_ids: List = None
+    _slot_serials: np.ndarray = None
+    _target_q_values: np.ndarray = None
+    _target_q_versions: np.ndarray = None
+    # guards the slots (transitions, serial numbers and cached target Q values) against the sampler thread
+    _slot_lock: threading.Lock = None
 
     # public member functions
 
@@ -53,6 +61,25 @@ class UniformMemory(BaseMemory, IReplayMemory):
         """
         super(UniformMemory, self).init(buffer_spec)
         self._transition_ids = [None] * self._max_capacity
+        self._slot_serials = self._build_restored_serials()
+        self._target_q_values = np.zeros((self._max_capacity,), dtype=np.float32)
+        self._target_q_versions = np.full((self._max_capacity,), NO_TARGET_Q_VERSION, dtype=np.int64)
+        self._slot_lock = threading.Lock()
+
+    @overrides
+    def restore_state(self, directory: str) -> None:
+        """
+        The transition ids are not saved, the restored transitions are getting new ones.
+
+        # see : BaseMemory.restore_state(directory)
+        """
+        with self._slot_lock:
+            super(UniformMemory, self).restore_state(directory)
+            number_of_transitions = min(self._deep, self._max_capacity)
+            self._transition_ids = [str(uuid.uuid1()) if i < number_of_transitions else None
+                                    for i in range(self._max_capacity)]
+            self._slot_serials = self._build_restored_serials()
+            self._target_q_versions[:] = NO_TARGET_Q_VERSION
 
     @overrides
     def as_iterable_dataset(self, input_context: object = None) -> IterableDataset:
@@ -77,10 +104,59 @@ class UniformMemory(BaseMemory, IReplayMemory):
         """
         # see : IReplayMemory.get_sample(sample_size)
         """
+        return self._get_sample(self._sample_indices(sample_size))
+
+    def get_sample_with_target_q(self, sample_size: int) -> Tuple[np.ndarray, ...]:
+        """
+        Sampling the buffer, with the sampled transitions' serial numbers and cached max target Q values.
+
+        :param sample_size:
+            sample size
+        :return:
+            a tuple of 8 (s1_states, action_ids, s2_states, rewards, terminals, serials, target_q_values,
+            target_q_versions), the version is -1 if the value was never computed or the slot was overwritten
+        """
+        # the transitions and their serial numbers are read together, a slot can't be overwritten in between
+        with self._slot_lock:
+            batch_index = self._sample_indices(sample_size)
+            sample = self._get_sample(batch_index)
+            serials = self._slot_serials[batch_index]
+            target_q_values = self._target_q_values[batch_index]
+            target_q_versions = self._target_q_versions[batch_index]
+        return (*sample, serials, target_q_values, target_q_versions)
+
+    def update_target_q_values(self, indices: np.ndarray, values: np.ndarray, version: int) -> None:
+        """
+        The indices are the transitions' serial numbers, the values of the slots overwritten since
+        their sampling are dropped.
+
+        # see : IReadOnlyMemory.update_target_q_values(indices, values, version)
+        """
+        slots = np.asarray(indices) % self._max_capacity
+        with self._slot_lock:
+            is_current = self._slot_serials[slots] == indices
+            self._target_q_values[slots[is_current]] = np.asarray(values)[is_current]
+            self._target_q_versions[slots[is_current]] = version
+
+    # protected member functions
+
+    def _sample_indices(self, sample_size: int) -> np.ndarray:
+        """
+        Uniform sampling of the filled slots, without replacement.
+        """
         max_batch_size = min(self._deep, self._max_capacity)
         if max_batch_size == 0:
             max_batch_size = sample_size
-        batch_index = np.random.choice(max_batch_size, sample_size, replace=False)
+        return np.random.choice(max_batch_size, sample_size, replace=False)
+
+    def _get_sample(self, batch_index: np.ndarray) -> Tuple[np.ndarray,
+                                                           np.ndarray,
+                                                           np.ndarray,
+                                                           np.ndarray,
+                                                           np.ndarray]:
+        """
+        Gathers the transitions of the specified slots.
+        """
         s1_samples = self._s1_states[batch_index]
         a_samples = self._action_ids[batch_index]
         s2_samples = self._s2_states[batch_index]
@@ -88,8 +164,6 @@ class UniformMemory(BaseMemory, IReplayMemory):
         t_samples = self._terminals[batch_index]
         return s1_samples, a_samples, s2_samples, r_samples, t_samples
 
-    # protected member functions
-
     @overrides
     def _add_transition(self,
                         s1_state: Tensor,
@@ -101,11 +175,53 @@ class UniformMemory(BaseMemory, IReplayMemory):
         # see : BaseMemory._add_transition()
         """
         transition_id = str(uuid.uuid1())
-        circular_index = self._deep % self._max_capacity
-        self._transition_ids[circular_index] = transition_id
-        self._s1_states[circular_index] = s1_state
-        self._action_ids[circular_index] = action_idx
-        self._s2_states[circular_index] = s2_state
-        self._rewards[circular_index] = reward
-        self._terminals[circular_index] = is_end_state
-        self._deep += 1
+        with self._slot_lock:
+            circular_index = self._deep % self._max_capacity
+            self._slot_serials[circular_index] = self._deep
+            self._target_q_versions[circular_index] = NO_TARGET_Q_VERSION
+            self._transition_ids[circular_index] = transition_id
+            self._s1_states[circular_index] = s1_state
+            self._action_ids[circular_index] = action_idx
+            self._s2_states[circular_index] = s2_state
+            self._rewards[circular_index] = reward
+            self._terminals[circular_index] = is_end_state
+            self._deep += 1
+
+    @overrides
+    def _add_transitions(self,
+                         s1_states: Tensor,
+                         action_ids: Tensor,
+                         s2_states: Tensor,
+                         rewards: Tensor,
+                         end_states: Tensor) -> None:
+        """
+        One vectorized write per buffer, wrapping around the circular buffer.
+
+        # see : BaseMemory._add_transitions()
+        """
+        batch_size = len(s1_states)
+        offset = 0
+        if batch_size > self._max_capacity:
+            # only the last `max capacity` transitions would survive anyway
+            offset = batch_size - self._max_capacity
+        transition_ids = [str(uuid.uuid1()) for _ in range(batch_size - offset)]
+        with self._slot_lock:
+            serials = self._deep + offset + np.arange(batch_size - offset)
+            circular_indices = serials % self._max_capacity
+            self._slot_serials[circular_indices] = serials
+            self._target_q_versions[circular_indices] = NO_TARGET_Q_VERSION
+            for circular_index, transition_id in zip(circular_indices, transition_ids):
+                self._transition_ids[circular_index] = transition_id
+            self._s1_states[circular_indices] = s1_states[offset:]
+            self._action_ids[circular_indices] = action_ids[offset:]
+            self._s2_states[circular_indices] = s2_states[offset:]
+            self._rewards[circular_indices] = rewards[offset:]
+            self._terminals[circular_indices] = end_states[offset:]
+            self._deep += batch_size
+
+    def _build_restored_serials(self) -> np.ndarray:
+        """
+        Serial numbers of the slots, which are not written by this process (negative, so never reused
+        by the writes, but still congruent to the slot's index).
+        """
+        return np.arange(self._max_capacity, dtype=np.int64) - self._max_capacity
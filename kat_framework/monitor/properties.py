@@ -29,3 +29,58 @@ class KatMetrics(TraceableMetric):
     TENSORFLOW_AGENT_EXPLORATION_RATE = ("agent_exploration_rate", tf.float32, None, MetricType.SCALAR)
     # Tensorflow agent total score
     TENSORFLOW_AGENT_TOTAL_SCORE = ("agent_total_score", tf.float32, None, MetricType.SCALAR)
+    # Tensorflow inference server queue depth at each flush
+    TENSORFLOW_INFERENCE_QUEUE_DEPTH = ("inference_queue_depth", tf.float32, None, MetricType.HISTOGRAM)
+    # Tensorflow inference server batch sizes
+    TENSORFLOW_INFERENCE_BATCH_SIZE = ("inference_batch_size", tf.float32, None, MetricType.HISTOGRAM)
+    # Achieved ratio of gradient steps to environment steps (asynchronous training)
+    TENSORFLOW_REPLAY_RATIO = ("replay_ratio", tf.float32, None, MetricType.SCALAR)
+    # Total time (sec) spent by the actor waiting for the learner, per episode
+    TENSORFLOW_ACTOR_WAIT_TIME = ("actor_wait_time", tf.float32, None, MetricType.SCALAR)
+    # Total time (sec) spent by the learner waiting for environment steps, per episode
+    TENSORFLOW_LEARNER_WAIT_TIME = ("learner_wait_time", tf.float32, None, MetricType.SCALAR)
+    # Busy time ratio of the pipelined driver's acting stage (take_action, store_transition), per episode
+    TENSORFLOW_PIPELINE_ACTING_UTILIZATION = ("pipeline_acting_utilization", tf.float32, None, MetricType.SCALAR)
+    # Busy time ratio of the pipelined driver's simulation stage (make_action, process_ticks), per episode
+    TENSORFLOW_PIPELINE_SIMULATION_UTILIZATION = (
+        "pipeline_simulation_utilization", tf.float32, None, MetricType.SCALAR)
+    # Busy time ratio of the pipelined driver's training stage, per episode
+    TENSORFLOW_PIPELINE_TRAINING_UTILIZATION = ("pipeline_training_utilization", tf.float32, None, MetricType.SCALAR)
+    # Mean score of the evaluation episodes
+    TENSORFLOW_EVALUATION_SCORE_MEAN = ("evaluation_score_mean", tf.float32, None, MetricType.SCALAR)
+    # Standard deviation of the evaluation episodes' score
+    TENSORFLOW_EVALUATION_SCORE_STD = ("evaluation_score_std", tf.float32, None, MetricType.SCALAR)
+    # Minimum score of the evaluation episodes
+    TENSORFLOW_EVALUATION_SCORE_MIN = ("evaluation_score_min", tf.float32, None, MetricType.SCALAR)
+    # Maximum score of the evaluation episodes
+    TENSORFLOW_EVALUATION_SCORE_MAX = ("evaluation_score_max", tf.float32, None, MetricType.SCALAR)
+    # Environment steps per second of the evaluation
+    TENSORFLOW_EVALUATION_STEPS_PER_SEC = ("evaluation_steps_per_sec", tf.float32, None, MetricType.SCALAR)
+    # Mean duration (ms) of the IGame.make_action phase, per episode
+    TENSORFLOW_PHASE_MAKE_ACTION_MEAN = ("phase_make_action_mean", tf.float32, None, MetricType.SCALAR)
+    # 99th percentile duration (ms) of the IGame.make_action phase, per episode
+    TENSORFLOW_PHASE_MAKE_ACTION_P99 = ("phase_make_action_p99", tf.float32, None, MetricType.SCALAR)
+    # Mean duration (ms) of the IGame.process_ticks phase, per episode
+    TENSORFLOW_PHASE_PROCESS_TICKS_MEAN = ("phase_process_ticks_mean", tf.float32, None, MetricType.SCALAR)
+    # 99th percentile duration (ms) of the IGame.process_ticks phase, per episode
+    TENSORFLOW_PHASE_PROCESS_TICKS_P99 = ("phase_process_ticks_p99", tf.float32, None, MetricType.SCALAR)
+    # Mean duration (ms) of the observation preprocessing and frame stacking phase, per episode
+    TENSORFLOW_PHASE_PREPROCESS_MEAN = ("phase_preprocess_mean", tf.float32, None, MetricType.SCALAR)
+    # 99th percentile duration (ms) of the observation preprocessing and frame stacking phase, per episode
+    TENSORFLOW_PHASE_PREPROCESS_P99 = ("phase_preprocess_p99", tf.float32, None, MetricType.SCALAR)
+    # Mean duration (ms) of the action selection (policy evaluation) phase, per episode
+    TENSORFLOW_PHASE_PREDICT_MEAN = ("phase_predict_mean", tf.float32, None, MetricType.SCALAR)
+    # 99th percentile duration (ms) of the action selection (policy evaluation) phase, per episode
+    TENSORFLOW_PHASE_PREDICT_P99 = ("phase_predict_p99", tf.float32, None, MetricType.SCALAR)
+    # Mean duration (ms) of the IAgent.store_transition phase, per episode
+    TENSORFLOW_PHASE_STORE_TRANSITION_MEAN = ("phase_store_transition_mean", tf.float32, None, MetricType.SCALAR)
+    # 99th percentile duration (ms) of the IAgent.store_transition phase, per episode
+    TENSORFLOW_PHASE_STORE_TRANSITION_P99 = ("phase_store_transition_p99", tf.float32, None, MetricType.SCALAR)
+    # Mean duration (ms) of the train step phase, per episode
+    TENSORFLOW_PHASE_TRAIN_STEP_MEAN = ("phase_train_step_mean", tf.float32, None, MetricType.SCALAR)
+    # 99th percentile duration (ms) of the train step phase, per episode
+    TENSORFLOW_PHASE_TRAIN_STEP_P99 = ("phase_train_step_p99", tf.float32, None, MetricType.SCALAR)
+    # Number of the watched game calls exceeding the step latency SLO, per episode
+    TENSORFLOW_GAME_SLO_VIOLATIONS = ("game_slo_violations", tf.float32, None, MetricType.SCALAR)
+    # Number of the game restarts (hung or crashed simulator), per episode
+    TENSORFLOW_GAME_RESTARTS = ("game_restarts", tf.float32, None, MetricType.SCALAR)
@@ -21,6 +21,7 @@ from kat_typing import Tensor, Policy, Model, TrainLoss
 from typing import Optional
 from abc import ABCMeta, abstractmethod
 from logging import Logger
+import numpy as np
 
 UNCHECKED_WARN_MSG = "Unchecked input will be fed to the network, assuming unexpected behavior."
 
@@ -43,6 +44,7 @@ class Network(metaclass=ABCMeta):
     _checkpoint_frequency: int = None
     _name: str = None
     _network_output_descriptor: ITensorDescriptor = None
+    _action_input_checked: bool = False
 
     # public member functions
 
@@ -100,13 +102,29 @@ class Network(metaclass=ABCMeta):
             self._log.warning(UNCHECKED_WARN_MSG)
         return self._predict(input_tensor)
 
+    def predict_action(self, input_tensor: Tensor) -> int:
+        """
+        Validates the first argument against `self.input_descriptor` on the first call only,
+        the subsequent calls are going straight to `_predict_action`.
+
+        # see : INetwork.predict_action(input_tensor)
+        """
+        if not self._action_input_checked:
+            if self.input_descriptor is not None:
+                if not tensors.check_same_tensor_structure(input_tensor, self.input_descriptor):
+                    raise RuntimeError("Input structure vs observation mismatch.")
+            else:
+                self._log.warning(UNCHECKED_WARN_MSG)
+            self._action_input_checked = True
+        return self._predict_action(input_tensor)
+
     def train_batch(self, current_episode: Optional[int] = 0, current_step: Optional[int] = 0) -> TrainLoss:
         """
         # see: INetwork.train_batch(current_episode: Optional[int] = 0, current_step: Optional[int] = 0)
         """
         if current_episode % self._checkpoint_frequency == 0 and self._last_checkpoint != current_episode:
             self._last_checkpoint = current_episode
-            self._serializer.save_checkpoint(self._network_model, self._name)
+            self._save_checkpoint()
         return 0
 
     def persist_model(self):
@@ -116,6 +134,48 @@ class Network(metaclass=ABCMeta):
         if self._network_model is not None:
             self._serializer.save_model(self._network_model, self._name)
 
+    def restore_model(self, filepath: str) -> None:
+        """
+        Replaces the model with a persisted one, through the model serializer.
+
+        :param filepath:
+            path of the persisted model
+        """
+        if filepath is None:
+            raise ValueError("No path specified.")
+        model = self._serializer.restore_model(filepath)
+        if model is None:
+            raise RuntimeError("No model restored from {}.".format(filepath))
+        self._network_model = model
+
+    def restore_checkpoint(self, filepath: str) -> None:
+        """
+        Restores the model's weights from a checkpoint, through the model serializer.
+
+        :param filepath:
+            path of the checkpoint
+        """
+        if filepath is None:
+            raise ValueError("No path specified.")
+        if self._network_model is None:
+            raise RuntimeError("No model to restore the checkpoint into.")
+        self._network_model = self._serializer.restore_checkpoint(self._network_model, filepath)
+
+    def save_state(self, directory: str) -> None:
+        """
+        Stateless networks (e.g. random ones) have nothing to save, the trainable
+        implementations must override it.
+
+        # see: INetwork.save_state(directory)
+        """
+        pass
+
+    def restore_state(self, directory: str) -> None:
+        """
+        # see: INetwork.restore_state(directory)
+        """
+        pass
+
     # protected member functions
 
     @abstractmethod
@@ -125,6 +185,27 @@ class Network(metaclass=ABCMeta):
         """
         pass
 
+    def _predict_action(self, input_tensor: Tensor) -> int:
+        """
+        Greedy action evaluation for derived classes, the default implementation
+        is an argmax over the batched `_predict` output.
+
+        :param input_tensor:
+            a single (already validated) observation
+        :returns:
+            index of the greedy action
+        """
+        policy = self._predict(np.expand_dims(input_tensor, axis=0))
+        if not isinstance(policy, np.ndarray):
+            policy = policy.numpy()
+        return int(np.argmax(policy))
+
+    def _save_checkpoint(self) -> None:
+        """
+        Saves the model's checkpoint through the model serializer.
+        """
+        self._serializer.save_checkpoint(self._network_model, self._name)
+
     def _load_configuration(self):
         """
         Loads necessary configurations.
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework.framework import KatherineApplication
+from kat_framework.config.config_props import InferenceConfigurationProperty
+from kat_framework.util import logger
+from kat_api import INetwork, SingletonMeta
+from kat_typing import Tensor, Policy
+from concurrent.futures import Future
+from typing import List, Tuple
+from logging import Logger
+import numpy as np
+import threading
+import queue
+import time
+
+NOT_RUNNING_ERROR_MSG = "Inference server is not running."
+
+
+class InferenceServer(metaclass=SingletonMeta):
+    """
+    Application scoped batched inference service.
+
+    Actors are submitting single observations (without batch dimension), the serving thread
+    gathers the pending requests and evaluates them with one `INetwork.predict` call. A batch
+    is flushed when it reaches `inference_max_batch_size`, or when the oldest pending request
+    has been waiting for `inference_max_latency` seconds. Results are dispatched back to the
+    actors through futures.
+
+    Actors should announce themselves with `register_actor`. Every registered actor is blocked
+    on its own request, so the batch is flushed immediately once each of them is waiting,
+    a lone actor never pays the latency budget.
+
+    Queue depths and batch sizes are collected at each flush, drivers can pop them as
+    histogram metrics.
+    """
+
+    # protected members
+
+    _log: Logger = None
+    _network: INetwork = None
+    _max_batch_size: int = 0
+    _max_latency: float = 0.0
+    _num_of_actors: int = 0
+    _actors_lock: threading.Lock = None
+    _requests: queue.Queue = None
+    _worker: threading.Thread = None
+    _running: bool = False
+    _statistics_lock: threading.Lock = None
+    _queue_depths: List[int] = None
+    _batch_sizes: List[int] = None
+    _initialized: bool = False
+
+    # public member functions
+
+    def __init__(self):
+        """
+        Default constructor.
+        """
+        self._log = logger.get_logger(self.__class__.__name__)
+        self._requests = queue.Queue()
+        self._statistics_lock = threading.Lock()
+        self._actors_lock = threading.Lock()
+        self._queue_depths = []
+        self._batch_sizes = []
+        self._load_configuration()
+
+    def init(self, network: INetwork) -> None:
+        """
+        Object initialization.
+
+        :param network:
+            the network which evaluates the gathered batches
+        """
+        if network is None:
+            raise ValueError("No network specified.")
+        self._network = network
+        self._initialized = True
+
+    def is_initialized(self) -> bool:
+        """
+        Initialization flag.
+
+        :returns
+            True if the "init" method was called, otherwise false.
+        """
+        return self._initialized
+
+    def is_running(self) -> bool:
+        """
+        Serving thread state indicator.
+
+        :returns
+            True if the server is accepting requests, otherwise false.
+        """
+        return self._running
+
+    def start(self) -> None:
+        """
+        Starts the serving thread, if it haven't started yet.
+        """
+        if not self._initialized:
+            raise RuntimeError("Inference server is not initialized.")
+        if self._running:
+            return
+        self._running = True
+        self._worker = threading.Thread(name="inference", target=self._serve, daemon=True)
+        self._worker.start()
+
+    def stop(self) -> None:
+        """
+        Stops the serving thread, the pending requests are evaluated before the thread exits.
+        The registered actors are released.
+        """
+        if not self._running:
+            return
+        self._running = False
+        with self._actors_lock:
+            self._num_of_actors = 0
+        # wakes up the serving thread
+        self._requests.put(None)
+        self._worker.join()
+
+    def register_actor(self) -> None:
+        """
+        Announces an actor, which is going to submit blocking requests.
+        """
+        with self._actors_lock:
+            self._num_of_actors += 1
+
+    def unregister_actor(self) -> None:
+        """
+        Withdraws an actor, registered by `register_actor`.
+        """
+        with self._actors_lock:
+            if self._num_of_actors == 0:
+                raise RuntimeError("No registered actors.")
+            self._num_of_actors -= 1
+
+    def get_num_of_actors(self) -> int:
+        """
+        :return:
+            the number of the registered actors
+        """
+        return self._num_of_actors
+
+    def submit(self, observation: Tensor) -> Future:
+        """
+        Enqueues an observation for the next batch.
+
+        :param observation:
+            preprocessed observation tensor, without batch dimension
+        :return:
+            future of the predicted policy
+        """
+        if not self._running:
+            raise RuntimeError(NOT_RUNNING_ERROR_MSG)
+        future = Future()
+        self._requests.put((observation, future))
+        return future
+
+    def predict(self, observation: Tensor) -> Policy:
+        """
+        Blocking version of `submit`.
+
+        :param observation:
+            preprocessed observation tensor, without batch dimension
+        :return:
+            the predicted policy of the observation
+        """
+        return self.submit(observation).result()
+
+    def pop_statistics(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Retrieves and clears the statistics collected since the last call.
+
+        :return:
+            (queue depths, batch sizes) per flush
+        """
+        with self._statistics_lock:
+            queue_depths = np.array(self._queue_depths, dtype=np.float32)
+            batch_sizes = np.array(self._batch_sizes, dtype=np.float32)
+            self._queue_depths.clear()
+            self._batch_sizes.clear()
+        return queue_depths, batch_sizes
+
+    # protected member functions
+
+    def _load_configuration(self) -> None:
+        """
+        Loads the configuration.
+        """
+        config_handler = KatherineApplication.get_application_config()
+        self._max_batch_size = config_handler.get_config_property(
+            InferenceConfigurationProperty.INFERENCE_MAX_BATCH_SIZE,
+            InferenceConfigurationProperty.INFERENCE_MAX_BATCH_SIZE.prop_type)
+        self._max_latency = config_handler.get_config_property(
+            InferenceConfigurationProperty.INFERENCE_MAX_LATENCY,
+            InferenceConfigurationProperty.INFERENCE_MAX_LATENCY.prop_type)
+        if self._max_batch_size < 1:
+            raise ValueError("inference_max_batch_size must be positive.")
+
+    def _serve(self) -> None:
+        """
+        Serving thread implementation.
+        """
+        while self._running or not self._requests.empty():
+            batch = self._gather_batch()
+            if batch:
+                self._dispatch(batch)
+
+    def _gather_batch(self) -> List[Tuple[Tensor, Future]]:
+        """
+        Gathers pending requests until the batch is full, all of the registered actors are
+        waiting, or the latency budget of the first request is exceeded.
+
+        :return:
+            list of (observation, future) tuples
+        """
+        request = self._requests.get()
+        if request is None:
+            return []
+        batch = [request]
+        batch_size = self._max_batch_size
+        if self._num_of_actors > 0:
+            # no more requests can arrive, until the waiting actors are served
+            batch_size = min(batch_size, self._num_of_actors)
+        deadline = time.monotonic() + self._max_latency
+        while len(batch) < batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                request = self._requests.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if request is None:
+                break
+            batch.append(request)
+        with self._statistics_lock:
+            self._queue_depths.append(len(batch) + self._requests.qsize())
+            self._batch_sizes.append(len(batch))
+        return batch
+
+    def _dispatch(self, batch: List[Tuple[Tensor, Future]]) -> None:
+        """
+        Evaluates the batch with one predict call, and resolves the futures.
+
+        :param batch:
+            list of (observation, future) tuples
+        """
+        try:
+            policies = self._network.predict(np.stack([observation for observation, _ in batch]))
+            if not isinstance(policies, np.ndarray):
+                policies = policies.numpy()
+        except Exception as error:
+            self._log.error("Batch evaluation failed.", exc_info=True)
+            for _, future in batch:
+                future.set_exception(error)
+            return
+        for i, (_, future) in enumerate(batch):
+            future.set_result(policies[i])
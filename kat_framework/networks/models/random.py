@@ -86,6 +86,13 @@ class RandomActionNetwork(Network, INetwork):
         """
         pass
 
+    @overrides
+    def update_target_network(self, tau: float = 1.0) -> None:
+        """
+        # see : INetwork.update_target_network(tau)
+        """
+        pass
+
     # protected member functions
 
     @overrides
@@ -104,5 +111,5 @@ class RandomActionNetwork(Network, INetwork):
 
         # see : Network._predict(input_tensor)
         """
-        return np.empty(self._network_output_descriptor.get_tensor_shape(),
+        return np.empty((len(input_tensor), *self._network_output_descriptor.get_tensor_shape()),
                         self._network_output_descriptor.get_data_type())
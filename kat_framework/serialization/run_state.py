@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework.util import fileio, logger
+from kat_api import IAgent
+from typing import Optional, Tuple
+from logging import Logger
+import numpy as np
+import random
+import shutil
+import json
+import uuid
+import os
+
+WORKING_DIRECTORY_PREFIX = "run_states"
+RUN_STATE_DIRECTORY_PREFIX = "run_state_"
+TEMPORARY_DIRECTORY_PREFIX = ".tmp_"
+LATEST_POINTER_FILE_NAME = "latest"
+DRIVER_STATE_FILE_NAME = "driver.json"
+RNG_STATE_FILE_NAME = "rng.json"
+AGENT_STATE_DIRECTORY = "agent"
+
+
+class RunStateSerializer:
+    """
+    Saves and restores the whole training run: the driver's counters, the global NumPy and `random`
+    generators (exploration, sampling) and the agent's state (networks, optimizers, replay memory, ...).
+
+    A run state is written into a temporary directory first, and renamed to its final
+    name when it is complete, then the `latest` pointer file is replaced. So an interrupted
+    save never corrupts the latest run state.
+
+    work_directory/run_states/
+        latest                  -> name of the latest run state
+        run_state_00000100/
+            driver.json
+            rng.json
+            agent/...
+    """
+
+    # protected members
+
+    _log: Logger = None
+    _work_directory: str = None
+    _max_to_keep: int = 0
+
+    # public member functions
+
+    def __init__(self, max_to_keep: int, work_directory: Optional[str] = None):
+        """
+        Default constructor.
+
+        :param max_to_keep:
+            number of the kept run states (at least 1)
+        :param work_directory:
+            directory of the run states (default: the agent's run state work directory)
+        """
+        if max_to_keep < 1:
+            raise ValueError("At least one run state must be kept.")
+        self._log = logger.get_logger(self.__class__.__name__)
+        self._max_to_keep = max_to_keep
+        if work_directory is None:
+            work_directory = fileio.build_run_state_work_directory(WORKING_DIRECTORY_PREFIX)
+        self._work_directory = work_directory
+
+    def save(self, agent: IAgent, episode: int, global_step: int, fingerprint: Optional[str] = None) -> str:
+        """
+        Saves a run state atomically.
+
+        :param agent:
+            the agent of the run
+        :param episode:
+            number of the finished episodes
+        :param global_step:
+            number of the performed steps
+        :param fingerprint:
+            fingerprint of the run's configuration (see: `get_fingerprint`)
+        :returns
+            path of the saved run state
+        """
+        if agent is None:
+            raise ValueError("No agent specified.")
+        os.makedirs(self._work_directory, exist_ok=True)
+        temporary_directory = os.path.join(self._work_directory, TEMPORARY_DIRECTORY_PREFIX + uuid.uuid4().hex)
+        os.makedirs(os.path.join(temporary_directory, AGENT_STATE_DIRECTORY))
+        try:
+            with open(os.path.join(temporary_directory, DRIVER_STATE_FILE_NAME), "w") as state_file:
+                json.dump({"episode": episode, "global_step": global_step, "fingerprint": fingerprint}, state_file)
+            self._save_rng_state(os.path.join(temporary_directory, RNG_STATE_FILE_NAME))
+            agent.save_state(os.path.join(temporary_directory, AGENT_STATE_DIRECTORY))
+            run_state_name = "{}{:08d}".format(RUN_STATE_DIRECTORY_PREFIX, episode)
+            run_state_directory = os.path.join(self._work_directory, run_state_name)
+            if os.path.exists(run_state_directory):
+                shutil.rmtree(run_state_directory)
+            os.rename(temporary_directory, run_state_directory)
+        except BaseException:
+            shutil.rmtree(temporary_directory, ignore_errors=True)
+            raise
+        self._update_latest_pointer(run_state_name)
+        self._remove_old_run_states()
+        self._log.info("Run state saved: %s", run_state_directory)
+        return run_state_directory
+
+    def get_latest(self) -> Optional[str]:
+        """
+        Returns the latest complete run state.
+
+        :returns
+            path of the latest run state, or None if there is no one
+        """
+        pointer_path = os.path.join(self._work_directory, LATEST_POINTER_FILE_NAME)
+        if not os.path.isfile(pointer_path):
+            return None
+        with open(pointer_path, "r") as pointer_file:
+            run_state_directory = os.path.join(self._work_directory, pointer_file.read().strip())
+        if not os.path.isdir(run_state_directory):
+            self._log.warning("Latest run state %s doesn't exist.", run_state_directory)
+            return None
+        return run_state_directory
+
+    @staticmethod
+    def get_fingerprint(run_state_directory: str) -> Optional[str]:
+        """
+        Returns the configuration fingerprint of a run state, the run states of an other configuration
+        can't be resumed.
+
+        :param run_state_directory:
+            path of the run state
+        :returns
+            the fingerprint, or None if it was not saved
+        """
+        with open(os.path.join(run_state_directory, DRIVER_STATE_FILE_NAME), "r") as state_file:
+            return json.load(state_file).get("fingerprint")
+
+    def restore(self, agent: IAgent, run_state_directory: str) -> Tuple[int, int]:
+        """
+        Restores a run state into an initialized agent.
+
+        :param agent:
+            the agent of the run
+        :param run_state_directory:
+            path of the run state
+        :returns
+            number of the finished episodes and the performed steps
+        """
+        if agent is None:
+            raise ValueError("No agent specified.")
+        if run_state_directory is None:
+            raise ValueError("No run state specified.")
+        with open(os.path.join(run_state_directory, DRIVER_STATE_FILE_NAME), "r") as state_file:
+            state = json.load(state_file)
+        agent.restore_state(os.path.join(run_state_directory, AGENT_STATE_DIRECTORY))
+        self._restore_rng_state(os.path.join(run_state_directory, RNG_STATE_FILE_NAME))
+        self._log.info("Run state restored: %s", run_state_directory)
+        return state["episode"], state["global_step"]
+
+    # protected member functions
+
+    @staticmethod
+    def _save_rng_state(filepath: str) -> None:
+        """
+        Saves the states of the global NumPy and `random` generators.
+        """
+        bit_generator, keys, position, has_gauss, cached_gaussian = np.random.get_state()
+        version, internal_state, gauss_next = random.getstate()
+        with open(filepath, "w") as state_file:
+            json.dump({"numpy": [bit_generator, keys.tolist(), position, has_gauss, cached_gaussian],
+                       "random": [version, list(internal_state), gauss_next]}, state_file)
+
+    def _restore_rng_state(self, filepath: str) -> None:
+        """
+        Restores the states of the global NumPy and `random` generators, if they were saved.
+        """
+        if not os.path.isfile(filepath):
+            self._log.warning("No random generator state in the run state.")
+            return
+        with open(filepath, "r") as state_file:
+            state = json.load(state_file)
+        bit_generator, keys, position, has_gauss, cached_gaussian = state["numpy"]
+        np.random.set_state((bit_generator, np.asarray(keys, dtype=np.uint32), position, has_gauss, cached_gaussian))
+        version, internal_state, gauss_next = state["random"]
+        random.setstate((version, tuple(internal_state), gauss_next))
+
+    def _update_latest_pointer(self, run_state_name: str) -> None:
+        """
+        Replaces the pointer file atomically.
+        """
+        pointer_path = os.path.join(self._work_directory, LATEST_POINTER_FILE_NAME)
+        temporary_path = pointer_path + ".tmp"
+        with open(temporary_path, "w") as pointer_file:
+            pointer_file.write(run_state_name)
+            pointer_file.flush()
+            os.fsync(pointer_file.fileno())
+        os.replace(temporary_path, pointer_path)
+
+    def _remove_old_run_states(self) -> None:
+        """
+        Removes the run states over the limit, and the leftovers of the interrupted saves.
+        """
+        run_states = []
+        for name in os.listdir(self._work_directory):
+            path = os.path.join(self._work_directory, name)
+            if name.startswith(RUN_STATE_DIRECTORY_PREFIX):
+                run_states.append(name)
+            elif name.startswith(TEMPORARY_DIRECTORY_PREFIX):
+                shutil.rmtree(path, ignore_errors=True)
+        for name in sorted(run_states)[:-self._max_to_keep]:
+            shutil.rmtree(os.path.join(self._work_directory, name), ignore_errors=True)
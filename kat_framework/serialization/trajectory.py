@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework.core.descriptors import TensorDescriptor
+from kat_framework.util import fileio, logger
+from kat_api import IState, ITensorDescriptor, NetworkInputType
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Collection, Dict, Iterator, List, Optional, Tuple
+from logging import Logger
+import numpy as np
+import threading
+import queue
+import json
+import uuid
+import os
+
+WORKING_DIRECTORY_PREFIX = "trajectories"
+METADATA_FILE_NAME = "trajectory.json"
+SHARD_FILE_PREFIX = "shard_"
+SHARD_FILE_EXTENSION = ".npz"
+TEMPORARY_FILE_PREFIX = ".tmp_"
+OBSERVATION_KEY_PREFIX = "observation_"
+ACTION_KEY = "action"
+REWARD_KEY = "reward"
+TERMINAL_KEY = "terminal"
+RECORD_TYPE_KEY = "record_type"
+
+# record types, the first observation of an episode, the following ones, and the last (not acted) observation
+INITIAL_RECORD = 0
+ACTIVE_RECORD = 1
+FINAL_RECORD = 2
+
+# (observation fields by name, action, reward, terminal, record type)
+TrajectoryRecord = Tuple[Dict[str, np.ndarray], np.ndarray, float, bool, int]
+
+
+class TrajectoryRecorder:
+    """
+    Records the experience of the episodes (observations, actions, rewards, terminals) into rolling
+    compressed shard files.
+
+    The records are extracted from the states on the caller's thread (the states can be reused right
+    after the call), and they are written by a background thread. The caller is blocked only if the
+    writer is lagging behind by `queue_size` records. Callers, which are playing several episodes at
+    once, can `extract` the records of an episode, and `write` them when it is finished, so the episodes
+    are not interleaved in the shards.
+
+    work_directory/trajectories/
+        trajectory.json         -> observation and action space descriptors
+        shard_00000000.npz      -> `shard_size` records (the shards are continuing across the runs)
+        shard_00000001.npz
+    """
+
+    # protected members
+
+    _log: Logger = None
+    _work_directory: str = None
+    _observation_space_desc: Collection[ITensorDescriptor] = None
+    _action_space_desc: ITensorDescriptor = None
+    _shard_size: int = 0
+    _queue: queue.Queue = None
+    _writer_thread: threading.Thread = None
+    _shard_counter: int = 0
+    _error: Optional[BaseException] = None
+
+    # public member functions
+
+    def __init__(self,
+                 observation_space_desc: Collection[ITensorDescriptor],
+                 action_space_desc: ITensorDescriptor,
+                 shard_size: int,
+                 queue_size: int,
+                 work_directory: Optional[str] = None):
+        """
+        Default constructor.
+
+        :param observation_space_desc:
+            descriptors of the recorded observation fields
+        :param action_space_desc:
+            descriptor of the action space
+        :param shard_size:
+            number of records per shard file
+        :param queue_size:
+            maximum number of records waiting for the writer
+        :param work_directory:
+            directory of the shards (default: run tag scoped work directory)
+        """
+        if observation_space_desc is None or action_space_desc is None:
+            raise ValueError("No observation or action space specified.")
+        if shard_size < 1 or queue_size < 1:
+            raise ValueError("The shard and queue sizes must be positive.")
+        self._log = logger.get_logger(self.__class__.__name__)
+        self._observation_space_desc = list(observation_space_desc)
+        self._action_space_desc = action_space_desc
+        self._shard_size = shard_size
+        self._queue = queue.Queue(maxsize=queue_size)
+        if work_directory is None:
+            work_directory = fileio.build_work_directory(WORKING_DIRECTORY_PREFIX)
+        self._work_directory = work_directory
+
+    def start(self) -> None:
+        """
+        Writes the metadata file and starts the background writer.
+        """
+        os.makedirs(self._work_directory, exist_ok=True)
+        self._shard_counter = len(get_shard_paths(self._work_directory))
+        _write_metadata(self._work_directory, self._observation_space_desc, self._action_space_desc)
+        self._writer_thread = threading.Thread(target=self._write_shards, name="TrajectoryWriter", daemon=True)
+        self._writer_thread.start()
+
+    def record(self, state: IState) -> None:
+        """
+        Records an acted state (the observation with the taken action, the reward and the terminal flag),
+        and also the transitioned observation at the end of the episodes.
+
+        :param state:
+            the acted state, after the transition
+        """
+        self.write(self.extract(state))
+
+    def extract(self, state: IState) -> List[tuple]:
+        """
+        Extracts the records of an acted state, without writing them (see: `record`).
+
+        :param state:
+            the acted state, after the transition
+        :returns
+            the records, with copied observations
+        """
+        action = np.asarray(state.get_transition())
+        terminal = state.is_end_state()
+        record_type = INITIAL_RECORD if state.is_initial_state() else ACTIVE_RECORD
+        records = [(self._extract_fields(state.get_observation()), action, state.get_reward(), terminal, record_type)]
+        if terminal:
+            records.append((self._extract_fields(state.get_transitioned_observation()), np.zeros_like(action),
+                            0.0, True, FINAL_RECORD))
+        return records
+
+    def write(self, records: List[tuple]) -> None:
+        """
+        Writes the extracted records in order (see: `extract`).
+
+        :param records:
+            the records
+        """
+        if self._error is not None:
+            raise RuntimeError("Trajectory writer failed.") from self._error
+        for record in records:
+            self._queue.put(record)
+
+    def close(self) -> None:
+        """
+        Writes out the pending records (last, possibly partial shard), and stops the writer.
+        """
+        if self._writer_thread is None:
+            return
+        self._queue.put(None)
+        self._writer_thread.join()
+        self._writer_thread = None
+        if self._error is not None:
+            raise RuntimeError("Trajectory writer failed.") from self._error
+
+    # protected member functions
+
+    def _extract_fields(self, observation) -> Tuple[np.ndarray, ...]:
+        """
+        Copies of the observation fields in the order of the descriptors. The records are written
+        later, while the games can recycle their buffers (see: `IGame.release_observation`).
+        """
+        return tuple(np.array(getattr(observation, desc.get_display_name()), copy=True)
+                     for desc in self._observation_space_desc)
+
+    def _write_shards(self) -> None:
+        """
+        Writer thread, collects the records and writes out a shard when it is full.
+        """
+        records = []
+        finished = False
+        try:
+            while not finished:
+                record = self._queue.get()
+                if record is None:
+                    finished = True
+                else:
+                    records.append(record)
+                if len(records) >= self._shard_size or (finished and len(records) > 0):
+                    self._write_shard(records)
+                    records = []
+        except BaseException as e:
+            self._log.error("Trajectory shard can't be written.", exc_info=True)
+            self._error = e
+            # discarding the rest, so the producer is never blocked
+            while not finished and self._queue.get() is not None:
+                pass
+
+    def _write_shard(self, records: List[tuple]) -> None:
+        """
+        Writes the records into the next shard file atomically.
+        """
+        shard = {}
+        for i, desc in enumerate(self._observation_space_desc):
+            shard[OBSERVATION_KEY_PREFIX + desc.get_display_name()] = np.stack([r[0][i] for r in records])
+        shard[ACTION_KEY] = np.stack([r[1] for r in records])
+        shard[REWARD_KEY] = np.asarray([r[2] for r in records], dtype=np.float32)
+        shard[TERMINAL_KEY] = np.asarray([r[3] for r in records], dtype=np.bool_)
+        shard[RECORD_TYPE_KEY] = np.asarray([r[4] for r in records], dtype=np.int8)
+        shard_path = os.path.join(self._work_directory,
+                                  "{}{:08d}{}".format(SHARD_FILE_PREFIX, self._shard_counter, SHARD_FILE_EXTENSION))
+        temporary_path = os.path.join(self._work_directory, TEMPORARY_FILE_PREFIX + uuid.uuid4().hex)
+        with open(temporary_path, "wb") as shard_file:
+            np.savez_compressed(shard_file, **shard)
+        os.replace(temporary_path, shard_path)
+        self._shard_counter += 1
+
+
+class TrajectoryReader:
+    """
+    Streams back the recorded trajectories, shard by shard (the next shard is loaded in the background,
+    while the current one is consumed).
+    """
+
+    # protected members
+
+    _directory: str = None
+    _observation_space_desc: List[ITensorDescriptor] = None
+    _action_space_desc: ITensorDescriptor = None
+
+    # public member functions
+
+    def __init__(self, directory: str):
+        """
+        Default constructor.
+
+        :param directory:
+            directory of the recorded shards
+        """
+        if directory is None:
+            raise ValueError("No trajectory directory specified.")
+        if not os.path.isfile(os.path.join(directory, METADATA_FILE_NAME)):
+            raise ValueError("No trajectory found in {}.".format(directory))
+        self._directory = directory
+        self._observation_space_desc, self._action_space_desc = _read_metadata(directory)
+
+    def get_observation_space_desc(self) -> List[ITensorDescriptor]:
+        """
+        Descriptors of the recorded observation fields.
+        """
+        return self._observation_space_desc
+
+    def get_action_space_desc(self) -> ITensorDescriptor:
+        """
+        Descriptor of the recorded action space.
+        """
+        return self._action_space_desc
+
+    def get_shard_paths(self) -> List[str]:
+        """
+        Shard files in the recording order.
+        """
+        return get_shard_paths(self._directory)
+
+    def iterate_shards(self) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Generator of the shards, as arrays by key (observation fields are prefixed with `observation_`).
+        """
+        shard_paths = self.get_shard_paths()
+        if len(shard_paths) == 0:
+            return
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            next_shard: Future = executor.submit(_load_shard, shard_paths[0])
+            for shard_path in shard_paths[1:]:
+                shard = next_shard.result()
+                next_shard = executor.submit(_load_shard, shard_path)
+                yield shard
+            yield next_shard.result()
+
+    def __iter__(self) -> Iterator[TrajectoryRecord]:
+        """
+        Generator of the records, in the recording order.
+        """
+        field_names = [desc.get_display_name() for desc in self._observation_space_desc]
+        for shard in self.iterate_shards():
+            fields = [shard[OBSERVATION_KEY_PREFIX + name] for name in field_names]
+            actions = shard[ACTION_KEY]
+            rewards = shard[REWARD_KEY]
+            terminals = shard[TERMINAL_KEY]
+            record_types = shard[RECORD_TYPE_KEY]
+            for i in range(len(rewards)):
+                yield ({name: field[i] for name, field in zip(field_names, fields)}, actions[i],
+                       float(rewards[i]), bool(terminals[i]), int(record_types[i]))
+
+
+def get_shard_paths(directory: str) -> List[str]:
+    """
+    Returns the shard files of the directory, in the recording order.
+
+    :param directory:
+        directory of the shards
+    :returns
+        list of shard paths
+    """
+    if not os.path.isdir(directory):
+        return []
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+            if name.startswith(SHARD_FILE_PREFIX) and name.endswith(SHARD_FILE_EXTENSION)]
+
+
+def _load_shard(shard_path: str) -> Dict[str, np.ndarray]:
+    """
+    Loads (decompresses) all arrays of a shard.
+    """
+    with np.load(shard_path) as shard:
+        return {key: shard[key] for key in shard.files}
+
+
+def _write_metadata(directory: str,
+                    observation_space_desc: Collection[ITensorDescriptor],
+                    action_space_desc: ITensorDescriptor) -> None:
+    """
+    Writes the space descriptors of the recording.
+    """
+    metadata = {
+        "observation_space": [_descriptor_to_dict(desc) for desc in observation_space_desc],
+        "action_space": _descriptor_to_dict(action_space_desc)
+    }
+    with open(os.path.join(directory, METADATA_FILE_NAME), "w") as metadata_file:
+        json.dump(metadata, metadata_file)
+
+
+def _read_metadata(directory: str) -> Tuple[List[ITensorDescriptor], ITensorDescriptor]:
+    """
+    Reads the space descriptors of the recording.
+    """
+    with open(os.path.join(directory, METADATA_FILE_NAME), "r") as metadata_file:
+        metadata = json.load(metadata_file)
+    return [_dict_to_descriptor(d) for d in metadata["observation_space"]], \
+        _dict_to_descriptor(metadata["action_space"])
+
+
+def _descriptor_to_dict(desc: ITensorDescriptor) -> dict:
+    """
+    JSON serializable form of a tensor descriptor.
+    """
+    input_type = desc.get_network_input_type()
+    return {
+        "name": desc.get_display_name(),
+        "dtype": np.dtype(desc.get_data_type()).name,
+        "shape": list(desc.get_tensor_shape()),
+        "input_type": input_type.value if input_type is not None else None
+    }
+
+
+def _dict_to_descriptor(d: dict) -> ITensorDescriptor:
+    """
+    Tensor descriptor from its JSON form.
+    """
+    return TensorDescriptor(display_name=d["name"],
+                            data_type=np.dtype(d["dtype"]).type,
+                            tensor_shape=tuple(d["shape"]),
+                            input_type=NetworkInputType(d["input_type"]) if d["input_type"] is not None else None)
@@ -20,6 +20,7 @@ import os
 
 MODEL_DIRECTORY_POSTFIX = "models"
 METRICS_DIRECTORY_POSTFIX = "metrics"
+RUN_STATE_DIRECTORY_POSTFIX = "run_states"
 
 
 def build_global_work_directory() -> str:
@@ -31,17 +32,29 @@ def build_global_work_directory() -> str:
     :returns
         the global work directory path (relative path)
     """
+    run_tag = KatherineApplication.get_application_config().get_config_property(
+        KatConfigurationProperty.RUN_TAG, KatConfigurationProperty.RUN_TAG.prop_type)
+    return os.path.join(build_agent_work_directory(), run_tag)
+
+
+def build_agent_work_directory() -> str:
+    """
+    Helper function for building the game and agent scoped working directory, it is shared by the runs.
+
+    base_work_directory/game/agent
+
+    :returns
+        the agent's work directory path (relative path)
+    """
     base_work_directory = KatherineApplication.get_application_config().get_config_property(
         KatConfigurationProperty.WORK_DIRECTORY, KatConfigurationProperty.WORK_DIRECTORY.prop_type)
     agent_name = KatherineApplication.get_application_config().get_config_property(
         KatConfigurationProperty.AGENT_CLASS, KatConfigurationProperty.AGENT_CLASS.prop_type)
     game_name = KatherineApplication.get_application_config().get_config_property(
         KatConfigurationProperty.GAME_CLASS, KatConfigurationProperty.GAME_CLASS.prop_type)
-    run_tag = KatherineApplication.get_application_config().get_config_property(
-        KatConfigurationProperty.RUN_TAG, KatConfigurationProperty.RUN_TAG.prop_type)
     agent_name = agent_name[agent_name.rindex('.') + 1:]
     game_name = game_name[game_name.rindex('.') + 1:]
-    return os.path.join(base_work_directory, game_name, agent_name, run_tag)
+    return os.path.join(base_work_directory, game_name, agent_name)
 
 
 def build_work_directory(postfix: str) -> str:
@@ -67,6 +80,18 @@ def build_models_work_directory(models_postfix: Optional[str]) -> str:
     return build_work_directory(models_postfix)
 
 
+def build_run_state_work_directory(run_state_postfix: Optional[str]) -> str:
+    """
+    Helper function for building the run state work directory. It is not scoped by the run tag
+    (generated per process by default), so a restarted run finds the run states of the previous one.
+
+    base_work_directory/game/agent/run_state_postfix
+    """
+    if run_state_postfix is None or "" == run_state_postfix:
+        run_state_postfix = RUN_STATE_DIRECTORY_POSTFIX
+    return os.path.join(build_agent_work_directory(), run_state_postfix)
+
+
 def build_metrics_work_directory(metrics_postfix: Optional[str]) -> str:
     """
     Helper function for building metrics work directory.
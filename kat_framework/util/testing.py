@@ -13,9 +13,14 @@
 # Copyright (C) 2020-2021 d33are                 #
 ##################################################
 
+from kat_framework.core.descriptors import TensorDescriptor
+from kat_api import IConfigurationHandler, SingletonMeta, IReplayMemory, INetwork, ITensorDescriptor
+from typing import Callable, Optional
 import multiprocessing
 import portpicker
+import numpy as np
 import tensorflow as tf
+import time
 
 NUM_WORKERS = 3
 NUM_PS = 2
@@ -57,3 +62,107 @@ def create_in_process_tensorflow_fixed_partitioner() -> tf.distribute.experiment
     Creates a FixedShardPartitioner.
     """
     return tf.distribute.experimental.partitioners.FixedShardsPartitioner(num_shards=NUM_PS)
+
+
+def reset_application_config() -> None:
+    """
+    Drops the application scoped configuration handler (singleton), so the next
+    `KatherineApplication.init` call loads its own scenario.
+    """
+    for clazz in [c for c in SingletonMeta._instances if issubclass(c, IConfigurationHandler)]:
+        del SingletonMeta._instances[clazz]
+
+
+def build_random_memory(state_shape: tuple,
+                        memory_size: int,
+                        number_of_actions: int,
+                        target_q_cache_enabled: bool = False) -> IReplayMemory:
+    """
+    Creates a TensorFlow replay memory, filled with random transitions (the same ones in each call).
+
+    :param state_shape:
+        shape of the states
+    :param memory_size:
+        number of transitions
+    :param number_of_actions:
+        size of the action space
+    :param target_q_cache_enabled:
+        the target Q values are cached by the memory or not
+    :returns
+        the filled memory
+    """
+    # kat_tensorflow is built on top of the framework
+    from kat_tensorflow.memory.uniform import TensorflowUniformMemory
+    memory = TensorflowUniformMemory()
+    memory._target_q_cache_enabled = target_q_cache_enabled
+    memory.init((TensorDescriptor('s1_states', np.float32, (memory_size, *state_shape)),
+                 TensorDescriptor('action_ids', np.int32, (memory_size,)),
+                 TensorDescriptor('s2_states', np.float32, (memory_size, *state_shape)),
+                 TensorDescriptor('rewards', np.float32, (memory_size,)),
+                 TensorDescriptor('terminals', np.bool_, (memory_size,))))
+    generator = np.random.default_rng(0)
+    memory.add_transitions(generator.random((memory_size, *state_shape), dtype=np.float32),
+                           generator.integers(0, number_of_actions, memory_size).astype(np.int32),
+                           generator.random((memory_size, *state_shape), dtype=np.float32),
+                           generator.random(memory_size, dtype=np.float32),
+                           generator.random(memory_size) < 0.1)
+    return memory
+
+
+def build_network(input_desc: ITensorDescriptor,
+                  output_desc: ITensorDescriptor,
+                  memory: IReplayMemory,
+                  jit_compile_enabled: bool = False,
+                  mixed_precision_policy: Optional[str] = None) -> INetwork:
+    """
+    Creates a Q network with a target network, the configured JIT compilation and mixed precision
+    policy can be overridden.
+
+    :param input_desc:
+        input descriptor of the networks
+    :param output_desc:
+        output descriptor of the networks
+    :param memory:
+        replay memory of the trained network
+    :param jit_compile_enabled:
+        the graph functions are XLA compiled or not
+    :param mixed_precision_policy:
+        mixed precision policy of the networks (default: the configured one)
+    :returns
+        the initialized network
+    """
+    # kat_tensorflow is built on top of the framework
+    from kat_tensorflow.networks.deep_q import QNetwork
+    networks = [QNetwork(name="TargetQNetwork"), QNetwork()]
+    for network in networks:
+        network._jit_compile_enabled = jit_compile_enabled
+        if mixed_precision_policy is not None:
+            network._mixed_precision_policy = mixed_precision_policy
+    target_network, network = networks
+    target_network.init(output_descriptor=output_desc, input_descriptor=input_desc)
+    network.init(output_descriptor=output_desc, input_descriptor=input_desc, replay_memory_access=memory,
+                 target_network=target_network)
+    return network
+
+
+def measure(fn: Callable[[], object], num_of_calls: int, num_of_warmup_calls: int = 0) -> np.ndarray:
+    """
+    Measures the latencies of the specified function, after the warm-up calls.
+
+    :param fn:
+        the measured function
+    :param num_of_calls:
+        number of the measured calls
+    :param num_of_warmup_calls:
+        number of the calls before the measurement
+    :returns
+        per call latencies (sec)
+    """
+    for _ in range(num_of_warmup_calls):
+        fn()
+    latencies = np.empty((num_of_calls,), dtype=np.float64)
+    for i in range(num_of_calls):
+        start = time.perf_counter()
+        fn()
+        latencies[i] = time.perf_counter() - start
+    return latencies
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_api import SingletonMeta
+from typing import Dict, List, Tuple
+import numpy as np
+import threading
+
+# hot path phases of the episode drivers
+MAKE_ACTION_PHASE = "make_action"
+PROCESS_TICKS_PHASE = "process_ticks"
+PREPROCESS_PHASE = "preprocess"
+PREDICT_PHASE = "predict"
+STORE_TRANSITION_PHASE = "store_transition"
+TRAIN_STEP_PHASE = "train_step"
+
+
+class PhaseTimer(metaclass=SingletonMeta):
+    """
+    Application scoped collector of the hot path phase durations.
+
+    The callers are measuring with `time.perf_counter` (monotonic), and recording the durations
+    only if the timing is enabled. Callers should keep a reference to the timer only when it
+    is enabled, so the disabled timing costs a `None` check.
+    """
+
+    # protected members
+
+    _lock: threading.Lock = None
+    _durations: Dict[str, List[float]] = None
+
+    # public member functions
+
+    def __init__(self):
+        """
+        Default constructor.
+        """
+        self._lock = threading.Lock()
+        self._durations = {}
+
+    def record(self, phase: str, duration: float) -> None:
+        """
+        Records a duration of a phase.
+
+        :param phase:
+            name of the phase
+        :param duration:
+            measured duration (sec)
+        """
+        with self._lock:
+            durations = self._durations.get(phase)
+            if durations is None:
+                durations = self._durations[phase] = []
+            durations.append(duration)
+
+    def pop_statistics(self) -> Dict[str, Tuple[float, float]]:
+        """
+        Returns the statistics of the recorded durations since the last call.
+
+        :returns
+            mean and 99th percentile (ms) per phase
+        """
+        with self._lock:
+            recorded_durations = self._durations
+            self._durations = {}
+        statistics = {}
+        for phase, durations in recorded_durations.items():
+            durations_ms = np.asarray(durations, dtype=np.float64) * 1000.0
+            statistics[phase] = (float(durations_ms.mean()), float(np.percentile(durations_ms, 99)))
+        return statistics
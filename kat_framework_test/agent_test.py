@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework import KatherineApplication, testing
+import tensorflow as tf
+import unittest
+
+
+FACTORY_CLASS = "kat_framework.core.factory.KatFactory"
+CONFIG_CLASS = "kat_framework.config.config_handler.YamlConfigHandler"
+CONFIG_URI = "file://localhost/scenarios/driver"
+STEPS_PER_EXECUTION = 3
+MAX_EPISODES = 4
+MAX_STEPS = 10
+
+
+class DeferredTrainTest(unittest.TestCase):
+    """
+    Several gradient steps of the Q network per train call, deferred by the Q agent.
+    """
+    def setUp(self):
+        testing.reset_application_config()
+        KatherineApplication.init(FACTORY_CLASS, CONFIG_CLASS, CONFIG_URI)
+        KatherineApplication.get_application_config().settings["network"]["steps_per_execution"] = \
+            STEPS_PER_EXECUTION
+        factory = KatherineApplication.get_application_factory()
+        game = factory.build_game()
+        game.init()
+        self.agent = factory.build_agent()
+        self.agent.init(game.get_observation_space_desc(), game.get_action_space_desc())
+        self.agent.warm_up(game, MAX_EPISODES, MAX_STEPS, 0)
+
+    def tearDown(self):
+        testing.reset_application_config()
+
+    def test_deferred_train(self):
+        network = self.agent._network
+        train_batches = []
+        train_batch = network.train_batch
+
+        def counted_train_batch(*args):
+            train_batches.append(args)
+            return train_batch(*args)
+
+        network.train_batch = counted_train_batch
+        # the n-th in-graph gradient step's loss is n
+        counter = tf.Variable(0.0)
+
+        def counted_train_step(batch, d_factor):
+            return counter.assign_add(1.0)
+
+        network._train_step_fn = counted_train_step
+        last_loss = 0.0
+        for i in range(2):
+            losses = [float(self.agent._train()) for _ in range(STEPS_PER_EXECUTION)]
+            self.assertEqual(i + 1, len(train_batches))
+            self.assertEqual((i + 1) * STEPS_PER_EXECUTION, counter.numpy())
+            # the last loss is returned between the network calls
+            self.assertEqual([last_loss] * (STEPS_PER_EXECUTION - 1), losses[:-1])
+            # mean of the losses i * K + 1, ..., (i + 1) * K
+            last_loss = i * STEPS_PER_EXECUTION + (STEPS_PER_EXECUTION + 1) / 2.0
+            self.assertEqual(last_loss, losses[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
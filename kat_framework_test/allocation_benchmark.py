@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework import KatState, KatStatePool
+from kat_framework.games.openai.observation import OpenAIObservation
+from kat_api import StateType, NetworkInputType
+import numpy as np
+import tracemalloc
+
+NUM_OF_WARMUP_STEPS = 1000
+NUM_OF_STEPS = 20000
+FRAME = np.zeros((128,), dtype=np.uint8)
+
+
+def allocating_steps(num_of_steps):
+    """
+    The former driver step, a new state per step.
+    """
+    state = KatState(1, OpenAIObservation(FRAME, NetworkInputType.RAM), StateType.INITIAL_STATE)
+    for _ in range(num_of_steps):
+        yield
+        state.set_transition(0)
+        observation = OpenAIObservation(FRAME, NetworkInputType.RAM)
+        state.set_transitioned_observation(observation)
+        state.set_reward(1.0)
+        state = KatState(1, observation, StateType.ACTIVE_STATE)
+
+
+def pooled_steps(num_of_steps):
+    """
+    The pooled driver step, the stored state is released and reused.
+    """
+    pool = KatStatePool()
+    state = pool.acquire(1, OpenAIObservation(FRAME, NetworkInputType.RAM), StateType.INITIAL_STATE)
+    for _ in range(num_of_steps):
+        yield
+        state.set_transition(0)
+        observation = OpenAIObservation(FRAME, NetworkInputType.RAM)
+        state.set_transitioned_observation(observation)
+        state.set_reward(1.0)
+        next_state = pool.acquire(1, observation, StateType.ACTIVE_STATE)
+        pool.release(state)
+        state = next_state
+
+
+def measure(name, steps_fn):
+    """
+    Measures the allocated bytes per step (peak above the live memory, during the step).
+    """
+    for _ in steps_fn(NUM_OF_WARMUP_STEPS):
+        pass
+    steps = steps_fn(NUM_OF_STEPS)
+    next(steps)
+    allocated = np.empty((NUM_OF_STEPS - 1,), dtype=np.float64)
+    tracemalloc.start()
+    for i in range(NUM_OF_STEPS - 1):
+        live = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        next(steps)
+        allocated[i] = tracemalloc.get_traced_memory()[1] - live
+    tracemalloc.stop()
+    print("{:<12} allocated per step mean: {:>7.1f} B  p99: {:>7.1f} B".format(
+        name, allocated.mean(), np.percentile(allocated, 99)))
+
+
+def retained_size(name, factory_fn, count=1000):
+    """
+    Measures the retained size of an object.
+    """
+    tracemalloc.start()
+    live = tracemalloc.get_traced_memory()[0]
+    objects = [factory_fn() for _ in range(count)]
+    size = (tracemalloc.get_traced_memory()[0] - live) / len(objects) - 8  # list slot
+    tracemalloc.stop()
+    print("{:<18} retained size: {:>7.1f} B".format(name, size))
+
+
+def main():
+    """
+    Per step allocations of the step objects, "new state per step" vs "pooled states".
+    """
+    retained_size("KatState", lambda: KatState(1, None, StateType.ACTIVE_STATE))
+    retained_size("OpenAIObservation", lambda: OpenAIObservation(FRAME, NetworkInputType.RAM))
+    measure("allocating", allocating_steps)
+    measure("pooled", pooled_steps)
+
+
+if __name__ == "__main__":
+    main()
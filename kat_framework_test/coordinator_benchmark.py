@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework import KatherineApplication, TensorDescriptor, testing
+from kat_tensorflow.networks.deep_q import QNetwork
+from kat_api import NetworkInputType
+import numpy as np
+import tensorflow as tf
+import time
+
+FACTORY_CLASS = "kat_framework.core.factory.KatFactory"
+CONFIG_CLASS = "kat_framework.config.config_handler.YamlConfigHandler"
+CONFIG_URI = "file://localhost/scenarios/test"
+MEMORY_SIZE = 256
+STATE_SHAPE = (3,)
+NUMBER_OF_ACTIONS = 4
+MAX_IN_FLIGHT_STEPS = 8
+NUM_OF_STEPS = 60
+NUM_OF_MEASUREMENTS = 3
+
+
+def measure(network, max_in_flight_steps):
+    """
+    Measures the train steps per second (the best of the measurements), the scheduled steps are joined.
+    """
+    network._max_in_flight_steps = max_in_flight_steps
+    rates = []
+    for _ in range(NUM_OF_MEASUREMENTS):
+        start = time.perf_counter()
+        for _ in range(NUM_OF_STEPS):
+            network.train_batch()
+        network.join()
+        rates.append(NUM_OF_STEPS / (time.perf_counter() - start))
+    return max(rates)
+
+
+def main():
+    """
+    Train steps of a Q network on an in-process parameter server cluster, awaited one by one vs pipelined.
+    On a machine with less cores than workers, the pipelined steps are sharing the cores.
+    """
+    KatherineApplication.init(FACTORY_CLASS, CONFIG_CLASS, CONFIG_URI)
+    strategy = tf.distribute.experimental.ParameterServerStrategy(testing.create_in_process_tensorflow_cluster())
+    network = QNetwork()
+    network.init(output_descriptor=TensorDescriptor("network_output", np.float32, (NUMBER_OF_ACTIONS,),
+                                                    NetworkInputType.NONE),
+                 input_descriptor=TensorDescriptor("ram_vector", np.float32, STATE_SHAPE, NetworkInputType.RAM),
+                 replay_memory_access=testing.build_random_memory(STATE_SHAPE, MEMORY_SIZE, NUMBER_OF_ACTIONS),
+                 is_distribution_enabled=True,
+                 strategy=strategy)
+    # tracing the train function before the measurements
+    network.train_batch()
+    for label, max_in_flight_steps in (("synchronous", 0), ("pipelined", MAX_IN_FLIGHT_STEPS)):
+        print("{:<12} train steps per second: {:>9.1f}".format(label, measure(network, max_in_flight_steps)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework import KatherineApplication, TensorDescriptor, testing
+from kat_tensorflow.networks.deep_q import QNetwork
+from kat_api import NetworkInputType
+import numpy as np
+import tensorflow as tf
+import unittest
+
+
+FACTORY_CLASS = "kat_framework.core.factory.KatFactory"
+CONFIG_CLASS = "kat_framework.config.config_handler.YamlConfigHandler"
+CONFIG_URI = "file://localhost/scenarios/test"
+MEMORY_MAX_SIZE = 256
+STATE_SHAPE = (3,)
+NUMBER_OF_ACTIONS = 4
+MAX_IN_FLIGHT_STEPS = 8
+
+
+class PipelinedCoordinatorTest(unittest.TestCase):
+    """
+    Train steps of a Q network, scheduled on an in-process parameter server cluster.
+    """
+    @classmethod
+    def setUpClass(cls):
+        KatherineApplication.init(FACTORY_CLASS, CONFIG_CLASS, CONFIG_URI)
+        cls.strategy = tf.distribute.experimental.ParameterServerStrategy(
+            testing.create_in_process_tensorflow_cluster())
+        cls.memory = testing.build_random_memory(STATE_SHAPE, MEMORY_MAX_SIZE, NUMBER_OF_ACTIONS)
+        cls.network = QNetwork()
+        cls.network.init(output_descriptor=TensorDescriptor("network_output", np.float32, (NUMBER_OF_ACTIONS,),
+                                                            NetworkInputType.NONE),
+                         input_descriptor=TensorDescriptor("ram_vector", np.float32, STATE_SHAPE,
+                                                           NetworkInputType.RAM),
+                         replay_memory_access=cls.memory,
+                         is_distribution_enabled=True,
+                         strategy=cls.strategy)
+
+    def tearDown(self):
+        self.network._max_in_flight_steps = 0
+
+    def test_pipelined_steps_are_joined(self):
+        self.network._max_in_flight_steps = MAX_IN_FLIGHT_STEPS
+        for _ in range(MAX_IN_FLIGHT_STEPS * 2):
+            self.network.train_batch()
+        self.assertEqual(MAX_IN_FLIGHT_STEPS, len(self.network._in_flight_losses))
+        self.network.join()
+        self.assertEqual(0, len(self.network._in_flight_losses))
+        self.assertTrue(np.isfinite(self.network._last_loss))
+
+    def test_jit_compile_fallback(self):
+        network = QNetwork(name="JitQNetwork")
+        network._jit_compile_enabled = True
+        with self.assertLogs(network._log, level="WARNING") as logs:
+            network.init(output_descriptor=self.network._network_output_descriptor,
+                         input_descriptor=self.network.input_descriptor,
+                         replay_memory_access=self.memory,
+                         is_distribution_enabled=True,
+                         strategy=self.strategy)
+        # the forward pass and the train step are not compiled on the parameter servers' variables
+        self.assertEqual(2, len(logs.records))
+        self.assertTrue(all("parameter servers" in output for output in logs.output))
+        network.train_batch()
+        network.join()
+        self.assertTrue(np.isfinite(network._last_loss))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework import KatherineApplication, RunStateSerializer, TrajectoryRecorder, KatState, testing
+from kat_framework import TrajectoryReader, INITIAL_RECORD, ACTIVE_RECORD, FINAL_RECORD
+from kat_framework.drivers.state import KatStatePool
+from kat_framework.serialization.trajectory import WORKING_DIRECTORY_PREFIX as TRAJECTORY_DIRECTORY
+from kat_framework.util import fileio
+from kat_framework.agents.greedy import GreedyAgent
+from kat_framework.config.config_props import KatConfigurationProperty
+from kat_framework.monitor.properties import KatMetrics
+from kat_framework.drivers.episode import PHASE_METRICS
+from kat_api import StateType
+import tensorflow as tf
+import tempfile
+import unittest
+import os
+
+
+FACTORY_CLASS = "kat_framework.core.factory.KatFactory"
+CONFIG_CLASS = "kat_framework.config.config_handler.YamlConfigHandler"
+DRIVER_CONFIG_URI = "file://localhost/scenarios/driver"
+VECTOR_CONFIG_URI = "file://localhost/scenarios/driver/vector"
+ACTOR_POOL_CONFIG_URI = "file://localhost/scenarios/driver/actorpool"
+PIPELINE_CONFIG_URI = "file://localhost/scenarios/driver/pipeline"
+EVALUATION_CONFIG_URI = "file://localhost/scenarios/driver/evaluation"
+WARM_UP_CONFIG_URI = "file://localhost/scenarios/driver/warmup"
+EVALUATION_EPISODES = 4
+MAX_EPISODES = 4
+EPISODE_LENGTH = 7
+VECTOR_ENVIRONMENTS = 3
+OBSERVE_EPISODES = 2
+TICKS_FINISHED_STEP = 3
+
+
+def build_driver(config_uri):
+    testing.reset_application_config()
+    KatherineApplication.init(FACTORY_CLASS, CONFIG_CLASS, config_uri)
+    return KatherineApplication.get_application_factory().build_driver()
+
+
+def count_train_steps(driver):
+    train_steps = []
+    perform_train_step = driver._perform_train_step
+
+    def counted_train_step(current_episode, current_step):
+        train_steps.append(current_step)
+        perform_train_step(current_episode, current_step)
+
+    driver._perform_train_step = counted_train_step
+    return train_steps
+
+
+def count_calls(target, name):
+    calls = []
+    function = getattr(target, name)
+
+    def counted_function(*args):
+        calls.append(args)
+        return function(*args)
+
+    setattr(target, name, counted_function)
+    return calls
+
+
+def collect_metrics(driver):
+    metrics = {}
+    update_metric = driver._metrics.update_metric
+
+    def collected_update_metric(metadata, data):
+        metrics.setdefault(metadata, []).append(data)
+        update_metric(metadata, data)
+
+    driver._metrics.update_metric = collected_update_metric
+    return metrics
+
+
+def track_observations(game, emitted_observations, released_observations):
+    for name in ("reset", "make_action", "get_current_observation"):
+        function = getattr(game, name)
+
+        def emitting_function(*args, function=function):
+            result = function(*args)
+            emitted_observations.append(result[0] if isinstance(result, tuple) else result)
+            return result
+
+        setattr(game, name, emitting_function)
+    release_observation = game.release_observation
+
+    def tracked_release_observation(observation):
+        released_observations.append(observation)
+        release_observation(observation)
+
+    game.release_observation = tracked_release_observation
+
+
+class CollectingStatePool(KatStatePool):
+    """
+    State pool, which collects the acquired states.
+    """
+    def __init__(self):
+        super(CollectingStatePool, self).__init__()
+        self.acquired_states = []
+
+    def acquire(self, *args):
+        self.acquired_states.append(super(CollectingStatePool, self).acquire(*args))
+        return self.acquired_states[-1]
+
+
+class DriverTestCase(unittest.TestCase):
+    """
+    Base class of the driver tests, the scenario's configuration handler is dropped after the tests.
+    """
+    def tearDown(self):
+        testing.reset_application_config()
+
+    def assert_released(self, games, driver):
+        """
+        Runs the driver, every observation emitted by the games must be released once.
+        """
+        emitted_observations, released_observations = [], []
+        for game in games:
+            track_observations(game, emitted_observations, released_observations)
+        driver.run()
+        self.assertGreater(len(emitted_observations), 0)
+        self.assertEqual(len(released_observations), len(set(map(id, released_observations))))
+        self.assertEqual(set(map(id, emitted_observations)), set(map(id, released_observations)))
+
+    def assert_resumed(self, config_uri):
+        """
+        Runs the scenario with run states, then resumes it for two more episodes.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        driver = build_driver(config_uri)
+        # not scoped by the (per process) run tag
+        run_tag = KatherineApplication.get_application_config().get_config_property(
+            KatConfigurationProperty.RUN_TAG, KatConfigurationProperty.RUN_TAG.prop_type)
+        self.assertNotIn(run_tag, driver._run_state_serializer._work_directory)
+        driver._run_state_frequency = 2
+        driver._run_state_serializer = RunStateSerializer(1, directory.name)
+        driver.run()
+        resumed_driver = build_driver(config_uri)
+        resumed_driver._max_episodes = MAX_EPISODES + 2
+        resumed_driver._run_state_serializer = RunStateSerializer(1, directory.name)
+        train_steps = count_train_steps(resumed_driver)
+        resumed_driver.run()
+        self.assertEqual((MAX_EPISODES, MAX_EPISODES * EPISODE_LENGTH),
+                         (resumed_driver._start_episode, resumed_driver._start_step))
+        self.assertEqual(list(range(MAX_EPISODES * EPISODE_LENGTH, (MAX_EPISODES + 2) * EPISODE_LENGTH)),
+                         train_steps)
+
+
+class EpisodeDriverTest(DriverTestCase):
+    """
+    Synthetic game, with a small Q network.
+    """
+    def test_phase_timing(self):
+        testing.reset_application_config()
+        KatherineApplication.init(FACTORY_CLASS, CONFIG_CLASS, DRIVER_CONFIG_URI)
+        KatherineApplication.get_application_config().settings["global"]["phase_timing_enabled"] = True
+        driver = KatherineApplication.get_application_factory().build_driver()
+        metrics = collect_metrics(driver)
+        driver.run()
+        # make_action, process_ticks, preprocess, predict, store_transition and train_step
+        for mean_metric, p99_metric in PHASE_METRICS.values():
+            self.assertEqual(MAX_EPISODES, len(metrics[mean_metric]))
+            self.assertTrue(all(0.0 <= mean <= p99 for mean, p99 in zip(metrics[mean_metric], metrics[p99_metric])))
+
+
+class VectorEpisodeDriverTest(DriverTestCase):
+    """
+    Lockstep synthetic games, with a small Q network.
+    """
+    def test_resume(self):
+        self.assert_resumed(VECTOR_CONFIG_URI)
+
+    def test_resume_other_configuration(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        driver = build_driver(VECTOR_CONFIG_URI)
+        driver._run_state_frequency = 2
+        driver._run_state_serializer = RunStateSerializer(1, directory.name)
+        driver.run()
+        testing.reset_application_config()
+        KatherineApplication.init(FACTORY_CLASS, CONFIG_CLASS, VECTOR_CONFIG_URI)
+        KatherineApplication.get_application_config().settings["agent"]["memory_max_size"] = 32
+        resumed_driver = KatherineApplication.get_application_factory().build_driver()
+        self.assertNotEqual(driver._run_state_fingerprint, resumed_driver._run_state_fingerprint)
+        resumed_driver._run_state_serializer = RunStateSerializer(1, directory.name)
+        with self.assertRaises(RuntimeError):
+            resumed_driver.run()
+
+    def test_replay_ratio(self):
+        driver = build_driver(VECTOR_CONFIG_URI)
+        train_steps = count_train_steps(driver)
+        driver.run()
+        # one train step per environment step, with distinct global steps
+        self.assertEqual(MAX_EPISODES * EPISODE_LENGTH, len(train_steps))
+        self.assertEqual(list(range(MAX_EPISODES * EPISODE_LENGTH)), train_steps)
+
+    def test_state_pool(self):
+        driver = build_driver(VECTOR_CONFIG_URI)
+        driver._state_pool = CollectingStatePool()
+        driver.run()
+        states = driver._state_pool.acquired_states
+        # one state per step and environment, reused after the transitions are stored
+        self.assertEqual(MAX_EPISODES * EPISODE_LENGTH, len(states))
+        self.assertGreaterEqual(VECTOR_ENVIRONMENTS + 1, len(set(map(id, states))))
+
+
+    def test_release_observations(self):
+        driver = build_driver(VECTOR_CONFIG_URI)
+        self.assert_released(driver._games, driver)
+
+
+    def test_trajectory_recording(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        testing.reset_application_config()
+        KatherineApplication.init(FACTORY_CLASS, CONFIG_CLASS, VECTOR_CONFIG_URI)
+        settings = KatherineApplication.get_application_config().settings
+        settings["global"]["work_directory"] = directory.name
+        settings["driver"]["trajectory_recording_enabled"] = True
+        driver = KatherineApplication.get_application_factory().build_driver()
+        driver.run()
+        records = list(TrajectoryReader(fileio.build_work_directory(TRAJECTORY_DIRECTORY)))
+        # the episodes of the lockstep environments are not interleaved
+        episode_types = [INITIAL_RECORD] + [ACTIVE_RECORD] * (EPISODE_LENGTH - 1) + [FINAL_RECORD]
+        self.assertEqual(episode_types * MAX_EPISODES, [record_type for *_, record_type in records])
+        self.assertEqual(([False] * (EPISODE_LENGTH - 1) + [True, True]) * MAX_EPISODES,
+                         [terminal for _, _, _, terminal, _ in records])
+
+
+class ActorPoolEpisodeDriverTest(DriverTestCase):
+    """
+    Synthetic games simulated by the actor pool's worker processes, with a small Q network.
+    """
+    def test_resume(self):
+        self.assert_resumed(ACTOR_POOL_CONFIG_URI)
+
+
+class PipelinedEpisodeDriverTest(DriverTestCase):
+    """
+    Synthetic games played by the pipelined driver, with a small Q network.
+    """
+    def test_pipeline(self):
+        driver = build_driver(PIPELINE_CONFIG_URI)
+        train_steps = count_train_steps(driver)
+        metrics = collect_metrics(driver)
+        reported_episodes = []
+        report = driver._report
+
+        def recorded_report(episode, score):
+            reported_episodes.append((episode, score))
+            report(episode, score)
+
+        driver._report = recorded_report
+        driver.run()
+        # every transition is stored and trained, in the order of the steps
+        self.assertEqual(MAX_EPISODES * EPISODE_LENGTH, driver._agent._replay_memory.get_number_of_frames())
+        self.assertEqual(list(range(MAX_EPISODES * EPISODE_LENGTH)), train_steps)
+        self.assertEqual(list(range(1, MAX_EPISODES + 1)), sorted(episode for episode, _ in reported_episodes))
+        # the reset of the last episode is awaited, and the executors are shut down
+        self.assertEqual(0, len(driver._pending_resets))
+        for executor in (driver._simulation_executor, driver._agent_executor,
+                         driver._training_executor, driver._reset_executor):
+            self.assertTrue(executor._shutdown)
+            self.assertFalse(any(thread.is_alive() for thread in executor._threads))
+        for metric in (KatMetrics.TENSORFLOW_PIPELINE_ACTING_UTILIZATION,
+                       KatMetrics.TENSORFLOW_PIPELINE_SIMULATION_UTILIZATION,
+                       KatMetrics.TENSORFLOW_PIPELINE_TRAINING_UTILIZATION):
+            self.assertEqual(MAX_EPISODES, len(metrics[metric]))
+            self.assertTrue(all(0.0 <= utilization <= 1.0 for utilization in metrics[metric]))
+
+    def test_release_observations(self):
+        driver = build_driver(PIPELINE_CONFIG_URI)
+        # including the prefetched resets after the last episodes
+        self.assert_released((driver._game, driver._spare_game), driver)
+
+
+class WarmUpTest(DriverTestCase):
+    """
+    Observing episodes of the synthetic game, played by the agent's fast warm-up.
+    """
+    def assert_terminals(self, driver, episode_length, number_of_transitions):
+        terminals = driver._agent._replay_memory.get_all()[4][:number_of_transitions]
+        expected_terminals = [(i + 1) % episode_length == 0 for i in range(number_of_transitions)]
+        self.assertEqual(expected_terminals, terminals.tolist())
+
+    def test_warm_up(self):
+        driver = build_driver(WARM_UP_CONFIG_URI)
+        train_steps = count_train_steps(driver)
+        warm_ups = count_calls(driver._agent, "warm_up")
+        actions = count_calls(driver._agent, "take_action")
+        driver.run()
+        self.assertEqual(1, len(warm_ups))
+        # the main loop continues after the observing episodes
+        self.assertEqual((OBSERVE_EPISODES, OBSERVE_EPISODES * EPISODE_LENGTH),
+                         (driver._start_episode, driver._start_step))
+        self.assertEqual((MAX_EPISODES - OBSERVE_EPISODES) * EPISODE_LENGTH, len(actions))
+        self.assertEqual(list(range(OBSERVE_EPISODES * EPISODE_LENGTH, MAX_EPISODES * EPISODE_LENGTH)),
+                         train_steps)
+        self.assertEqual(MAX_EPISODES * EPISODE_LENGTH, driver._agent._replay_memory.get_number_of_frames())
+        self.assert_terminals(driver, EPISODE_LENGTH, MAX_EPISODES * EPISODE_LENGTH)
+
+    def test_max_steps(self):
+        driver = build_driver(WARM_UP_CONFIG_URI)
+        driver._max_steps = 3
+        driver.run()
+        # the episodes are ended after (max steps + 1) transitions, like in the main loop
+        self.assertEqual((OBSERVE_EPISODES, OBSERVE_EPISODES * 4), (driver._start_episode, driver._start_step))
+        self.assertEqual(MAX_EPISODES * 4, driver._agent._replay_memory.get_number_of_frames())
+        self.assert_terminals(driver, 4, MAX_EPISODES * 4)
+
+    def test_max_episodes(self):
+        driver = build_driver(WARM_UP_CONFIG_URI)
+        driver._max_episodes = 1
+        actions = count_calls(driver._agent, "take_action")
+        driver.run()
+        # the observing episodes are limited by the run
+        self.assertEqual((1, EPISODE_LENGTH), (driver._start_episode, driver._start_step))
+        self.assertEqual(0, len(actions))
+        self.assertEqual(EPISODE_LENGTH, driver._agent._replay_memory.get_number_of_frames())
+
+    def test_finished_by_ticks(self):
+        memories = []
+        for fast_warm_up_enabled in (False, True):
+            testing.reset_application_config()
+            KatherineApplication.init(FACTORY_CLASS, CONFIG_CLASS, WARM_UP_CONFIG_URI)
+            KatherineApplication.get_application_config().settings["driver"]["fast_warm_up_enabled"] = \
+                fast_warm_up_enabled
+            driver = KatherineApplication.get_application_factory().build_driver()
+            driver._max_episodes = OBSERVE_EPISODES
+            game = driver._game
+            process_ticks = game.process_ticks
+
+            def finishing_process_ticks(num_of_ticks, game=game, process_ticks=process_ticks):
+                process_ticks(num_of_ticks)
+                if game._current_step == TICKS_FINISHED_STEP:
+                    game._current_step = EPISODE_LENGTH
+
+            game.process_ticks = finishing_process_ticks
+            driver.run()
+            memories.append(driver._agent._replay_memory)
+        # the same episodes are stored by the warm-up and the main loop, without terminal transitions
+        for memory in memories:
+            self.assertEqual(OBSERVE_EPISODES * TICKS_FINISHED_STEP, memory.get_number_of_frames())
+            self.assertFalse(memory.get_all()[4][:OBSERVE_EPISODES * TICKS_FINISHED_STEP].any())
+
+    def test_resume(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        driver = build_driver(WARM_UP_CONFIG_URI)
+        driver._run_state_frequency = 2
+        driver._run_state_serializer = RunStateSerializer(1, directory.name)
+        driver.run()
+        resumed_driver = build_driver(WARM_UP_CONFIG_URI)
+        resumed_driver._max_episodes = MAX_EPISODES + 2
+        resumed_driver._run_state_serializer = RunStateSerializer(1, directory.name)
+        warm_ups = count_calls(resumed_driver._agent, "warm_up")
+        train_steps = count_train_steps(resumed_driver)
+        resumed_driver.run()
+        self.assertEqual(0, len(warm_ups))
+        self.assertEqual((MAX_EPISODES, MAX_EPISODES * EPISODE_LENGTH),
+                         (resumed_driver._start_episode, resumed_driver._start_step))
+        self.assertEqual(list(range(MAX_EPISODES * EPISODE_LENGTH, (MAX_EPISODES + 2) * EPISODE_LENGTH)),
+                         train_steps)
+
+    def test_prefill(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        driver = build_driver(WARM_UP_CONFIG_URI)
+        game = driver._game
+        game.init()
+        recorder = TrajectoryRecorder(game.get_observation_space_desc(), game.get_action_space_desc(),
+                                      16, 2, work_directory=directory.name)
+        recorder.start()
+        state = KatState(1, game.reset(), StateType.INITIAL_STATE)
+        while not game.is_episode_finished():
+            state.set_transition(0)
+            observation, reward = game.make_action(0)
+            state.set_transitioned_observation(observation)
+            state.set_reward(reward)
+            if game.is_episode_finished():
+                state.state_type = StateType.END_STATE
+            recorder.record(state)
+            state = KatState(1, observation, StateType.ACTIVE_STATE)
+        recorder.close()
+        KatherineApplication.get_application_config().settings["agent"]["memory_prefill_directory"] = \
+            directory.name
+        train_steps = count_train_steps(driver)
+        driver.run()
+        # the recorded episode replaces the observing episodes
+        self.assertEqual((0, 0), (driver._start_episode, driver._start_step))
+        self.assertEqual(list(range(MAX_EPISODES * EPISODE_LENGTH)), train_steps)
+        self.assertEqual((MAX_EPISODES + 1) * EPISODE_LENGTH, driver._agent._replay_memory.get_number_of_frames())
+        self.assert_terminals(driver, EPISODE_LENGTH, (MAX_EPISODES + 1) * EPISODE_LENGTH)
+
+
+class EvaluationDriverTest(DriverTestCase):
+    """
+    Greedy episodes of a persisted model, played by the evaluation driver's worker processes.
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.driver = build_driver(EVALUATION_CONFIG_URI)
+
+    def tearDown(self):
+        self.driver.close()
+        self.directory.cleanup()
+        super(EvaluationDriverTest, self).tearDown()
+
+    def build_agent(self):
+        game = KatherineApplication.get_application_factory().build_game()
+        game.init()
+        agent = GreedyAgent()
+        agent.init(game.get_observation_space_desc(), game.get_action_space_desc())
+        return agent
+
+    def test_greedy_agent(self):
+        agent = self.build_agent()
+        model_path = os.path.join(self.directory.name, "model.keras")
+        checkpoint_path = os.path.join(self.directory.name, "model.weights.h5")
+        model = agent._network._network_model
+        tf.keras.models.save_model(model, model_path)
+        model.save_weights(checkpoint_path)
+        # inference only, neither replay memory nor optimizer state
+        self.assertIsNone(agent._network._replay_memory)
+        self.assertIsNone(agent._network._per_worker_dataset)
+        self.assertFalse(agent._network._optimizer.built)
+        self.assertEqual(0.0, agent.train())
+        other_agent = self.build_agent()
+        other_agent.restore_model(model_path)
+        other_agent.restore_checkpoint(checkpoint_path)
+        for weights, other_weights in zip(model.get_weights(), other_agent._network._network_model.get_weights()):
+            self.assertTrue((weights == other_weights).all())
+
+    def test_evaluation(self):
+        model_path = os.path.join(self.directory.name, "model.keras")
+        tf.keras.models.save_model(self.build_agent()._network._network_model, model_path)
+        metrics = collect_metrics(self.driver)
+        for _ in range(2):
+            result = self.driver.evaluate(model_path)
+            # each step of the synthetic episodes is rewarded
+            self.assertEqual(EVALUATION_EPISODES, result.number_of_episodes)
+            self.assertEqual(EVALUATION_EPISODES * EPISODE_LENGTH, result.total_steps)
+            self.assertEqual([EPISODE_LENGTH] * EVALUATION_EPISODES, result.episode_lengths.tolist())
+            self.assertEqual(float(EPISODE_LENGTH), result.score_mean)
+            self.assertEqual(0.0, result.score_std)
+            self.assertEqual(result.score_min, result.score_max)
+        self.assertEqual(2, len(metrics[KatMetrics.TENSORFLOW_EVALUATION_SCORE_MEAN]))
+        self.assertEqual(2, len(metrics[KatMetrics.TENSORFLOW_EVALUATION_STEPS_PER_SEC]))
+
+
+if __name__ == "__main__":
+    unittest.main()
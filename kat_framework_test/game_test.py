@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework import KatherineApplication, testing
+from kat_framework.games.katherine.synthetic import SyntheticGame
+from kat_framework.games.openai.openai import OpenAI, OpenAIGame, OpenAIObservation
+from kat_framework.games.vizdoom.zdoom import ViZDoomGame, DoomObservation, ENGINE_BUFFER_SWITCHES
+from unittest import mock
+import numpy as np
+import unittest
+import tempfile
+import vizdoom
+import os
+
+FACTORY_CLASS = "kat_framework.core.factory.KatFactory"
+CONFIG_CLASS = "kat_framework.config.config_handler.YamlConfigHandler"
+CONFIG_URI = "file://localhost/scenarios/game"
+DOOM_SCENARIO_PATH = os.path.join(vizdoom.scenarios_path, "basic.wad")
+ACTION_REPEAT = 4
+NOOP_ACTION = [0, 0, 0]
+
+
+class FlickeringEnvironment:
+    """
+    Gym environment stub, the objects of the frames are visible in every second step only,
+    the reward of a step is its number.
+    """
+    def __init__(self, episode_length):
+        self.episode_length = episode_length
+        self.steps = 0
+
+    def step(self, action):
+        self.steps += 1
+        frame = np.zeros((2, 2, 3), dtype=np.uint8)
+        frame[self.steps % 2] = self.steps
+        return frame, float(self.steps), self.steps >= self.episode_length, {}
+
+
+class CountingGameState:
+    """
+    Game state proxy, counts the attribute reads.
+    """
+    def __init__(self, game_state):
+        self.game_state = game_state
+        self.reads = []
+
+    def __getattr__(self, name):
+        self.reads.append(name)
+        return getattr(self.game_state, name)
+
+
+def build_doom_game(directory, is_selective=True):
+    game = ViZDoomGame()
+    if not is_selective:
+        game._observed_fields = None
+    init_config = game._init_config
+
+    def init_config_with_scenario():
+        init_config()
+        game._game_instance.set_doom_scenario_path(DOOM_SCENARIO_PATH)
+        game._game_instance.set_doom_config_path(os.path.join(directory, "_vizdoom.ini"))
+
+    game._init_config = init_config_with_scenario
+    game.init()
+    return game
+
+
+def build_openai_game(episode_length):
+    # not initialized, the stub replaces the gym environment
+    game = OpenAI()
+    game._game_spec = OpenAIGame.BREAKOUT_V0
+    game._game_instance = FlickeringEnvironment(episode_length)
+    game._render_enabled = False
+    return game
+
+
+class GameTestCase(unittest.TestCase):
+    """
+    Base class of the game wrapper tests, the scenario's configuration handler is dropped after the tests.
+    """
+    def setUp(self):
+        testing.reset_application_config()
+        KatherineApplication.init(FACTORY_CLASS, CONFIG_CLASS, CONFIG_URI)
+
+    def tearDown(self):
+        testing.reset_application_config()
+
+
+class ActionRepeatTest(GameTestCase):
+    """
+    Repeated actions of the generic, the OpenAI and the ViZDoom implementations.
+    """
+    def test_generic_repeat(self):
+        game = SyntheticGame()
+        game.init()
+        game.reset()
+        with mock.patch.object(game, "_make_action", wraps=game._make_action) as make_action:
+            self.assertEqual(float(ACTION_REPEAT), game.make_action([1, 0, 0, 0])[1])
+            # stops at the end of the episode
+            self.assertEqual(2.0, game.make_action([1, 0, 0, 0])[1])
+        self.assertTrue(game.is_episode_finished())
+        self.assertEqual(6, make_action.call_count)
+        self.assertEqual(6.0, game.get_total_score())
+
+    def test_openai_repeat(self):
+        game = build_openai_game(episode_length=6)
+        game._max_pooling_enabled = True
+        with mock.patch("kat_framework.games.openai.openai.OpenAIObservation", wraps=OpenAIObservation) as observation:
+            first_observation, reward = game.make_action(1)
+            self.assertEqual(1.0 + 2.0 + 3.0 + 4.0, reward)
+            # only the last observation is built, from the last two frames
+            self.assertEqual(1, observation.call_count)
+            np.testing.assert_array_equal([[[4] * 3] * 2, [[3] * 3] * 2], first_observation.screen_buffer)
+            # stops at the end of the episode
+            second_observation, reward = game.make_action(1)
+            self.assertEqual(5.0 + 6.0, reward)
+            self.assertEqual(2, observation.call_count)
+            np.testing.assert_array_equal([[[6] * 3] * 2, [[5] * 3] * 2], second_observation.screen_buffer)
+        self.assertTrue(game.is_episode_finished())
+        self.assertEqual(6, game._game_instance.steps)
+        self.assertEqual(21.0, game.get_total_score())
+
+    def test_openai_repeat_without_max_pooling(self):
+        game = build_openai_game(episode_length=6)
+        observation, reward = game.make_action(1)
+        self.assertEqual(10.0, reward)
+        np.testing.assert_array_equal([[[4] * 3] * 2, [[0] * 3] * 2], observation.screen_buffer)
+
+    def test_doom_repeat(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        game = build_doom_game(directory.name)
+        game.reset()
+        with mock.patch("kat_framework.games.vizdoom.zdoom.DoomObservation", wraps=DoomObservation) as observation:
+            rewards = []
+            while not game.is_episode_finished():
+                start_time = game._game_instance.get_episode_time()
+                rewards.append(game.make_action(NOOP_ACTION)[1])
+                if not game.is_episode_finished():
+                    self.assertEqual(start_time + ACTION_REPEAT, game._game_instance.get_episode_time())
+        game._game_instance.close()
+        # living reward per tic, the last repeat is cut by the episode timeout
+        self.assertEqual([-4.0, -4.0, -2.0], rewards)
+        # one observation per repeated action, the finished episode has no state
+        self.assertEqual(2, observation.call_count)
+
+
+class DoomObservationTest(GameTestCase):
+    """
+    Lazy, selective observations of the headless ViZDoom game.
+    """
+    def setUp(self):
+        super(DoomObservationTest, self).setUp()
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+        super(DoomObservationTest, self).tearDown()
+
+    def play_game(self, is_selective=True):
+        game = build_doom_game(self.directory.name, is_selective)
+        self.addCleanup(game._game_instance.close)
+        game.reset()
+        return game
+
+    def test_lazy_fetching(self):
+        game = self.play_game()
+        game_state = CountingGameState(game._game_instance.get_state())
+        observation = DoomObservation(game_state, frozenset(["screen_buffer"]))
+        self.assertEqual(["number"], game_state.reads)
+        screen_buffer = observation.screen_buffer
+        self.assertEqual((120, 160, 3), screen_buffer.shape)
+        # cached in the slot after the first access
+        self.assertIs(screen_buffer, observation.screen_buffer)
+        self.assertEqual(["number", "screen_buffer"], game_state.reads)
+
+    def test_not_observed_fields(self):
+        game = self.play_game()
+        observation = game.get_current_observation()
+        self.assertIsNotNone(observation.screen_buffer)
+        for name in ("depth_buffer", "label_buffer", "automap_buffer", "game_variables", "no_such_field"):
+            self.assertRaises(AttributeError, getattr, observation, name)
+        all_fields = DoomObservation(game._game_instance.get_state())
+        self.assertIsNotNone(all_fields.game_variables)
+        self.assertRaises(AttributeError, getattr, all_fields, "no_such_field")
+
+    def test_selective_observation_space(self):
+        game = self.play_game()
+        self.assertEqual(["screen_buffer"], [desc.get_display_name() for desc in game.get_observation_space_desc()])
+        # none of the unused engine buffers are rendered
+        for switch in ENGINE_BUFFER_SWITCHES:
+            self.assertFalse(getattr(game._game_instance, switch.replace("set_", "is_", 1))())
+        game = self.play_game(is_selective=False)
+        display_names = [desc.get_display_name() for desc in game.get_observation_space_desc()]
+        self.assertIn("screen_buffer", display_names)
+        self.assertIn("depth_buffer", display_names)
+        self.assertTrue(game._game_instance.is_depth_buffer_enabled())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework import KatherineApplication
+import numpy as np
+import time
+
+FACTORY_CLASS = "kat_framework.core.factory.KatFactory"
+CONFIG_CLASS = "kat_framework.config.config_handler.YamlConfigHandler"
+CONFIG_URI = "file://localhost/scenarios/benchmark"
+NUM_OF_WARMUP_CALLS = 100
+NUM_OF_CALLS = 2000
+
+
+def batched_predict(network, observation):
+    """
+    The former actor path, a single element batch through `predict` and a host side argmax.
+    """
+    policy = network.predict(np.array([observation]))
+    return int(np.argmax(policy.numpy()))
+
+
+def compiled_predict_action(network, observation):
+    """
+    The compiled actor path.
+    """
+    return network.predict_action(observation)
+
+
+def measure(name, fn, network, observation):
+    """
+    Measures the per call latency of the specified actor path.
+    """
+    for _ in range(NUM_OF_WARMUP_CALLS):
+        fn(network, observation)
+    latencies = np.empty((NUM_OF_CALLS,), dtype=np.float64)
+    for i in range(NUM_OF_CALLS):
+        start = time.perf_counter()
+        fn(network, observation)
+        latencies[i] = time.perf_counter() - start
+    latencies *= 1e6
+    print("{:<24} mean: {:>9.1f} us  p50: {:>9.1f} us  p99: {:>9.1f} us".format(
+        name, latencies.mean(), np.percentile(latencies, 50), np.percentile(latencies, 99)))
+
+
+def main():
+    """
+    Single observation inference latency, "predict + argmax" vs "predict_action".
+    """
+    KatherineApplication.init(FACTORY_CLASS, CONFIG_CLASS, CONFIG_URI)
+    factory = KatherineApplication.get_application_factory()
+    game = factory.build_game()
+    game.init()
+    agent = factory.build_agent()
+    agent.init(game.get_observation_space_desc(), game.get_action_space_desc())
+    network = agent._network
+    input_desc = network.input_descriptor
+    observation = np.random.rand(*input_desc.get_tensor_shape()).astype(input_desc.get_data_type())
+    if batched_predict(network, observation) != compiled_predict_action(network, observation):
+        raise RuntimeError("Actor paths are not equivalent.")
+    measure("predict + argmax", batched_predict, network, observation)
+    measure("predict_action", compiled_predict_action, network, observation)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+
+from kat_framework import KatherineApplication, InferenceServer, RandomActionNetwork, TensorDescriptor
+from kat_api import NetworkInputType
+import numpy as np
+import threading
+import unittest
+import time
+
+
+FACTORY_CLASS = "kat_framework.core.factory.KatFactory"
+CONFIG_CLASS = "kat_framework.config.config_handler.YamlConfigHandler"
+CONFIG_URI = "file://localhost/scenarios/test"
+NUM_OF_ACTORS = 8
+NUM_OF_REQUESTS = 50
+LONG_LATENCY = 5.0
+
+
+class InferenceServerTest(unittest.TestCase):
+    """
+    Concurrent actors against the batched inference server, with a random network.
+    """
+    def setUp(self):
+        KatherineApplication.init(FACTORY_CLASS, CONFIG_CLASS, CONFIG_URI)
+        network = RandomActionNetwork()
+        network.init(output_descriptor=TensorDescriptor("network_output", np.float32, (4,), NetworkInputType.NONE),
+                     input_descriptor=TensorDescriptor("ram_vector", np.float32, (3,), NetworkInputType.RAM))
+        self.server = InferenceServer()
+        self.server.init(network)
+        self.server.start()
+        self.max_latency = self.server._max_latency
+
+    def tearDown(self):
+        self.server.stop()
+        self.server._max_latency = self.max_latency
+
+    def test_concurrent_actors(self):
+        policies = []
+
+        def actor():
+            for _ in range(NUM_OF_REQUESTS):
+                policies.append(self.server.predict(np.zeros((3,), dtype=np.float32)))
+
+        for _ in range(NUM_OF_ACTORS):
+            self.server.register_actor()
+        actors = [threading.Thread(target=actor) for _ in range(NUM_OF_ACTORS)]
+        [a.start() for a in actors]
+        [a.join() for a in actors]
+        queue_depths, batch_sizes = self.server.pop_statistics()
+        self.assertEqual(NUM_OF_ACTORS * NUM_OF_REQUESTS, len(policies))
+        self.assertTrue(all(p.shape == (4,) for p in policies))
+        self.assertEqual(NUM_OF_ACTORS * NUM_OF_REQUESTS, int(batch_sizes.sum()))
+        self.assertEqual(len(batch_sizes), len(queue_depths))
+        self.assertEqual(0, len(self.server.pop_statistics()[1]))
+
+    def test_lone_actor_is_not_delayed(self):
+        self.server._max_latency = LONG_LATENCY
+        self.server.register_actor()
+        self.assertEqual(1, self.server.get_num_of_actors())
+        start = time.monotonic()
+        for _ in range(NUM_OF_REQUESTS):
+            self.server.predict(np.zeros((3,), dtype=np.float32))
+        self.assertLess(time.monotonic() - start, LONG_LATENCY)
+        _, batch_sizes = self.server.pop_statistics()
+        self.assertTrue(np.all(batch_sizes == 1))
+        self.server.unregister_actor()
+        self.assertRaises(RuntimeError, self.server.unregister_actor)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework import KatherineApplication, testing
+import numpy as np
+
+FACTORY_CLASS = "kat_framework.core.factory.KatFactory"
+CONFIG_CLASS = "kat_framework.config.config_handler.YamlConfigHandler"
+CONFIG_URI = "file://localhost/scenarios/benchmark"
+MEMORY_SIZE = 256
+NUM_OF_WARMUP_CALLS = 10
+NUM_OF_ACTION_CALLS = 1000
+NUM_OF_TRAIN_CALLS = 100
+
+
+def report(name, latencies):
+    """
+    Prints the latency statistics of a measured function.
+    """
+    latencies = latencies * 1e6
+    print("{:<24} mean: {:>9.1f} us  p50: {:>9.1f} us  p99: {:>9.1f} us".format(
+        name, latencies.mean(), np.percentile(latencies, 50), np.percentile(latencies, 99)))
+
+
+def main():
+    """
+    Actor latency and train step time of the benchmark's conv network, plain graph vs XLA compiled.
+    """
+    KatherineApplication.init(FACTORY_CLASS, CONFIG_CLASS, CONFIG_URI)
+    factory = KatherineApplication.get_application_factory()
+    game = factory.build_game()
+    game.init()
+    agent = factory.build_agent()
+    agent.init(game.get_observation_space_desc(), game.get_action_space_desc())
+    input_desc = agent._network.input_descriptor
+    output_desc = agent._network._network_output_descriptor
+    observation = np.random.rand(*input_desc.get_tensor_shape()).astype(input_desc.get_data_type())
+    memory = testing.build_random_memory(input_desc.get_tensor_shape(), MEMORY_SIZE,
+                                         output_desc.get_tensor_shape()[-1])
+    for jit_compile_enabled in (False, True):
+        network = testing.build_network(input_desc, output_desc, memory, jit_compile_enabled=jit_compile_enabled)
+        label = "xla" if jit_compile_enabled else "graph"
+        report("{} predict_action".format(label),
+               testing.measure(lambda: network.predict_action(observation), NUM_OF_ACTION_CALLS, NUM_OF_WARMUP_CALLS))
+        report("{} train_batch".format(label),
+               testing.measure(lambda: float(network.train_batch()), NUM_OF_TRAIN_CALLS, NUM_OF_WARMUP_CALLS))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework import UniformMemory, TensorDescriptor
+import numpy as np
+import tempfile
+import threading
+import unittest
+
+MEMORY_MAX_SIZE = 8
+STATE_SHAPE = (2, 2)
+
+
+class UniformMemoryTest(unittest.TestCase):
+    """
+    Batched transition writes of the circular replay memory.
+    """
+    def setUp(self):
+        self.memory = UniformMemory()
+        self.memory.init(
+            (TensorDescriptor('s1_states', np.float32, (MEMORY_MAX_SIZE, *STATE_SHAPE)),
+             TensorDescriptor('action_ids', np.int32, (MEMORY_MAX_SIZE,)),
+             TensorDescriptor('s2_states', np.float32, (MEMORY_MAX_SIZE, *STATE_SHAPE)),
+             TensorDescriptor('rewards', np.float32, (MEMORY_MAX_SIZE,)),
+             TensorDescriptor('terminals', np.bool, (MEMORY_MAX_SIZE,))))
+
+    def add_batch(self, first_id, batch_size):
+        ids = np.arange(first_id, first_id + batch_size)
+        states = np.broadcast_to(ids[:, None, None], (batch_size, *STATE_SHAPE)).astype(np.float32)
+        self.memory.add_transitions(states, ids.astype(np.int32), states + 1,
+                                    ids.astype(np.float32), ids % 2 == 0)
+
+    def test_batched_writes_wrap_around(self):
+        self.add_batch(0, 5)
+        self.add_batch(5, 5)
+        self.assertEqual(10, self.memory.get_number_of_frames())
+        s1_states, action_ids, s2_states, rewards, terminals = self.memory.get_all()
+        np.testing.assert_array_equal([8, 9, 2, 3, 4, 5, 6, 7], action_ids)
+        np.testing.assert_array_equal(s1_states + 1, s2_states)
+        np.testing.assert_array_equal(action_ids % 2 == 0, terminals)
+
+    def test_batch_larger_than_capacity(self):
+        self.add_batch(0, MEMORY_MAX_SIZE + 3)
+        action_ids = self.memory.get_all()[1]
+        self.assertEqual(set(range(3, MEMORY_MAX_SIZE + 3)), set(action_ids.tolist()))
+
+    def test_state_spec_mismatch(self):
+        with self.assertRaises(ValueError):
+            self.memory.add_transitions(np.zeros((1, 3, 3), dtype=np.float32), np.zeros((1,), dtype=np.int32),
+                                        np.zeros((1, 3, 3), dtype=np.float32), np.zeros((1,), dtype=np.float32),
+                                        np.zeros((1,), dtype=np.bool))
+
+    def test_target_q_cache(self):
+        self.add_batch(0, 4)
+        sample = self.memory.get_sample_with_target_q(4)
+        serials, target_q_versions = sample[5], sample[7]
+        np.testing.assert_array_equal([-1] * 4, target_q_versions)
+        self.memory.update_target_q_values(serials, sample[1].astype(np.float32), 3)
+        # the action ids of the first batch are equal to the transitions' serial numbers
+        serials, target_q_values, target_q_versions = self.memory.get_sample_with_target_q(4)[5:]
+        np.testing.assert_array_equal([3] * 4, target_q_versions)
+        np.testing.assert_array_equal(serials, target_q_values)
+        # overwriting the slots, the late update of the previous transitions is dropped
+        self.add_batch(4, MEMORY_MAX_SIZE)
+        self.memory.update_target_q_values(serials, target_q_values, 4)
+        np.testing.assert_array_equal([-1] * MEMORY_MAX_SIZE, self.memory.get_sample_with_target_q(MEMORY_MAX_SIZE)[7])
+
+    def test_overwrite_between_reads(self):
+        self.add_batch(0, MEMORY_MAX_SIZE)
+        writer = threading.Thread(target=self.add_batch, args=(MEMORY_MAX_SIZE, MEMORY_MAX_SIZE))
+        get_sample = self.memory._get_sample
+
+        def overwritten_get_sample(batch_index):
+            sample = get_sample(batch_index)
+            # the writer would overwrite every slot, before the serial numbers are read
+            writer.start()
+            writer.join(timeout=0.5)
+            return sample
+
+        self.memory._get_sample = overwritten_get_sample
+        sample = self.memory.get_sample_with_target_q(MEMORY_MAX_SIZE)
+        writer.join()
+        # the serial numbers are belonging to the sampled transitions (the action ids of the first batch)
+        np.testing.assert_array_equal(sample[1], sample[5])
+        self.memory.update_target_q_values(sample[5], sample[1].astype(np.float32), 1)
+        self.memory._get_sample = get_sample
+        np.testing.assert_array_equal([-1] * MEMORY_MAX_SIZE, self.memory.get_sample_with_target_q(MEMORY_MAX_SIZE)[7])
+
+    def test_state_round_trip(self):
+        self.add_batch(0, 10)
+        restored_memory = UniformMemory()
+        restored_memory.init(
+            (TensorDescriptor('s1_states', np.float32, (MEMORY_MAX_SIZE, *STATE_SHAPE)),
+             TensorDescriptor('action_ids', np.int32, (MEMORY_MAX_SIZE,)),
+             TensorDescriptor('s2_states', np.float32, (MEMORY_MAX_SIZE, *STATE_SHAPE)),
+             TensorDescriptor('rewards', np.float32, (MEMORY_MAX_SIZE,)),
+             TensorDescriptor('terminals', np.bool, (MEMORY_MAX_SIZE,))))
+        with tempfile.TemporaryDirectory() as directory:
+            self.memory.save_state(directory)
+            restored_memory.restore_state(directory)
+        self.assertEqual(10, restored_memory.get_number_of_frames())
+        for buffer, restored_buffer in zip(self.memory.get_all(), restored_memory.get_all()):
+            np.testing.assert_array_equal(buffer, restored_buffer)
+
+
+if __name__ == "__main__":
+    unittest.main()
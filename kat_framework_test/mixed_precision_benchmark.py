@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework import KatherineApplication, testing
+import multiprocessing
+import numpy as np
+import resource
+
+FACTORY_CLASS = "kat_framework.core.factory.KatFactory"
+CONFIG_CLASS = "kat_framework.config.config_handler.YamlConfigHandler"
+CONFIG_URI = "file://localhost/scenarios/benchmark"
+MEMORY_SIZE = 256
+NUM_OF_WARMUP_CALLS = 3
+NUM_OF_ACTION_CALLS = 200
+NUM_OF_TRAIN_CALLS = 20
+MIXED_PRECISION_POLICIES = ("float32", "mixed_bfloat16", "mixed_float16")
+
+
+def measure(mixed_precision_policy, results):
+    """
+    Measures a policy in its own process, so the peak memory usage is not shared by the policies.
+    """
+    KatherineApplication.init(FACTORY_CLASS, CONFIG_CLASS, CONFIG_URI)
+    factory = KatherineApplication.get_application_factory()
+    game = factory.build_game()
+    game.init()
+    agent = factory.build_agent()
+    agent.init(game.get_observation_space_desc(), game.get_action_space_desc())
+    input_desc = agent._network.input_descriptor
+    output_desc = agent._network._network_output_descriptor
+    observation = np.random.rand(*input_desc.get_tensor_shape()).astype(input_desc.get_data_type())
+    memory = testing.build_random_memory(input_desc.get_tensor_shape(), MEMORY_SIZE,
+                                         output_desc.get_tensor_shape()[-1])
+    # peak resident set size in KiB (on linux), before the measured networks are built
+    base_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    network = testing.build_network(input_desc, output_desc, memory, mixed_precision_policy=mixed_precision_policy)
+    # mean latencies (ms)
+    train_time = testing.measure(lambda: float(network.train_batch()), NUM_OF_TRAIN_CALLS,
+                                 NUM_OF_WARMUP_CALLS).mean() * 1e3
+    action_time = testing.measure(lambda: network.predict_action(observation), NUM_OF_ACTION_CALLS,
+                                  NUM_OF_WARMUP_CALLS).mean() * 1e3
+    peak_increase = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base_peak) / 1024
+    results.put((train_time, action_time, peak_increase))
+
+
+def main():
+    """
+    Train step time, actor latency and peak memory increase of the benchmark's conv network,
+    float32 vs the mixed precision policies.
+    """
+    context = multiprocessing.get_context("spawn")
+    for mixed_precision_policy in MIXED_PRECISION_POLICIES:
+        results = context.Queue()
+        process = context.Process(target=measure, args=(mixed_precision_policy, results))
+        process.start()
+        train_time, action_time, peak_increase = results.get()
+        process.join()
+        print("{:<16} train_batch: {:>8.2f} ms  predict_action: {:>7.3f} ms  peak memory: +{:>6.0f} MB".format(
+            mixed_precision_policy, train_time, action_time, peak_increase))
+
+
+if __name__ == "__main__":
+    main()
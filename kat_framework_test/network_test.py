@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework import KatherineApplication, TensorDescriptor, testing
+from kat_tensorflow.networks.deep_q import QNetwork
+from kat_api import NetworkInputType
+import numpy as np
+import tensorflow as tf
+import unittest
+
+
+FACTORY_CLASS = "kat_framework.core.factory.KatFactory"
+CONFIG_CLASS = "kat_framework.config.config_handler.YamlConfigHandler"
+CONFIG_URI = "file://localhost/scenarios/test"
+MEMORY_MAX_SIZE = 128
+STATE_SHAPE = (3,)
+NUMBER_OF_ACTIONS = 4
+
+
+class NetworkTestCase(unittest.TestCase):
+    """
+    Base class of the network tests, a small fully connected Q network.
+    """
+    def setUp(self):
+        KatherineApplication.init(FACTORY_CLASS, CONFIG_CLASS, CONFIG_URI)
+        self.output_descriptor = TensorDescriptor("network_output", np.float32, (NUMBER_OF_ACTIONS,),
+                                                  NetworkInputType.NONE)
+        self.input_descriptor = TensorDescriptor("ram_vector", np.float32, STATE_SHAPE, NetworkInputType.RAM)
+        self.network = QNetwork()
+        self.network.init(output_descriptor=self.output_descriptor, input_descriptor=self.input_descriptor)
+
+
+class MixedPrecisionTest(NetworkTestCase):
+    """
+    Mixed precision models, with float32 variables and outputs.
+    """
+    def test_mixed_precision_model(self):
+        network = QNetwork(name="MixedPrecisionQNetwork")
+        network._mixed_precision_policy = "mixed_bfloat16"
+        network._fc_layer_params = [8]
+        network.init(output_descriptor=self.output_descriptor, input_descriptor=self.input_descriptor)
+        policy = network.predict(np.zeros((2, 3), dtype=np.float32))
+        self.assertEqual(np.float32, policy.dtype)
+        for variable in network.get_model_variables():
+            self.assertEqual("float32", variable.dtype)
+
+    def test_loss_scaled_train_step(self):
+        network = testing.build_network(self.input_descriptor, self.output_descriptor,
+                                        testing.build_random_memory(STATE_SHAPE, MEMORY_MAX_SIZE, NUMBER_OF_ACTIONS),
+                                        mixed_precision_policy="mixed_float16")
+        # the float16 gradients could underflow without the dynamic loss scaling
+        self.assertIsInstance(network._optimizer, tf.keras.mixed_precision.LossScaleOptimizer)
+        self.assertTrue(np.isfinite(float(network.train_batch())))
+
+
+class JitCompileTest(NetworkTestCase):
+    """
+    XLA compiled graph functions, with a fallback to the plain graph functions.
+    """
+
+    def test_jit_compiled_forward_pass(self):
+        network = QNetwork(name="JitQNetwork")
+        network._jit_compile_enabled = True
+        with self.assertNoLogs(network._log, level="WARNING"):
+            network.init(output_descriptor=self.output_descriptor, input_descriptor=self.input_descriptor)
+        self.assertTrue(network._forward_fn._jit_compile)
+        self.assertFalse(self.network._forward_fn._jit_compile)
+        network.set_weights(self.network.get_weights())
+        states = np.random.default_rng(0).random((2, 3), dtype=np.float32)
+        np.testing.assert_allclose(self.network.predict(states), network.predict(states), rtol=1e-5, atol=1e-6)
+
+    def test_jit_fallback(self):
+        target_network = QNetwork(name="TargetQNetwork")
+        target_network.init(output_descriptor=self.output_descriptor, input_descriptor=self.input_descriptor)
+        network = QNetwork(name="JitQNetwork")
+        network._jit_compile_enabled = True
+        # the target Q cache is written back by a numpy function, which is not compilable
+        network._target_q_cache_enabled = True
+        with self.assertLogs(network._log, level="WARNING") as logs:
+            network.init(output_descriptor=self.output_descriptor, input_descriptor=self.input_descriptor,
+                         replay_memory_access=testing.build_random_memory(
+                             STATE_SHAPE, MEMORY_MAX_SIZE, NUMBER_OF_ACTIONS, target_q_cache_enabled=True),
+                         target_network=target_network)
+        self.assertEqual(1, len(logs.records))
+        self.assertIn("train step", logs.output[0])
+        self.assertFalse(network._train_step_fn._jit_compile)
+        self.assertTrue(network._forward_fn._jit_compile)
+        self.assertTrue(np.isfinite(float(network.train_batch())))
+
+
+if __name__ == "__main__":
+    unittest.main()
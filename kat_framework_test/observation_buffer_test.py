@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework.games.buffers import ObservationBufferPool
+import numpy as np
+import unittest
+
+
+SHAPE = (4, 3, 2)
+POOL_SIZE = 2
+
+
+class ObservationBufferPoolTest(unittest.TestCase):
+    """
+    Recycling of the preallocated observation buffers.
+    """
+    def setUp(self):
+        self.pool = ObservationBufferPool(SHAPE, np.float32, POOL_SIZE)
+
+    def test_acquire_and_release(self):
+        buffers = [self.pool.acquire() for _ in range(POOL_SIZE + 1)]
+        for buffer in buffers:
+            self.assertEqual(SHAPE, buffer.shape)
+            self.assertEqual(np.float32, buffer.dtype)
+        self.assertEqual(POOL_SIZE + 1, len(set(id(buffer) for buffer in buffers)))
+        self.assertEqual(0, self.pool.get_number_of_free_buffers())
+        for buffer in buffers:
+            self.pool.release(buffer)
+        # the extra buffer is dropped
+        self.assertEqual(POOL_SIZE, self.pool.get_number_of_free_buffers())
+        self.assertIn(id(self.pool.acquire()), set(id(buffer) for buffer in buffers))
+
+    def test_foreign_and_double_release(self):
+        buffer = self.pool.acquire()
+        self.pool.release(np.empty(SHAPE, np.float32))
+        self.pool.release(None)
+        self.assertEqual(POOL_SIZE - 1, self.pool.get_number_of_free_buffers())
+        self.pool.release(buffer)
+        self.pool.release(buffer)
+        self.assertEqual(POOL_SIZE, self.pool.get_number_of_free_buffers())
+        self.assertIs(buffer, self.pool.acquire())
+        self.assertIsNot(buffer, self.pool.acquire())
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            ObservationBufferPool(SHAPE, np.float32, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework import KatherineApplication, ActorPool
+import numpy as np
+import unittest
+
+
+FACTORY_CLASS = "kat_framework.core.factory.KatFactory"
+CONFIG_CLASS = "kat_framework.config.config_handler.YamlConfigHandler"
+CONFIG_URI = "file://localhost/scenarios/test"
+NUM_OF_ENVIRONMENTS = 3
+NUM_OF_WORKERS = 2
+RING_BUFFER_SIZE = 4
+NUM_OF_STEPS = 5
+
+
+class ActorPoolTest(unittest.TestCase):
+    """
+    Dummy games simulated by worker processes.
+    """
+    def setUp(self):
+        KatherineApplication.init(FACTORY_CLASS, CONFIG_CLASS, CONFIG_URI)
+        self.pool = ActorPool(NUM_OF_ENVIRONMENTS, NUM_OF_WORKERS, RING_BUFFER_SIZE, max_restarts=1)
+        self.pool.start()
+        self.env_ids = list(range(NUM_OF_ENVIRONMENTS))
+        self.action = [1, 0, 0, 0]
+
+    def tearDown(self):
+        self.pool.close()
+
+    def assert_observation(self, observation):
+        screen_desc = self.pool.get_observation_space_desc()[0]
+        screen_buffer = getattr(observation, screen_desc.get_display_name())
+        self.assertEqual(screen_desc.get_tensor_shape(), screen_buffer.shape)
+        self.assertEqual(np.dtype(screen_desc.get_data_type()), screen_buffer.dtype)
+
+    def test_reset_and_step(self):
+        for observation in self.pool.reset(self.env_ids):
+            self.assert_observation(observation)
+        for _ in range(NUM_OF_STEPS):
+            results = self.pool.step(self.env_ids, [self.action] * NUM_OF_ENVIRONMENTS, num_of_ticks=2)
+            self.assertEqual(NUM_OF_ENVIRONMENTS, len(results))
+            for transitioned_observation, reward, is_finished, current_observation in results:
+                self.assert_observation(transitioned_observation)
+                self.assert_observation(current_observation)
+                self.assertGreaterEqual(reward, 0.0)
+            finished = [env_id for env_id, result in zip(self.env_ids, results) if result[2]]
+            if len(finished) > 0:
+                self.pool.reset(finished)
+
+    def test_worker_restart(self):
+        self.pool.reset(self.env_ids)
+        # first worker hosts the environments 0 and 2
+        self.pool._processes[0].kill()
+        self.pool._processes[0].join()
+        results = self.pool.step(self.env_ids, [self.action] * NUM_OF_ENVIRONMENTS, num_of_ticks=0)
+        self.assertEqual((None, 0.0, True, None), results[0])
+        self.assertEqual((None, 0.0, True, None), results[2])
+        self.assert_observation(results[1][0])
+        for observation in self.pool.reset([0, 2]):
+            self.assert_observation(observation)
+
+
+if __name__ == "__main__":
+    unittest.main()
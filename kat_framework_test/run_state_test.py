@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework import RunStateSerializer
+import numpy as np
+import tempfile
+import unittest
+import random
+import json
+import os
+
+
+class CounterAgent:
+    """
+    Agent stub, with a single counter as its state.
+    """
+    def __init__(self, counter=0, fail=False):
+        self.counter = counter
+        self.fail = fail
+
+    def save_state(self, directory):
+        if self.fail:
+            raise IOError("disk full")
+        with open(os.path.join(directory, "counter.json"), "w") as state_file:
+            json.dump(self.counter, state_file)
+
+    def restore_state(self, directory):
+        with open(os.path.join(directory, "counter.json"), "r") as state_file:
+            self.counter = json.load(state_file)
+
+
+class RunStateSerializerTest(unittest.TestCase):
+    """
+    Atomic run state saves, latest pointer and retention.
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.serializer = RunStateSerializer(max_to_keep=2, work_directory=self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_resume_from_latest(self):
+        self.assertIsNone(self.serializer.get_latest())
+        for episode in (10, 20, 30):
+            self.serializer.save(CounterAgent(episode), episode, episode * 100)
+        agent = CounterAgent()
+        self.assertEqual((30, 3000), self.serializer.restore(agent, self.serializer.get_latest()))
+        self.assertEqual(30, agent.counter)
+        self.assertEqual(["latest", "run_state_00000020", "run_state_00000030"],
+                         sorted(os.listdir(self.directory.name)))
+
+    def test_failed_save_keeps_latest(self):
+        self.serializer.save(CounterAgent(10), 10, 1000)
+        with self.assertRaises(IOError):
+            self.serializer.save(CounterAgent(20, fail=True), 20, 2000)
+        agent = CounterAgent()
+        self.assertEqual((10, 1000), self.serializer.restore(agent, self.serializer.get_latest()))
+        self.assertEqual(["latest", "run_state_00000010"], sorted(os.listdir(self.directory.name)))
+
+    def test_random_generator_state(self):
+        self.serializer.save(CounterAgent(10), 10, 1000)
+        numbers = (np.random.rand(4).tolist(), [random.random() for _ in range(4)])
+        np.random.rand(8)
+        random.random()
+        self.serializer.restore(CounterAgent(), self.serializer.get_latest())
+        self.assertEqual(numbers, (np.random.rand(4).tolist(), [random.random() for _ in range(4)]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework import ReplayRatioScheduler
+import threading
+import unittest
+
+REPLAY_RATIO = 0.25
+MAX_LAG = 4
+MAX_OBSERVE_EPISODES = 2
+NUM_OF_EPISODES = 10
+STEPS_PER_EPISODE = 100
+
+
+class ReplayRatioSchedulerTest(unittest.TestCase):
+    """
+    Actor and learner threads paced by the scheduler.
+    """
+    def test_target_ratio(self):
+        scheduler = ReplayRatioScheduler(REPLAY_RATIO, MAX_LAG, MAX_OBSERVE_EPISODES)
+        train_steps = []
+        episode = 0
+
+        def learner():
+            while scheduler.acquire_train_step():
+                train_steps.append(episode)
+                scheduler.release_train_step()
+
+        learner_thread = threading.Thread(target=learner)
+        learner_thread.start()
+        for episode in range(NUM_OF_EPISODES):
+            for _ in range(STEPS_PER_EPISODE):
+                scheduler.on_env_step(episode)
+            if episode == MAX_OBSERVE_EPISODES:
+                # nothing was trained during the observation
+                self.assertEqual(0, len(train_steps))
+        scheduler.stop()
+        learner_thread.join()
+        learning_env_steps = (NUM_OF_EPISODES - MAX_OBSERVE_EPISODES - 1) * STEPS_PER_EPISODE
+        self.assertGreaterEqual(len(train_steps), int(learning_env_steps * REPLAY_RATIO) - MAX_LAG)
+        self.assertLessEqual(len(train_steps), int(learning_env_steps * REPLAY_RATIO))
+        self.assertAlmostEqual(REPLAY_RATIO, scheduler.get_achieved_ratio(), delta=MAX_LAG / learning_env_steps)
+
+    def test_stop_releases_learner(self):
+        scheduler = ReplayRatioScheduler(REPLAY_RATIO, MAX_LAG, MAX_OBSERVE_EPISODES)
+        results = []
+        learner_thread = threading.Thread(target=lambda: results.append(scheduler.acquire_train_step()))
+        learner_thread.start()
+        scheduler.on_env_step(0)
+        scheduler.stop()
+        learner_thread.join()
+        self.assertEqual([False], results)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework import KatherineApplication
+from kat_framework.games.katherine.synthetic import SyntheticGame
+import numpy as np
+import unittest
+
+FACTORY_CLASS = "kat_framework.core.factory.KatFactory"
+CONFIG_CLASS = "kat_framework.config.config_handler.YamlConfigHandler"
+CONFIG_URI = "file://localhost/scenarios/test"
+ACTION = [1, 0, 0, 0]
+
+
+class SyntheticGameTest(unittest.TestCase):
+    """
+    Deterministic episodes of the synthetic game (default configuration).
+    """
+    def setUp(self):
+        KatherineApplication.init(FACTORY_CLASS, CONFIG_CLASS, CONFIG_URI)
+
+    def play_episode(self):
+        game = SyntheticGame()
+        game.init()
+        frames = [game.reset().screen_buffer]
+        rewards = []
+        while not game.is_episode_finished():
+            observation, reward = game.make_action(ACTION)
+            frames.append(observation.screen_buffer)
+            rewards.append(reward)
+        return game, frames, rewards
+
+    def test_deterministic_episode(self):
+        game, frames, rewards = self.play_episode()
+        _, other_frames, other_rewards = self.play_episode()
+        screen_desc = game.get_observation_space_desc()[0]
+        self.assertEqual(100, len(rewards))
+        self.assertEqual(rewards, other_rewards)
+        self.assertEqual(float(len(rewards)), game.get_total_score())
+        for frame, other_frame in zip(frames, other_frames):
+            self.assertTrue(np.array_equal(frame, other_frame))
+        self.assertEqual(screen_desc.get_tensor_shape(), frames[0].shape)
+        self.assertEqual(np.dtype(screen_desc.get_data_type()), frames[0].dtype)
+        # served from the preallocated pool
+        self.assertIs(frames[0], frames[16])
+        self.assertFalse(frames[0].flags.writeable)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework import KatherineApplication, TensorDescriptor
+from kat_tensorflow.networks.deep_q import QNetwork
+from kat_api import NetworkInputType
+import numpy as np
+import unittest
+
+
+FACTORY_CLASS = "kat_framework.core.factory.KatFactory"
+CONFIG_CLASS = "kat_framework.config.config_handler.YamlConfigHandler"
+CONFIG_URI = "file://localhost/scenarios/test"
+TAU = 0.25
+
+
+class TargetNetworkUpdateTest(unittest.TestCase):
+    """
+    In-graph synchronization of a target network.
+    """
+    def setUp(self):
+        KatherineApplication.init(FACTORY_CLASS, CONFIG_CLASS, CONFIG_URI)
+        output_descriptor = TensorDescriptor("network_output", np.float32, (4,), NetworkInputType.NONE)
+        input_descriptor = TensorDescriptor("ram_vector", np.float32, (3,), NetworkInputType.RAM)
+        self.target_network = QNetwork(name="TargetQNetwork")
+        self.target_network.init(output_descriptor=output_descriptor, input_descriptor=input_descriptor)
+        self.network = QNetwork()
+        self.network.init(output_descriptor=output_descriptor, input_descriptor=input_descriptor,
+                          target_network=self.target_network)
+
+    def test_soft_and_hard_update(self):
+        weights = self.network.get_weights()
+        target_weights = self.target_network.get_weights()
+        self.network.update_target_network(TAU)
+        for expected, actual in zip([TAU * w + (1.0 - TAU) * t for w, t in zip(weights, target_weights)],
+                                    self.target_network.get_weights()):
+            np.testing.assert_allclose(expected, actual, rtol=1e-5, atol=1e-6)
+        self.network.update_target_network()
+        for expected, actual in zip(weights, self.target_network.get_weights()):
+            np.testing.assert_array_equal(expected, actual)
+
+    def test_double_q_learning_targets(self):
+        q_online = np.array([[1.0, 3.0, 2.0, 0.0], [0.0, 0.0, 0.0, 5.0]], dtype=np.float32)
+        q_target = np.array([[4.0, 1.0, 6.0, 0.0], [2.0, 7.0, 0.0, 3.0]], dtype=np.float32)
+        self.network._double_q_learning_enabled = False
+        np.testing.assert_array_equal([6.0, 7.0], self.network._select_transitioned_q_values(q_online, q_target))
+        np.testing.assert_array_equal([3.0, 5.0], self.network._select_transitioned_q_values(q_online, None))
+        self.network._double_q_learning_enabled = True
+        np.testing.assert_array_equal([1.0, 3.0], self.network._select_transitioned_q_values(q_online, q_target))
+
+    def test_invalid_tau(self):
+        with self.assertRaises(ValueError):
+            self.network.update_target_network(0.0)
+        with self.assertRaises(RuntimeError):
+            self.target_network.update_target_network()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework.util.timing import PhaseTimer, MAKE_ACTION_PHASE, TRAIN_STEP_PHASE
+import unittest
+
+
+class PhaseTimerTest(unittest.TestCase):
+    """
+    Per phase aggregation of the recorded durations.
+    """
+    def test_pop_statistics(self):
+        timer = PhaseTimer()
+        timer.pop_statistics()
+        for i in range(1, 101):
+            timer.record(MAKE_ACTION_PHASE, i / 1000.0)
+        timer.record(TRAIN_STEP_PHASE, 0.002)
+        statistics = timer.pop_statistics()
+        self.assertAlmostEqual(50.5, statistics[MAKE_ACTION_PHASE][0], places=6)
+        self.assertAlmostEqual(99.01, statistics[MAKE_ACTION_PHASE][1], places=6)
+        self.assertEqual((2.0, 2.0), statistics[TRAIN_STEP_PHASE])
+        self.assertEqual({}, timer.pop_statistics())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework import TrajectoryRecorder, TrajectoryReader, TrajectoryMemoryLoader, TensorDescriptor, KatState
+from kat_framework import UniformMemory
+from kat_framework import INITIAL_RECORD, ACTIVE_RECORD, FINAL_RECORD
+from kat_framework.games.katherine.observation import DummyObservation
+from kat_api import NetworkInputType, StateType
+import numpy as np
+import tempfile
+import unittest
+import os
+
+SCREEN_SHAPE = (4, 4, 1)
+EPISODE_LENGTH = 3
+NUM_OF_EPISODES = 2
+SHARD_SIZE = 3
+
+
+class TrajectoryTest(unittest.TestCase):
+    """
+    Recording episodes into shards and streaming them back.
+    """
+    def setUp(self):
+        self.observation_space_desc = [TensorDescriptor(display_name="screen_buffer",
+                                                        data_type=np.uint8,
+                                                        tensor_shape=SCREEN_SHAPE,
+                                                        input_type=NetworkInputType.IMG)]
+        self.action_space_desc = TensorDescriptor(display_name="action_space",
+                                                  data_type=np.int32,
+                                                  tensor_shape=(2,),
+                                                  input_type=NetworkInputType.NONE)
+
+    @staticmethod
+    def observation(value):
+        return DummyObservation(np.full(SCREEN_SHAPE, value, dtype=np.uint8))
+
+    def record_episodes(self, directory, first_value=0):
+        """
+        The observation values are `first_value` + the step numbers in the episode.
+        """
+        recorder = TrajectoryRecorder(self.observation_space_desc, self.action_space_desc,
+                                      SHARD_SIZE, queue_size=2, work_directory=directory)
+        recorder.start()
+        for episode in range(NUM_OF_EPISODES):
+            state = KatState(episode + 1, self.observation(first_value), StateType.INITIAL_STATE)
+            for step in range(EPISODE_LENGTH):
+                state.set_transition(step % 2)
+                state.set_transitioned_observation(self.observation(first_value + step + 1))
+                state.set_reward(float(step))
+                if step == EPISODE_LENGTH - 1:
+                    state.state_type = StateType.END_STATE
+                recorder.record(state)
+                # reused, like the pooled states of the drivers
+                state.reset(episode + 1, self.observation(first_value + step + 1), StateType.ACTIVE_STATE)
+        recorder.close()
+
+    def test_record_and_read(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.record_episodes(directory)
+            reader = TrajectoryReader(directory)
+            # (episode length + final observation) records per episode, in 3 record shards
+            self.assertEqual(3, len(reader.get_shard_paths()))
+            self.assertEqual(SCREEN_SHAPE, reader.get_observation_space_desc()[0].get_tensor_shape())
+            self.assertEqual(np.uint8, reader.get_observation_space_desc()[0].get_data_type())
+            records = list(reader)
+            self.assertEqual(NUM_OF_EPISODES * (EPISODE_LENGTH + 1), len(records))
+            expected_types = [INITIAL_RECORD, ACTIVE_RECORD, ACTIVE_RECORD, FINAL_RECORD]
+            expected_terminals = [False, False, True, True]
+            for i, (fields, action, reward, terminal, record_type) in enumerate(records):
+                step = i % (EPISODE_LENGTH + 1)
+                self.assertEqual(step, fields["screen_buffer"][0, 0, 0])
+                self.assertEqual(expected_types[step], record_type)
+                self.assertEqual(expected_terminals[step], terminal)
+                if FINAL_RECORD != record_type:
+                    self.assertEqual(step % 2, action)
+                    self.assertEqual(float(step), reward)
+            self.assertFalse(any(name.startswith(".tmp_") for name in os.listdir(directory)))
+
+    def test_recycled_observations(self):
+        with tempfile.TemporaryDirectory() as directory:
+            recorder = TrajectoryRecorder(self.observation_space_desc, self.action_space_desc,
+                                          SHARD_SIZE, queue_size=2, work_directory=directory)
+            recorder.start()
+            # the games can recycle the buffers once the transitions are recorded
+            buffer = np.zeros(SCREEN_SHAPE, dtype=np.uint8)
+            state = KatState(1, DummyObservation(buffer), StateType.INITIAL_STATE)
+            for step in range(EPISODE_LENGTH):
+                buffer[:] = step
+                transitioned_buffer = np.full(SCREEN_SHAPE, step + 1, dtype=np.uint8)
+                state.set_transition(0)
+                state.set_transitioned_observation(DummyObservation(transitioned_buffer))
+                state.set_reward(0.0)
+                if step == EPISODE_LENGTH - 1:
+                    state.state_type = StateType.END_STATE
+                recorder.record(state)
+                buffer[:] = 255
+                transitioned_buffer[:] = 255
+                state.reset(1, DummyObservation(buffer), StateType.ACTIVE_STATE)
+            recorder.close()
+            records = list(TrajectoryReader(directory))
+        self.assertEqual(list(range(EPISODE_LENGTH + 1)),
+                         [int(fields["screen_buffer"][0, 0, 0]) for fields, *_ in records])
+
+    def test_bulk_load(self):
+        memory_max_size = 8
+        memory = UniformMemory()
+        memory.init(
+            (TensorDescriptor('s1_states', np.float32, (memory_max_size, *SCREEN_SHAPE[:-1], 2)),
+             TensorDescriptor('action_ids', np.int32, (memory_max_size,)),
+             TensorDescriptor('s2_states', np.float32, (memory_max_size, *SCREEN_SHAPE[:-1], 2)),
+             TensorDescriptor('rewards', np.float32, (memory_max_size,)),
+             TensorDescriptor('terminals', np.bool, (memory_max_size,))))
+        # two stacked frames, and chunks smaller than the shards
+        loader = TrajectoryMemoryLoader(memory, "screen_buffer", number_of_stacked_frames=2, chunk_size=2,
+                                        pre_process=lambda frames: frames.astype(np.float32))
+        with tempfile.TemporaryDirectory() as directory:
+            self.record_episodes(directory, first_value=1)
+            number_of_transitions, throughput = loader.load(directory)
+        self.assertEqual(NUM_OF_EPISODES * EPISODE_LENGTH, number_of_transitions)
+        self.assertGreater(throughput, 0.0)
+        s1_states, action_ids, s2_states, rewards, terminals = memory.get_all()
+        for i in range(number_of_transitions):
+            step = i % EPISODE_LENGTH
+            # (previous frame or zeros before the episode, current frame)
+            self.assertEqual([step, step + 1], s1_states[i, 0, 0].tolist())
+            self.assertEqual([step + 1, step + 2], s2_states[i, 0, 0].tolist())
+            self.assertEqual(step % 2, action_ids[i])
+            self.assertEqual(float(step), rewards[i])
+            self.assertEqual(step == EPISODE_LENGTH - 1, terminals[i])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################
+#  _   __      _   _               _             #
+# | | / /     | | | |             (_)            #
+# | |/ /  __ _| |_| |__   ___ _ __ _ _ __   ___  #
+# |    \ / _` | __| '_ \ / _ \ '__| | '_ \ / _ \ #
+# | |\  \ (_| | |_| | | |  __/ |  | | | | |  __/ #
+# \_| \_/\__,_|\__|_| |_|\___|_|  |_|_| |_|\___| #
+#                                                #
+# General Video Game AI                          #
+# Copyright (C) 2020-2021 d33are                 #
+##################################################
+
+from kat_framework import KatherineApplication, GameWatchdog
+import unittest
+
+
+FACTORY_CLASS = "kat_framework.core.factory.KatFactory"
+CONFIG_CLASS = "kat_framework.config.config_handler.YamlConfigHandler"
+CONFIG_URI = "file://localhost/scenarios/test"
+CALL_DEADLINE = 30.0
+MISSED_CALL_DEADLINE = 1e-6
+STEP_LATENCY_SLO = 1e-6
+RING_BUFFER_SIZE = 4
+
+
+class GameWatchdogTest(unittest.TestCase):
+    """
+    Dummy game hosted by a watched worker process.
+    """
+    def setUp(self):
+        KatherineApplication.init(FACTORY_CLASS, CONFIG_CLASS, CONFIG_URI)
+        self.game = GameWatchdog(CALL_DEADLINE, STEP_LATENCY_SLO, RING_BUFFER_SIZE, max_restarts=1)
+        self.game.init()
+        self.action = [1, 0, 0, 0]
+
+    def tearDown(self):
+        self.game.close()
+
+    def test_step(self):
+        self.assertIsNotNone(self.game.reset())
+        observation, reward = self.game.make_action(self.action)
+        self.assertIsNotNone(observation)
+        self.assertGreaterEqual(reward, 0.0)
+        self.assertFalse(self.game.is_episode_truncated())
+        self.assertEqual((1, 0), self.game.pop_statistics())
+        self.assertEqual((0, 0), self.game.pop_statistics())
+
+    def test_missed_deadline(self):
+        self.game.reset()
+        # every call of the worker is too slow from now
+        self.game._actor_pool._call_deadline = MISSED_CALL_DEADLINE
+        observation, reward = self.game.make_action(self.action)
+        self.assertIsNone(observation)
+        self.assertEqual(0.0, reward)
+        self.assertTrue(self.game.is_episode_finished())
+        self.assertTrue(self.game.is_episode_truncated())
+        self.assertEqual(1, self.game.pop_statistics()[1])
+        # the restarted worker is serving the next episode
+        self.game._actor_pool._call_deadline = CALL_DEADLINE
+        self.assertIsNotNone(self.game.reset())
+        self.assertFalse(self.game.is_episode_truncated())
+
+
+if __name__ == "__main__":
+    unittest.main()
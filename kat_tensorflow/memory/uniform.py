@@ -15,7 +15,7 @@
 
 from kat_api import IReplayMemory
 from kat_typing import IterableDataset
-from kat_framework import UniformMemory, KatherineApplication, KatConfigurationProperty
+from kat_framework import UniformMemory, KatherineApplication, KatConfigurationProperty, AgentConfigurationProperty
 from overrides import overrides
 import tensorflow as tf
 
@@ -28,6 +28,7 @@ class TensorflowUniformMemory(UniformMemory, IReplayMemory):
     # protected members
 
     _batch_size: int = 0
+    _target_q_cache_enabled: bool = False
 
     # public member functions
 
@@ -44,8 +45,12 @@ class TensorflowUniformMemory(UniformMemory, IReplayMemory):
 
         :return:
             a tuple (initiator_states, action_ids, transitioned_states, rewards, end_state_factors)
-            of arrays, with batch dimension = _batch_size
+            of arrays, with batch dimension = _batch_size (extended by the serials, the cached target Q
+            values and versions, if the target Q cache is enabled)
         """
+        if self._target_q_cache_enabled:
+            while True:
+                yield self.get_sample_with_target_q(self._batch_size)
         while True:
             initiator_states, action_ids, transitioned_states, rewards, end_state_factors = \
                 self.get_sample(self._batch_size)
@@ -61,19 +66,22 @@ class TensorflowUniformMemory(UniformMemory, IReplayMemory):
         :return:
             tf.data.Dataset from generator
         """
-        dataset = tf.data.Dataset.from_generator(
-            self.data_generator,
-            output_signature=(
-                tf.TensorSpec(shape=(self._batch_size, *self._s1_states_spec.get_tensor_shape()),
-                              dtype=self._s1_states_spec.get_data_type()),
-                tf.TensorSpec(shape=(self._batch_size, *self._action_ids_spec.get_tensor_shape()),
-                              dtype=self._action_ids_spec.get_data_type()),
-                tf.TensorSpec(shape=(self._batch_size, *self._s2_states_spec.get_tensor_shape()),
-                              dtype=self._s2_states_spec.get_data_type()),
-                tf.TensorSpec(shape=(self._batch_size, *self._rewards_spec.get_tensor_shape()),
-                              dtype=self._rewards_spec.get_data_type()),
-                tf.TensorSpec(shape=(self._batch_size, *self._terminals_spec.get_tensor_shape()),
-                              dtype=self._terminals_spec.get_data_type())))
+        output_signature = (
+            tf.TensorSpec(shape=(self._batch_size, *self._s1_states_spec.get_tensor_shape()),
+                          dtype=self._s1_states_spec.get_data_type()),
+            tf.TensorSpec(shape=(self._batch_size, *self._action_ids_spec.get_tensor_shape()),
+                          dtype=self._action_ids_spec.get_data_type()),
+            tf.TensorSpec(shape=(self._batch_size, *self._s2_states_spec.get_tensor_shape()),
+                          dtype=self._s2_states_spec.get_data_type()),
+            tf.TensorSpec(shape=(self._batch_size, *self._rewards_spec.get_tensor_shape()),
+                          dtype=self._rewards_spec.get_data_type()),
+            tf.TensorSpec(shape=(self._batch_size, *self._terminals_spec.get_tensor_shape()),
+                          dtype=self._terminals_spec.get_data_type()))
+        if self._target_q_cache_enabled:
+            output_signature += (tf.TensorSpec(shape=(self._batch_size,), dtype=tf.int64),
+                                 tf.TensorSpec(shape=(self._batch_size,), dtype=tf.float32),
+                                 tf.TensorSpec(shape=(self._batch_size,), dtype=tf.int64))
+        dataset = tf.data.Dataset.from_generator(self.data_generator, output_signature=output_signature)
         return dataset.prefetch(1)
 
     # protected member functions
@@ -86,3 +94,7 @@ class TensorflowUniformMemory(UniformMemory, IReplayMemory):
             KatConfigurationProperty.TRAIN_BATCH_SIZE,
             KatConfigurationProperty.TRAIN_BATCH_SIZE.prop_type
         )
+        self._target_q_cache_enabled = KatherineApplication.get_application_config().get_config_property(
+            AgentConfigurationProperty.TARGET_Q_CACHE_ENABLED,
+            AgentConfigurationProperty.TARGET_Q_CACHE_ENABLED.prop_type
+        )
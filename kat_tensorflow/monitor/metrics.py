@@ -105,11 +105,17 @@ class TensorboardTracer(IMetricTracer):
             for key, value in self.metrics.items():
                 if MetricType.SCALAR == key.metric_type:
                     if key.metric_clazz is None:
-                        tf.summary.scalar(key.label, data=value, step=epoch_number)
+                        # skipping scalars without any collected data (e.g. not traced by the running driver)
+                        if not isinstance(value, tf.DType):
+                            tf.summary.scalar(key.label, data=value, step=epoch_number)
                     else:
                         tf.summary.scalar(key.label, value.result(), step=epoch_number)
                 elif MetricType.IMAGE == key.metric_type:
                     tf.summary.image(key.label, value, step=epoch_number)
+                elif MetricType.HISTOGRAM == key.metric_type:
+                    # skipping histograms without any collected data
+                    if not isinstance(value, tf.DType):
+                        tf.summary.histogram(key.label, value, step=epoch_number)
                 elif MetricType.HYPER_PARAMETER == key.metric_type:
                     raise NotImplemented
                 elif MetricType.FAIRNESS_INDICATOR == key.metric_type:
@@ -15,15 +15,22 @@
 
 from kat_tensorflow.clusters.grpc import ParameterServerCluster
 from kat_api import ITensorDescriptor
-from kat_typing import TrainLoss, Tensor, Policy, DistributionStrategy, Activation
+from kat_typing import TrainLoss, Tensor, Policy, DistributionStrategy, Activation, IterableDataset
 from kat_framework import NetworkConfigurationProperty, Network
 from overrides import overrides
 from abc import abstractmethod
 from typing import Optional
+from collections import deque
 from tensorflow.python.distribute.distribute_lib import _DefaultDistributionStrategy
 import tensorflow as tf
+import numpy as np
 import os
 
+STATE_CHECKPOINT_PREFIX = "network"
+MIXED_PRECISION_POLICIES = (None, "float32", "mixed_bfloat16", "mixed_float16")
+LOSS_SCALED_POLICY = "mixed_float16"
+JIT_FALLBACK_WARN_MSG = "The {} is not XLA compilable, the plain graph function is used instead. ({})"
+
 
 class TensorflowNetwork(Network):
     """
@@ -37,12 +44,23 @@ class TensorflowNetwork(Network):
     _optimizer: tf.keras.optimizers.Optimizer = None
     _strategy: tf.distribute.Strategy = None
     _coordinator: tf.distribute.experimental.coordinator.ClusterCoordinator = None
+    _per_worker_dataset: IterableDataset = None
+    _per_worker_iterator: iter = None
     _restore_model_path: str = None
     _restore_checkpoint_path: str = None
     _learning_rate: float = 0.0
+    _steps_per_execution: int = 1
+    _mixed_precision_policy: str = None
+    _jit_compile_enabled: bool = False
+    _forward_fn: tf.types.experimental.GenericFunction = None
+    _max_in_flight_steps: int = 0
+    _in_flight_losses: deque = None
+    _last_loss: TrainLoss = 0.0
     _conv_layer_params: list = None
     _fc_layer_params: list = None
     _number_of_actions: int = 0
+    _action_input_buffer: np.ndarray = None
+    _action_fn: tf.types.experimental.ConcreteFunction = None
     _initialized: bool = False
 
     # public member functions
@@ -85,6 +103,7 @@ class TensorflowNetwork(Network):
             else:
                 self._strategy = strategy
             self._coordinator = tf.distribute.experimental.coordinator.ClusterCoordinator(self._strategy)
+            self._in_flight_losses = deque()
         else:
             if strategy is None:
                 self._strategy = tf.distribute.get_strategy()
@@ -98,33 +117,111 @@ class TensorflowNetwork(Network):
             if self._restore_checkpoint_path is not None:
                 self._network_model = self._serializer.restore_checkpoint(
                     self._network_model, self._restore_checkpoint_path)
-            self._optimizer = tf.keras.optimizers.Adam(learning_rate=self._learning_rate)
+            self._optimizer = self._build_optimizer()
+        self._build_forward_fn()
+        self._build_action_fn()
         self._initialized = True
 
     @overrides
     def train_batch(self, current_episode: Optional[int] = 0, current_step: Optional[int] = 0) -> TrainLoss:
         """
-        Object initialization.
+        In pipelined mode (`max_in_flight_steps` > 0) the coordinator's closures are not awaited one by
+        one, only the oldest one is fetched when the queue is full, so the returned loss is lagging.
 
         # see: Network.train_batch(current_episode, current_step)
         """
+        # the optimizer's slots can't be created in the in-graph train loop
+        self._build_optimizer_variables()
         if isinstance(self._strategy,
                       (tf.distribute.experimental.ParameterServerStrategy,
                        tf.distribute.experimental.CentralStorageStrategy)):
-            loss = self._coordinator.schedule(self._train_batch).fetch()
+            remote_loss = self._coordinator.schedule(self._train_batch, args=(self._per_worker_iterator,))
+            if self._max_in_flight_steps > 0:
+                self._in_flight_losses.append(remote_loss)
+                if len(self._in_flight_losses) > self._max_in_flight_steps:
+                    self._last_loss = self._in_flight_losses.popleft().fetch()
+                loss = self._last_loss
+            else:
+                loss = remote_loss.fetch()
         elif isinstance(self._strategy, _DefaultDistributionStrategy):
-            loss = self._train_batch()
+            loss = self._train_batch(self._per_worker_iterator)
         else:
             raise RuntimeError("Strategy {} not supported.".format(type(self._strategy)))
         super(TensorflowNetwork, self).train_batch(current_episode, current_step)
         return loss
 
+    def join(self) -> None:
+        """
+        Waits for all of the scheduled closures (train steps, target synchronizations) of the
+        coordinator, and fetches the loss of the last train step in flight. Without a coordinator
+        there is nothing to wait for.
+        """
+        if self._coordinator is None:
+            return
+        self._coordinator.join()
+        if len(self._in_flight_losses) > 0:
+            self._last_loss = self._in_flight_losses[-1].fetch()
+            self._in_flight_losses.clear()
+
+    @overrides
+    def persist_model(self):
+        """
+        # see: Network.persist_model()
+        """
+        self.join()
+        super(TensorflowNetwork, self).persist_model()
+
+    @overrides
+    def restore_model(self, filepath: str) -> None:
+        """
+        The restored model is built in the scope of the network's strategy, and the
+        actor's compiled graph is rebuilt.
+
+        # see: Network.restore_model(filepath)
+        """
+        with self._strategy.scope():
+            super(TensorflowNetwork, self).restore_model(filepath)
+        self._build_forward_fn()
+        self._build_action_fn()
+
+    @overrides
+    def save_state(self, directory: str) -> None:
+        """
+        Saves the model's weights with the optimizer's state (moments, iterations).
+
+        # see: INetwork.save_state(directory)
+        """
+        if directory is None:
+            raise ValueError("No directory specified.")
+        self.join()
+        self._build_state_checkpoint().write(os.path.join(directory, STATE_CHECKPOINT_PREFIX))
+
+    @overrides
+    def restore_state(self, directory: str) -> None:
+        """
+        The variables are assigned in place, the compiled graphs remain valid.
+
+        # see: INetwork.restore_state(directory)
+        """
+        if directory is None:
+            raise ValueError("No directory specified.")
+        self.join()
+        self._build_state_checkpoint().read(
+            os.path.join(directory, STATE_CHECKPOINT_PREFIX)).assert_existing_objects_matched()
+
     def get_weights(self):
         """
         # see: Network.get_weights()
         """
+        self.join()
         return self._network_model.get_weights()
 
+    def get_model_variables(self) -> list:
+        """
+        Variables of the model (trainable and non-trainable), in the order of the layers.
+        """
+        return self._network_model.variables
+
     def get_distribution_strategy(self) -> DistributionStrategy:
         """
         # see: Network.get_distribution_strategy()
@@ -150,6 +247,22 @@ class TensorflowNetwork(Network):
         self._learning_rate = self._config_handler.get_config_property(
             NetworkConfigurationProperty.OPTIMIZER_LEARNING_RATE,
             NetworkConfigurationProperty.OPTIMIZER_LEARNING_RATE.prop_type)
+        self._steps_per_execution = self._config_handler.get_config_property(
+            NetworkConfigurationProperty.STEPS_PER_EXECUTION,
+            NetworkConfigurationProperty.STEPS_PER_EXECUTION.prop_type)
+        if self._steps_per_execution < 1:
+            raise ValueError("The steps per execution must be positive.")
+        self._mixed_precision_policy = self._config_handler.get_config_property(
+            NetworkConfigurationProperty.MIXED_PRECISION_POLICY,
+            NetworkConfigurationProperty.MIXED_PRECISION_POLICY.prop_type)
+        if self._mixed_precision_policy not in MIXED_PRECISION_POLICIES:
+            raise ValueError("Mixed precision policy {} not supported.".format(self._mixed_precision_policy))
+        self._jit_compile_enabled = self._config_handler.get_config_property(
+            NetworkConfigurationProperty.JIT_COMPILE_ENABLED,
+            NetworkConfigurationProperty.JIT_COMPILE_ENABLED.prop_type)
+        self._max_in_flight_steps = self._config_handler.get_config_property(
+            NetworkConfigurationProperty.MAX_IN_FLIGHT_STEPS,
+            NetworkConfigurationProperty.MAX_IN_FLIGHT_STEPS.prop_type)
         self._conv_layer_params = self._config_handler.get_config_property(
             NetworkConfigurationProperty.CONVOLUTION_PARAMETERS,
             NetworkConfigurationProperty.CONVOLUTION_PARAMETERS.prop_type)
@@ -157,6 +270,16 @@ class TensorflowNetwork(Network):
             NetworkConfigurationProperty.FULLY_CONNECTED_PARAMETERS,
             NetworkConfigurationProperty.FULLY_CONNECTED_PARAMETERS.prop_type)
 
+    @overrides
+    def _save_checkpoint(self) -> None:
+        """
+        The steps in flight are finished before, so the checkpoint is consistent.
+
+        # see: Network._save_checkpoint()
+        """
+        self.join()
+        super(TensorflowNetwork, self)._save_checkpoint()
+
     def _build_encoder(self, input_layer: tf.keras.layers.Layer, activation_fn: Activation) -> tf.keras.layers.Layer:
         """
         Building encoder layers based on configuration.
@@ -178,20 +301,141 @@ class TensorflowNetwork(Network):
                         kernel_size=kernel_size,
                         strides=strides,
                         padding='same',
-                        activation=activation_fn)(x)
+                        activation=activation_fn,
+                        dtype=self._mixed_precision_policy)(x)
                 if i < (num_of_conv - 1):
-                    y = tf.keras.layers.MaxPooling2D(padding='valid')(y)
+                    y = tf.keras.layers.MaxPooling2D(padding='valid', dtype=self._mixed_precision_policy)(y)
                 x = y
-            x = tf.keras.layers.GlobalMaxPool2D()(x)
+            x = tf.keras.layers.GlobalMaxPool2D(dtype=self._mixed_precision_policy)(x)
         if self._fc_layer_params is not None:
             for num_units in self._fc_layer_params:
                 y = tf.keras.layers.Dense(
                     num_units,
                     activation=activation_fn,
-                    kernel_regularizer=None)(x)
+                    kernel_regularizer=None,
+                    dtype=self._mixed_precision_policy)(x)
                 x = y
         return x
 
+    def _build_optimizer(self) -> tf.keras.optimizers.Optimizer:
+        """
+        Adam optimizer, wrapped by a dynamic loss scaler if the float16 gradients could underflow
+        (bfloat16 has the range of float32, so it isn't scaled).
+        """
+        optimizer = tf.keras.optimizers.Adam(learning_rate=self._learning_rate)
+        if self._mixed_precision_policy == LOSS_SCALED_POLICY:
+            optimizer = tf.keras.mixed_precision.LossScaleOptimizer(optimizer)
+        return optimizer
+
+    def _scale_loss(self, loss: Tensor) -> Tensor:
+        """
+        Scales the loss before the gradient computation, if the optimizer is loss scaled (the
+        gradients are unscaled by the optimizer).
+        """
+        if isinstance(self._optimizer, tf.keras.mixed_precision.LossScaleOptimizer):
+            return self._optimizer.scale_loss(loss)
+        return loss
+
+    def _build_compiled_fn(self,
+                           fn,
+                           input_signature: Optional[tuple],
+                           name: str) -> tf.types.experimental.GenericFunction:
+        """
+        Wraps the function into a graph function, which is XLA compiled if the JIT compilation is
+        enabled. The compilability is checked ahead, by lowering the function to HLO with the
+        specified input signature (nothing is executed), and a plain graph function is returned
+        with a warning if the check fails. The functions of a coordinated (parameter server)
+        network are never compiled, an XLA cluster can't span the remote variables.
+
+        :param fn:
+            python function (or model) to wrap
+        :param input_signature:
+            tuple of tensor specs of the arguments (None: unknown, not compiled)
+        :param name:
+            display name of the function in the warning
+        :return:
+            graph function
+        """
+        if self._jit_compile_enabled:
+            if self._coordinator is not None:
+                self._log.warning(JIT_FALLBACK_WARN_MSG.format(name, "variables on the parameter servers"))
+            elif input_signature is None:
+                self._log.warning(JIT_FALLBACK_WARN_MSG.format(name, "unknown input signature"))
+            else:
+                # the compiler IR is available only for flat tensor spec arguments
+                flat_signature = tf.nest.flatten(input_signature)
+                check_fn = tf.function(lambda *args: fn(*tf.nest.pack_sequence_as(input_signature, args)),
+                                       jit_compile=True)
+                try:
+                    with self._strategy.scope():
+                        check_fn.experimental_get_compiler_ir(*flat_signature)(stage="hlo")
+                    return tf.function(fn, jit_compile=True)
+                except (ValueError, TypeError, tf.errors.OpError) as e:
+                    self._log.warning(JIT_FALLBACK_WARN_MSG.format(name, str(e).splitlines()[0]))
+        return tf.function(fn)
+
+    def _build_forward_fn(self):
+        """
+        Builds the inference forward pass of the model, used by the predictions and the actor.
+        """
+        input_signature = None
+        if self._input_descriptor is not None:
+            input_signature = (tf.TensorSpec(shape=(1, *self._input_descriptor.get_tensor_shape()),
+                                             dtype=tf.as_dtype(self._input_descriptor.get_data_type())),)
+        self._forward_fn = self._build_compiled_fn(self._network_model, input_signature, "forward pass")
+
+    def _build_optimizer_variables(self) -> None:
+        """
+        Builds the optimizer's variables (slots, iterations), if they aren't built yet.
+        """
+        if not self._optimizer.built:
+            with self._strategy.scope():
+                self._optimizer.build(self._network_model.trainable_variables)
+
+    def _build_action_fn(self):
+        """
+        Compiles the actor's greedy action graph once, with a fixed single observation
+        input signature. The concrete function is kept, so the consecutive calls are
+        skipping the signature matching and the tracing cache lookup. The batch is
+        preallocated as well, the observation is copied into it in place.
+        """
+        if self._input_descriptor is None:
+            return
+        input_shape = (1, *self._input_descriptor.get_tensor_shape())
+        input_dtype = self._input_descriptor.get_data_type()
+        self._action_input_buffer = np.zeros(input_shape, dtype=input_dtype)
+        with self._strategy.scope():
+            self._action_fn = tf.function(
+                self._greedy_action,
+                input_signature=[tf.TensorSpec(shape=input_shape, dtype=tf.as_dtype(input_dtype))]
+            ).get_concrete_function()
+
+    def _build_state_checkpoint(self) -> tf.train.Checkpoint:
+        """
+        Helper function for building the training state's checkpoint object. The optimizer's
+        slots are built before, so the saved and the restored variables are always matching
+        (e.g. a target network's optimizer is never used).
+        """
+        self._build_optimizer_variables()
+        return tf.train.Checkpoint(model=self._network_model, optimizer=self._optimizer)
+
+    def _greedy_action(self, input_tensor: Tensor) -> Tensor:
+        """
+        Forward pass and argmax of a single observation, traced by `_build_action_fn`.
+        """
+        policy = self._forward_fn(input_tensor)
+        return tf.argmax(policy, axis=-1, output_type=tf.int32)[0]
+
+    @overrides
+    def _predict_action(self, input_tensor: Tensor) -> int:
+        """
+        # see : Network._predict_action(input_tensor)
+        """
+        if self._action_fn is None:
+            return super(TensorflowNetwork, self)._predict_action(input_tensor)
+        self._action_input_buffer[0] = input_tensor
+        return int(self._action_fn(self._action_input_buffer))
+
     @abstractmethod
     def _create_model(self) -> tf.keras.Model:
         """
@@ -210,8 +454,11 @@ class TensorflowNetwork(Network):
         pass
 
     @abstractmethod
-    def _train_batch(self) -> TrainLoss:
+    def _train_batch(self, iterator: iter) -> TrainLoss:
         """
+        The iterator is passed as an argument, the coordinator resolves it to the worker's
+        own iterator at the remote execution.
+
         # see : Network._train_batch()
         """
         pass
@@ -16,7 +16,7 @@
 from kat_tensorflow.networks.base import TensorflowNetwork
 from kat_api import INetwork, ITensorDescriptor, IReadOnlyMemory
 from kat_typing import TrainLoss, Tensor, Policy, DistributionStrategy, IterableDataset
-from kat_framework import NetworkConfigurationProperty
+from kat_framework import NetworkConfigurationProperty, AgentConfigurationProperty
 from typing import Optional
 from overrides import overrides
 import tensorflow as tf
@@ -33,8 +33,10 @@ class QNetwork(TensorflowNetwork, INetwork):
 
     _target_network: INetwork = None
     _discount_factor: float = 0.0
-    _per_worker_dataset: IterableDataset = None
-    _per_worker_iterator: iter = None
+    _double_q_learning_enabled: bool = False
+    _target_q_cache_enabled: bool = False
+    _target_version: tf.Variable = None
+    _train_step_fn: tf.types.experimental.GenericFunction = None
     _replay_memory: IReadOnlyMemory = None
 
     # public member functions
@@ -63,13 +65,25 @@ class QNetwork(TensorflowNetwork, INetwork):
                                    is_distribution_enabled=is_distribution_enabled,
                                    strategy=strategy)
         self._replay_memory = replay_memory_access
-        if self._is_distribution_enabled:
+        if self._replay_memory is None:
+            # inference only network (e.g. evaluation), no training data
+            pass
+        elif self._is_distribution_enabled:
             self._per_worker_dataset = self._coordinator.create_per_worker_dataset(self._distributed_dataset_fn)
             self._per_worker_iterator = iter(self._per_worker_dataset)
         else:
             self._per_worker_dataset = self._simple_dataset_fn()
             self._per_worker_iterator = iter(self._per_worker_dataset)
         self._target_network = target_network
+        with self._strategy.scope():
+            # incremented by each target network update, the cached target Q values are tagged with it
+            self._target_version = tf.Variable(0, dtype=tf.int64, trainable=False)
+        if self._replay_memory is not None:
+            self._build_optimizer_variables()
+            # the replicas are receiving the memory's batches, in the distributed mode as well
+            input_signature = (self._replay_memory.as_iterable_dataset().element_spec,
+                               tf.TensorSpec(shape=(), dtype=tf.float32))
+            self._train_step_fn = self._build_compiled_fn(self._train_step, input_signature, "train step")
         self._initialized = True
 
     @overrides
@@ -81,6 +95,30 @@ class QNetwork(TensorflowNetwork, INetwork):
             raise ValueError("No weights specified")
         self._network_model.set_weights(weights)
 
+    @overrides
+    def update_target_network(self, tau: float = 1.0) -> None:
+        """
+        The variables are assigned in a graph, in the scope of the strategy. In distributed mode the
+        update is scheduled by the coordinator (like the train steps). A hard copy joins the coordinator
+        before and after, so it is ordered between the train steps in flight, while the soft updates
+        are pipelined with the train steps.
+
+        # see : INetwork.update_target_network(tau)
+        """
+        if self._target_network is None:
+            raise RuntimeError("No target network specified.")
+        if not 0.0 < tau <= 1.0:
+            raise ValueError("Tau must be in (0, 1].")
+        with self._strategy.scope():
+            if self._coordinator is not None:
+                if tau >= 1.0:
+                    self.join()
+                self._coordinator.schedule(self._update_target_variables, args=(tau,))
+                if tau >= 1.0:
+                    self.join()
+            else:
+                self._update_target_variables(tau)
+
     # protected member functions
 
     @overrides
@@ -92,16 +130,24 @@ class QNetwork(TensorflowNetwork, INetwork):
         self._discount_factor = self._config_handler.get_config_property(
             NetworkConfigurationProperty.REWARD_DISCOUNT_FACTOR,
             NetworkConfigurationProperty.REWARD_DISCOUNT_FACTOR.prop_type)
+        self._double_q_learning_enabled = self._config_handler.get_config_property(
+            NetworkConfigurationProperty.DOUBLE_Q_LEARNING_ENABLED,
+            NetworkConfigurationProperty.DOUBLE_Q_LEARNING_ENABLED.prop_type)
+        self._target_q_cache_enabled = self._config_handler.get_config_property(
+            AgentConfigurationProperty.TARGET_Q_CACHE_ENABLED,
+            AgentConfigurationProperty.TARGET_Q_CACHE_ENABLED.prop_type)
 
     def _create_model(self) -> tf.keras.Model:
         """
         Builds a basic Q network.
 
-        Encoder + "number of actions" dense layer
+        Encoder + "number of actions" dense layer (float32, even in mixed precision mode)
         """
         input_layer = tf.keras.Input(shape=self._input_descriptor.get_tensor_shape())
-        encoder = self._build_encoder(input_layer=input_layer, activation_fn=tf.keras.layers.LeakyReLU(alpha=0.001))
-        output_layer = tf.keras.layers.Dense(self._number_of_actions, activation=None)(encoder)
+        encoder = self._build_encoder(input_layer=input_layer,
+                                      activation_fn=tf.keras.layers.LeakyReLU(alpha=0.001,
+                                                                              dtype=self._mixed_precision_policy))
+        output_layer = tf.keras.layers.Dense(self._number_of_actions, activation=None, dtype="float32")(encoder)
         model = tf.keras.Model(
             inputs=[input_layer],
             outputs=[output_layer])
@@ -120,38 +166,139 @@ class QNetwork(TensorflowNetwork, INetwork):
         """
         return self._strategy.distribute_datasets_from_function(self._replay_memory.as_iterable_dataset)
 
+    @tf.function
+    def _update_target_variables(self, tau: float) -> None:
+        """
+        Hard copy or soft update of the target variables (tau is a python value, so the graph is
+        traced once per update mode).
+        """
+        target_variables = self._target_network.get_model_variables()
+        for target_variable, variable in zip(target_variables, self._network_model.variables):
+            if tau >= 1.0:
+                target_variable.assign(variable)
+            else:
+                target_variable.assign_add(tau * (variable - target_variable))
+        self._target_version.assign_add(1)
+
+    def _select_transitioned_q_values(self,
+                                      q_online_transitioned: Optional[Tensor],
+                                      q_target_transitioned: Optional[Tensor]) -> Tensor:
+        """
+        Q values of the transitioned states' greedy actions (traced into the train step).
+
+        :param q_online_transitioned:
+            online network's Q values of the transitioned states (None if not needed)
+        :param q_target_transitioned:
+            target network's Q values of the transitioned states (None without target network)
+        :return:
+            Q value per transitioned state
+        """
+        if q_target_transitioned is None:
+            return tf.reduce_max(q_online_transitioned, axis=-1)
+        if not self._double_q_learning_enabled:
+            return tf.reduce_max(q_target_transitioned, axis=-1)
+        greedy_actions = tf.argmax(q_online_transitioned, axis=-1, output_type=tf.int32)
+        return tf.gather(q_target_transitioned, greedy_actions, axis=-1, batch_dims=1)
+
+    def _update_cached_target_q_values(self,
+                                       transitioned_states: Tensor,
+                                       serials: Tensor,
+                                       q_cached: Tensor,
+                                       q_versions: Tensor) -> Tensor:
+        """
+        Max target Q values of the transitioned states, only the stale cache entries are evaluated by
+        the target network, and written back into the replay memory (traced into the train step).
+
+        :param transitioned_states:
+            transitioned states of the batch
+        :param serials:
+            serial numbers of the sampled transitions
+        :param q_cached:
+            cached max target Q values
+        :param q_versions:
+            target network versions of the cached values
+        :return:
+            Q value per transitioned state
+        """
+        target_version = self._target_version.read_value()
+        stale_positions = tf.where(tf.not_equal(q_versions, target_version))[:, 0]
+
+        def evaluate_stale_states():
+            q_stale = tf.reduce_max(self._target_network.predict(tf.gather(transitioned_states, stale_positions)),
+                                    axis=-1)
+            tf.numpy_function(self._replay_memory.update_target_q_values,
+                              [tf.gather(serials, stale_positions), q_stale, target_version], [], stateful=True)
+            return tf.tensor_scatter_nd_update(q_cached, stale_positions[:, None], q_stale)
+
+        # the target network is not called with an empty batch
+        return tf.cond(tf.size(stale_positions) > 0, evaluate_stale_states, lambda: q_cached)
+
     @tf.function
     def _predict(self, input_tensor: Tensor) -> Policy:
         """
         # see : Network._predict(input)
         """
-        return self._network_model(input_tensor)
+        return self._forward_fn(input_tensor)
 
     @tf.function
-    def _train_batch(self) -> TrainLoss:
+    def _train_batch(self, iterator: iter) -> TrainLoss:
         """
+        Performs `steps_per_execution` gradient steps in a graph loop, and returns their mean loss.
+
         # see : Network._train_batch()
         """
+        if self._steps_per_execution == 1:
+            losses = self._strategy.run(self._train_step_fn, args=(next(iterator), self._discount_factor))
+            return self._strategy.reduce(tf.distribute.ReduceOp.SUM, losses, axis=None)
+        total_loss = tf.constant(0.0, dtype=tf.float32)
+        for _ in tf.range(self._steps_per_execution):
+            losses = self._strategy.run(self._train_step_fn, args=(next(iterator), self._discount_factor))
+            total_loss += tf.cast(self._strategy.reduce(tf.distribute.ReduceOp.SUM, losses, axis=None), tf.float32)
+        return total_loss / self._steps_per_execution
+
+    def _train_step(self, batch: tuple, d_factor: float) -> TrainLoss:
+        """
+        One gradient step on a sampled batch (the replica function, compiled by `_build_compiled_fn`).
 
-        def replica_fn(iterator, d_factor):
-            initiator_states, action_ids, transitioned_states, rewards, end_state_factors = next(iterator)
-            if self._target_network is not None:
-                q_transitioned = tf.reduce_max(self._target_network.predict(transitioned_states), axis=-1)
+        If the online network's Q values of the transitioned states are needed (no target network, or
+        double Q learning), they are evaluated out of the gradient tape.
+        With the target Q cache, the target network evaluates only the stale transitioned states.
+
+        :param batch:
+            sampled batch (initiator_states, action_ids, transitioned_states, rewards, end_state_factors, ...)
+        :param d_factor:
+            reward discount factor
+        :return:
+            train loss of the batch
+        """
+        is_online_transitioned_needed = self._target_network is None or self._double_q_learning_enabled
+        # the cache is updated by the sampling process, so it isn't available for the remote workers
+        is_cache_used = self._target_q_cache_enabled and not is_online_transitioned_needed and self._coordinator is None
+        initiator_states, action_ids, transitioned_states, rewards, end_state_factors = batch[:5]
+        q_target_transitioned = None
+        q_cached_transitioned = None
+        if is_cache_used:
+            q_cached_transitioned = self._update_cached_target_q_values(transitioned_states, *batch[5:])
+        elif self._target_network is not None:
+            q_target_transitioned = self._target_network.predict(transitioned_states)
+        q_online_transitioned = None
+        if is_online_transitioned_needed:
+            q_online_transitioned = self._network_model(transitioned_states)
+        with tf.GradientTape() as tape:
+            q_evaluation = self._network_model(initiator_states, training=True)
+            if is_cache_used:
+                q_transitioned = q_cached_transitioned
             else:
-                q_transitioned = tf.reduce_max(self._network_model(transitioned_states), axis=-1)
+                q_transitioned = self._select_transitioned_q_values(q_online_transitioned, q_target_transitioned)
             q_target = tf.where(end_state_factors, rewards, rewards + d_factor * q_transitioned)
-            with tf.GradientTape() as tape:
-                q_evaluation = self._network_model(initiator_states, training=True)
-                q_prediction = tf.math.reduce_sum(q_evaluation * tf.one_hot(action_ids, self._number_of_actions),
-                                                  axis=1)
-                loss = tf.reduce_mean(tf.square(q_prediction - q_target))
-            variables = self._network_model.trainable_variables
-            gradients = tape.gradient(loss, variables)
-            self._optimizer.apply_gradients(zip(gradients, variables))
-            return loss
-
-        losses = self._strategy.run(replica_fn, args=(self._per_worker_iterator, self._discount_factor))
-        return self._strategy.reduce(tf.distribute.ReduceOp.SUM, losses, axis=None)
+            q_prediction = tf.math.reduce_sum(q_evaluation * tf.one_hot(action_ids, self._number_of_actions),
+                                              axis=1)
+            loss = tf.reduce_mean(tf.square(q_prediction - q_target))
+            scaled_loss = self._scale_loss(loss)
+        variables = self._network_model.trainable_variables
+        gradients = tape.gradient(scaled_loss, variables)
+        self._optimizer.apply_gradients(zip(gradients, variables))
+        return loss
 
 
 class DuelingQNetwork(QNetwork, INetwork):
@@ -174,13 +321,15 @@ class DuelingQNetwork(QNetwork, INetwork):
         """
         Builds a basic Dueling Q network.
 
-        combined output = A + (V - mean(V))
+        combined output = A + (V - mean(V)), the streams are float32 (even in mixed precision mode)
         """
         input_layer = tf.keras.Input(shape=self._input_descriptor.get_tensor_shape())
-        encoder = self._build_encoder(input_layer=input_layer, activation_fn=tf.keras.layers.LeakyReLU(alpha=0.001))
-        v = tf.keras.layers.Dense(1, activation=None)(encoder)
+        encoder = self._build_encoder(input_layer=input_layer,
+                                      activation_fn=tf.keras.layers.LeakyReLU(alpha=0.001,
+                                                                              dtype=self._mixed_precision_policy))
+        v = tf.keras.layers.Dense(1, activation=None, dtype="float32")(encoder)
         v_normalized = tf.keras.layers.Lambda(lambda x: x - tf.reduce_mean(x))(v)
-        a = tf.keras.layers.Dense(self._number_of_actions, activation=None)(encoder)
+        a = tf.keras.layers.Dense(self._number_of_actions, activation=None, dtype="float32")(encoder)
         output_layer = tf.keras.layers.Add()([a, v_normalized])
         model = tf.keras.Model(
             inputs=[input_layer],